@@ -16,11 +16,15 @@ PHAM Signed: 2026-02-04
 
 from .state_manifold_engine import StateManifoldEngine
 from .models import StateManifold, FlowResult
+from .condition_index import ConditionIndex
+from .life_scheduler import LifeMaintenanceScheduler
 
 __all__ = [
     "StateManifoldEngine",
     "StateManifold",
     "FlowResult",
+    "ConditionIndex",
+    "LifeMaintenanceScheduler",
 ]
 
 __version__ = "1.0.1"
@@ -0,0 +1,222 @@
+"""
+StateManifoldEngine - L0 어트랙터 레지스트리
+
+수렴한 L0 최종 상태를 허용치(tolerance) 안에서 하나의 어트랙터로 묶고
+처음 본 순서대로 ID(0, 1, 2, ...)를 준다. ID는 재사용하지 않으며,
+어트랙터 중심은 처음 수렴한 상태로 고정되므로 같은 어트랙터는 실행이
+거듭되어도 같은 ID를 받는다.
+
+입력(외부 입력 I와 바이어스 b를 이은 벡터) → 어트랙터 기억도 함께 둔다.
+새 입력이 이미 본 입력과 input_tolerance 안이면 그 어트랙터에서
+시작하거나(warm start) 시뮬레이션을 건너뛴다(skip_simulation).
+
+최근접 탐색은 점들을 연속 배열 하나에 모아 두고, 앞쪽 몇 좌표를 허용치
+크기의 격자 칸으로 나눈 해시 버킷에서 이웃 칸의 점만 후보로 거리를 구한다.
+허용치 안의 점은 모든 좌표 차가 허용치 이하이므로 이웃 칸 밖에 있을 수 없다.
+점이 적으면 모든 점과의 거리를 한 번의 벡터 연산으로 구하는 선형 탐색을 쓴다.
+"""
+
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+GRID_MIN_POINTS = 64  # 이보다 적으면 격자 대신 선형 탐색
+GRID_MAX_AXES = 3  # 격자로 나눌 좌표 수 (이웃 칸 3^축 수)
+
+
+class PointSet:
+    """최근접 탐색용 점 집합 (연속 배열, 넘치면 두 배로 늘림)
+    
+    cell_size를 주면 앞쪽 좌표 최대 GRID_MAX_AXES개를 cell_size 크기 칸으로
+    나눈 해시 버킷을 함께 유지해, 반경 cell_size 이하 질의는 이웃 칸만 본다.
+    """
+
+    def __init__(self, dim: int, cell_size: float = 0.0, capacity: int = 16):
+        self.dim = dim
+        self.cell_size = cell_size
+        self._points = np.empty((capacity, dim), dtype=np.float64)
+        self._size = 0
+        self._axes = min(dim, GRID_MAX_AXES) if cell_size > 0 else 0
+        self._buckets: Dict[Tuple[int, ...], List[int]] = {}
+        self._offsets = np.array(list(itertools.product((-1, 0, 1), repeat=self._axes)), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, point: np.ndarray) -> int:
+        """점 추가 → 위치"""
+        if self._size == len(self._points):
+            grown = np.empty((2 * len(self._points), self.dim), dtype=np.float64)
+            grown[:self._size] = self._points[:self._size]
+            self._points = grown
+        position = self._size
+        self._points[position] = point
+        self._size += 1
+        if self._axes:
+            self._buckets.setdefault(self._cell(point), []).append(position)
+        return position
+
+    def set(self, position: int, point: np.ndarray) -> None:
+        if self._axes:
+            old = self._cell(self._points[position])
+            self._buckets[old].remove(position)
+            if not self._buckets[old]:
+                del self._buckets[old]
+            self._buckets.setdefault(self._cell(point), []).append(position)
+        self._points[position] = point
+
+    def point(self, position: int) -> np.ndarray:
+        return self._points[position].copy()
+
+    def nearest(self, point: np.ndarray, radius: Optional[float] = None) -> Optional[Tuple[int, float]]:
+        """가장 가까운 점 (위치, 유클리드 거리)
+        
+        radius를 주면 그 안의 점만 찾는다. 비어 있거나 없으면 None.
+        거리가 같으면 위치가 작은 점.
+        """
+        if not self._size:
+            return None
+        if radius is not None and self._axes and radius <= self.cell_size and self._size >= GRID_MIN_POINTS:
+            positions = self._candidates(point)
+            if not len(positions):
+                return None
+            diff = self._points[positions] - point
+        else:
+            positions = None
+            diff = self._points[:self._size] - point
+        distances = np.einsum("ij,ij->i", diff, diff)
+        best = int(np.argmin(distances))
+        distance = float(np.sqrt(distances[best]))
+        if radius is not None and distance > radius:
+            return None
+        return (int(positions[best]) if positions is not None else best), distance
+
+    def _cell(self, point: np.ndarray) -> Tuple[int, ...]:
+        return tuple(np.floor(point[:self._axes] / self.cell_size).astype(np.int64).tolist())
+
+    def _candidates(self, point: np.ndarray) -> np.ndarray:
+        """point가 든 칸과 이웃 칸의 점 위치 (오름차순)"""
+        cell = np.floor(point[:self._axes] / self.cell_size).astype(np.int64)
+        buckets = self._buckets
+        found = [
+            buckets[key] for key in map(tuple, (self._offsets + cell).tolist()) if key in buckets
+        ]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.fromiter(itertools.chain.from_iterable(found), dtype=np.int64))
+
+
+class AttractorRegistry:
+    """L0 어트랙터 레지스트리 (스레드 안전)
+
+    L0L1Interface(attractor_registry=...)로 붙이면 run_integrated가
+    수렴 결과를 등록하고 피드백의 attractor_id를 레지스트리 ID로 바꾼다.
+    """
+
+    def __init__(
+        self,
+        tolerance: float = 1e-3,
+        input_tolerance: float = 1e-3,
+        skip_simulation: bool = False,
+        max_inputs: int = 4096
+    ):
+        """
+        Args:
+            tolerance: 같은 어트랙터로 묶을 최종 상태 간 거리 (양수)
+            input_tolerance: 이미 본 입력으로 볼 입력 간 거리 (0이면 입력 기억 안 함)
+            skip_simulation: True면 이미 본 입력은 시뮬레이션 없이 어트랙터를 돌려주고,
+                             False면 그 어트랙터에서 시작해 적분한다 (warm start)
+            max_inputs: 기억할 입력 수 (넘치면 가장 오래된 입력부터 덮어씀)
+        """
+        if tolerance <= 0:
+            raise ValueError(f"tolerance는 양수여야 합니다: {tolerance}")
+        if input_tolerance < 0:
+            raise ValueError(f"input_tolerance는 0 이상이어야 합니다: {input_tolerance}")
+        if max_inputs <= 0:
+            raise ValueError(f"max_inputs는 양수여야 합니다: {max_inputs}")
+        self.tolerance = tolerance
+        self.input_tolerance = input_tolerance
+        self.skip_simulation = skip_simulation
+        self.max_inputs = max_inputs
+        self.hits = 0
+        self.misses = 0
+        self._attractors: Optional[PointSet] = None  # 위치 = 어트랙터 ID
+        self._counts: List[int] = []  # 어트랙터별 수렴 횟수
+        self._inputs: Optional[PointSet] = None
+        self._input_attractors: List[int] = []  # 입력 위치 → 어트랙터 ID
+        self._next_input = 0  # 가득 찼을 때 덮어쓸 입력 위치
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def state(self, attractor_id: int) -> np.ndarray:
+        """어트랙터 중심 상태"""
+        if not 0 <= attractor_id < len(self._counts):
+            raise KeyError(attractor_id)
+        return self._attractors.point(attractor_id)
+
+    def match(self, state) -> Optional[int]:
+        """state가 속한 어트랙터 ID (tolerance 안에 없으면 None)"""
+        state = np.asarray(state, dtype=np.float64)
+        with self._lock:
+            return self._match(state)
+
+    def register(self, state) -> int:
+        """수렴 상태 등록 → 어트랙터 ID (가까운 어트랙터가 없으면 새 ID)"""
+        state = np.asarray(state, dtype=np.float64)
+        with self._lock:
+            attractor_id = self._match(state)
+            if attractor_id is None:
+                if self._attractors is None:
+                    self._attractors = PointSet(len(state), cell_size=self.tolerance)
+                attractor_id = self._attractors.add(state)
+                self._counts.append(0)
+            self._counts[attractor_id] += 1
+            return attractor_id
+
+    def recall(self, key) -> Optional[int]:
+        """이미 본 입력이면 그 어트랙터 ID (없으면 None)"""
+        key = np.asarray(key, dtype=np.float64)
+        with self._lock:
+            found = self._inputs.nearest(key, self.input_tolerance) if self._inputs is not None else None
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._input_attractors[found[0]]
+
+    def remember(self, key, attractor_id: int) -> None:
+        """입력 → 어트랙터 기억 (input_tolerance가 0이면 무시)"""
+        if self.input_tolerance <= 0:
+            return
+        key = np.asarray(key, dtype=np.float64)
+        with self._lock:
+            if self._inputs is None:
+                self._inputs = PointSet(len(key), cell_size=self.input_tolerance)
+            found = self._inputs.nearest(key, self.input_tolerance)
+            if found is not None:
+                self._input_attractors[found[0]] = attractor_id
+            elif len(self._inputs) < self.max_inputs:
+                self._inputs.add(key)
+                self._input_attractors.append(attractor_id)
+            else:
+                self._inputs.set(self._next_input, key)
+                self._input_attractors[self._next_input] = attractor_id
+                self._next_input = (self._next_input + 1) % self.max_inputs
+
+    def info(self) -> Dict[str, int]:
+        """{"attractors", "inputs", "hits", "misses"}"""
+        return {
+            "attractors": len(self._counts),
+            "inputs": len(self._input_attractors),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _match(self, state: np.ndarray) -> Optional[int]:
+        found = self._attractors.nearest(state, self.tolerance) if self._attractors is not None else None
+        return found[0] if found is not None else None
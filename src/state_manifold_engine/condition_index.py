@@ -0,0 +1,139 @@
+"""
+StateManifoldEngine - 조건 색인
+
+조건 서명(예: "mass_1.0_dist_1.0_mismatch_0.1")에 밀집 정수 ID를 부여하는 전역 색인.
+경로 탐색·붕괴 영역·요동 루프는 내부적으로 ID로 동작하고,
+문자열은 API 경계(FlowResult.path 등)에서만 복원한다.
+"""
+
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+
+class ConditionIndex:
+    """조건 서명 ↔ 정수 ID 색인
+
+    ID는 0부터 등록 순서대로 부여되며 한 번 부여된 ID는 바뀌지 않는다.
+    위험도 행렬의 행 번호와 같다. 추가만 되므로 여러 버전의 상태 공간이
+    하나의 색인을 공유한다 (등록은 잠금으로 직렬화, 조회는 잠금 없음).
+    """
+
+    def __init__(self, signatures: Optional[Iterable[str]] = None):
+        self._ids: Dict[str, int] = {}
+        self._signatures: List[str] = []
+        self._lock = threading.Lock()
+        if signatures is not None:
+            for signature in signatures:
+                self.intern(signature)
+
+    def intern(self, signature: str) -> int:
+        """조건 서명의 ID 반환 (없으면 새로 부여)"""
+        condition_id = self._ids.get(signature)
+        if condition_id is None:
+            with self._lock:
+                condition_id = self._ids.get(signature)
+                if condition_id is None:
+                    condition_id = len(self._signatures)
+                    # 서명을 먼저 넣어야 ID를 본 독자가 항상 복원할 수 있다
+                    self._signatures.append(signature)
+                    self._ids[signature] = condition_id
+        return condition_id
+
+    def id_of(self, signature: str) -> Optional[int]:
+        """조건 서명의 ID (등록되지 않았으면 None)"""
+        return self._ids.get(signature)
+
+    def signature(self, condition_id: int) -> str:
+        """ID에 해당하는 조건 서명"""
+        return self._signatures[condition_id]
+
+    def signatures(self, condition_ids: Iterable[int]) -> List[str]:
+        """ID 목록을 조건 서명 목록으로 복원"""
+        signatures = self._signatures
+        return [signatures[i] for i in condition_ids]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, signature: object) -> bool:
+        return signature in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._signatures)
+
+
+class PackedConditionIndex(ConditionIndex):
+    """압축 저장된 조건 색인 (StateManifold.load용)
+
+    조건 서명은 UTF-8 바이트 덩어리(blob) + 시작 위치(offsets)로 두고,
+    필요할 때만 하나씩 복원한다. 서명 → ID 조회는 서명 정렬 순서(order)
+    위의 이진 탐색이라 적재 시 딕셔너리를 만들 필요가 없다.
+    blob/offsets/order는 메모리 맵 배열이어도 된다.
+
+    적재 후 새로 등록되는 조건은 일반 ConditionIndex처럼 뒤에 추가된다.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, order: np.ndarray):
+        super().__init__()
+        # memoryview 인덱싱은 파이썬 int/bytes를 바로 돌려줘 numpy 스칼라보다 빠르다
+        self._blob = memoryview(np.ascontiguousarray(blob, dtype=np.uint8))
+        self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.int64))
+        self._order = memoryview(np.ascontiguousarray(order, dtype=np.int64))
+        self._n_packed = len(self._offsets) - 1
+
+    def _packed(self, condition_id: int) -> str:
+        offsets = self._offsets
+        return str(self._blob[offsets[condition_id]:offsets[condition_id + 1]], "utf-8")
+
+    def _packed_id(self, signature: str) -> Optional[int]:
+        order = self._order
+        lo, hi = 0, self._n_packed
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._packed(order[mid]) < signature:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_packed:
+            condition_id = order[lo]
+            if self._packed(condition_id) == signature:
+                return condition_id
+        return None
+
+    def intern(self, signature: str) -> int:
+        condition_id = self.id_of(signature)
+        if condition_id is None:
+            with self._lock:
+                condition_id = self._ids.get(signature)
+                if condition_id is None:
+                    condition_id = self._n_packed + len(self._signatures)
+                    self._signatures.append(signature)
+                    self._ids[signature] = condition_id
+        return condition_id
+
+    def id_of(self, signature: str) -> Optional[int]:
+        condition_id = self._packed_id(signature)
+        if condition_id is None:
+            condition_id = self._ids.get(signature)
+        return condition_id
+
+    def signature(self, condition_id: int) -> str:
+        if condition_id < self._n_packed:
+            return self._packed(condition_id)
+        return self._signatures[condition_id - self._n_packed]
+
+    def signatures(self, condition_ids: Iterable[int]) -> List[str]:
+        return [self.signature(i) for i in condition_ids]
+
+    def __len__(self) -> int:
+        return self._n_packed + len(self._signatures)
+
+    def __contains__(self, signature: object) -> bool:
+        return isinstance(signature, str) and self.id_of(signature) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for condition_id in range(self._n_packed):
+            yield self._packed(condition_id)
+        yield from list(self._signatures)
@@ -0,0 +1,91 @@
+"""
+StateManifoldEngine - 흐름 결과 캐시
+
+(시작, 목표, 경로 탐색 모드, 비용 상한, 상태 공간 버전)을 키로 흐름 결과를
+LRU로 보관한다. 상태 공간은 갱신될 때마다 새 버전 번호를 받으므로
+(build_state_space, maintain_life, set_risk, apply_risk_deltas 등)
+갱신 이후의 질의는 이전 결과에 적중하지 않는다. 낡은 항목은 더 이상
+쓰이지 않다가 LRU 순서대로 밀려난다.
+
+값(value)은 결과 계산에 쓰이지 않으므로 키에 넣지 않고, 적중할 때마다
+새 FlowResult에 담아 돌려준다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+# 경로가 없는 질의도 캐시한다 (None과 구분)
+NO_PATH = object()
+
+FlowKey = Tuple[Hashable, ...]
+
+
+class FlowCache:
+    """흐름 결과 LRU 캐시 (스레드 안전)
+
+    항목: 키 → (경로, 흐름 에너지, 형태 보존도, 안정성) 또는 NO_PATH
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: 최대 항목 수 (양수)
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity는 양수여야 합니다: {capacity}")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[FlowKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        start: str,
+        goal: str,
+        mode: str,
+        max_cost: Optional[float],
+        version: int
+    ) -> FlowKey:
+        return (start, goal, mode, max_cost, version)
+
+    def get(self, key: FlowKey) -> Optional[Any]:
+        """캐시된 항목 (없으면 None, 적중하면 가장 최근으로)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: FlowKey, entry: Any) -> None:
+        """항목 저장 (넘치면 가장 오래 안 쓴 항목부터 제거)"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """모든 항목 제거 (통계는 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> Dict[str, int]:
+        """{"hits", "misses", "evictions", "size", "capacity"}"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "capacity": self.capacity,
+        }
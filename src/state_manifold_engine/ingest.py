@@ -0,0 +1,157 @@
+"""
+StateManifoldEngine - 위험도 레코드 스트림 적재
+
+UP 엔진이 내보낸 (차원, 조건 서명, 위험도) 레코드를 조각(chunk) 단위로 읽어
+차원별 항목 배열에 바로 모은다. 차원별 SearchBias 딕셔너리를 만들지 않으므로
+조건마다 남는 파이썬 객체는 조건 색인 항목 하나뿐이고, 추가 메모리는
+유일 항목 수와 조각 하나 크기로 제한된다.
+
+레코드 파일 형식:
+- JSONL: 줄마다 {"dimension": ..., "condition_signature": ..., "risk": ...}
+         또는 [dimension, condition_signature, risk]
+- CSV: 헤더 dimension,condition_signature,risk
+"""
+
+import csv
+import itertools
+import json
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .condition_index import ConditionIndex
+from .risk_matrix import RiskMatrix, last_wins
+
+
+# 한 번에 처리할 레코드 수
+DEFAULT_CHUNK_SIZE = 65536
+
+RECORD_FIELDS = ("dimension", "condition_signature", "risk")
+
+RiskRecord = Tuple[str, str, float]
+
+
+def read_jsonl_records(path) -> Iterator[RiskRecord]:
+    """JSONL 레코드 파일을 (차원, 조건 서명, 위험도)로 한 줄씩 읽기"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                try:
+                    record = [record[name] for name in RECORD_FIELDS]
+                except KeyError as e:
+                    raise ValueError(f"{path}:{line_number}: 필드 누락 {e}") from None
+            dimension, condition_signature, risk = record
+            yield dimension, condition_signature, float(risk)
+
+
+def read_csv_records(path) -> Iterator[RiskRecord]:
+    """CSV 레코드 파일 (헤더: dimension,condition_signature,risk) 읽기"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [name for name in RECORD_FIELDS if name not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"{path}: CSV 헤더에 필드 누락 {missing}")
+        for row in reader:
+            yield row["dimension"], row["condition_signature"], float(row["risk"])
+
+
+def read_records(path) -> Iterator[RiskRecord]:
+    """확장자(.csv / 그 외 JSONL)에 따라 레코드 파일 읽기"""
+    if str(path).lower().endswith(".csv"):
+        return read_csv_records(path)
+    return read_jsonl_records(path)
+
+
+class _EntryBuffer:
+    """한 차원의 (행 번호, 위험도) 항목 버퍼
+
+    조각마다 들어온 항목을 쌓아 두었다가, 쌓인 양이 정리된 항목 수를
+    넘으면 중복을 없애(마지막 값 우선) 다시 정리한다. 메모리는 유일 항목 수의
+    몇 배로 제한된다.
+    """
+
+    def __init__(self):
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros(0, dtype=np.float64)
+        self._pending: List[np.ndarray] = []
+        self._pending_values: List[np.ndarray] = []
+        self._pending_count = 0
+
+    def add(self, rows: np.ndarray, values: np.ndarray) -> None:
+        self._pending.append(rows)
+        self._pending_values.append(values)
+        self._pending_count += len(rows)
+        if self._pending_count > len(self.rows):
+            self.compact()
+
+    def compact(self) -> None:
+        if not self._pending:
+            return
+        rows = np.concatenate([self.rows] + self._pending)
+        values = np.concatenate([self.values] + self._pending_values)
+        self.rows, self.values = last_wins(rows, values)
+        self._pending, self._pending_values = [], []
+        self._pending_count = 0
+
+
+def build_risk_matrix(
+    records: Iterable[RiskRecord],
+    index: ConditionIndex,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    layout: str = "auto",
+) -> RiskMatrix:
+    """레코드 스트림을 위험도 행렬로 컴파일
+
+    같은 (차원, 조건)이 여러 번 나오면 마지막 레코드가 이긴다
+    (risk_map에 차례로 대입한 것과 같다). 차원 순서는 처음 나온 순서.
+    항목을 차원별로 모은 뒤 마지막에 저장 방식(밀집/희소)을 정한다.
+
+    Args:
+        records: (차원, 조건 서명, 위험도) 레코드들
+        index: 조건 색인 (조건 서명이 등록됨, 행 번호 = ID)
+        chunk_size: 한 번에 처리할 레코드 수
+        layout: "dense" / "sparse" / "auto" (채움 비율로 선택)
+
+    Returns:
+        위험도 행렬
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size는 양수여야 합니다: {chunk_size}")
+
+    buffers: Dict[str, _EntryBuffer] = {}
+    iterator = iter(records)
+
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            break
+        dimensions, signatures, risks = zip(*chunk)
+        del chunk
+
+        # 처음 나온 순서대로 열 번호 부여
+        codes: Dict[str, int] = {}
+        for dimension in dimensions:
+            if dimension not in codes:
+                codes[dimension] = len(codes)
+                buffers.setdefault(dimension, _EntryBuffer())
+        names = list(codes)
+
+        chunk_codes = np.fromiter((codes[d] for d in dimensions), dtype=np.int64, count=len(dimensions))
+        rows = np.fromiter((index.intern(s) for s in signatures), dtype=np.int64, count=len(signatures))
+        values = np.fromiter(risks, dtype=np.float64, count=len(risks))
+
+        # 차원별로 나눠 담기 (조각 안의 순서 유지 → 마지막 값 우선이 보존됨)
+        order = np.argsort(chunk_codes, kind="stable")
+        bounds = np.searchsorted(chunk_codes[order], np.arange(1, len(names)))
+        for name, part in zip(names, np.split(order, bounds)):
+            buffers[name].add(rows[part], values[part])
+
+    entries = []
+    for buffer in buffers.values():
+        buffer.compact()
+        entries.append((buffer.rows, buffer.values))
+    return RiskMatrix.from_entries(list(buffers), entries, len(index), layout)
@@ -0,0 +1,392 @@
+"""
+L0 연속시간 신경 동역학 (번들 NumPy 구현)
+
+Cognitive_Kernel의 NeuralDynamicsCore가 없을 때 L0L1Interface가 쓰는 기본 L0.
+같은 계약(n / run / hopfield_energy)을 따르는 Hopfield형 연속시간 네트워크:
+
+    tau · dx/dt = -x + W · f(x) + b + I(t)
+
+한 스텝은 dt만큼의 시간이며 행렬-벡터 곱 한 번(오일러) 또는 네 번(RK4)으로
+진행한다. "adaptive"는 한 스텝 안을 RK4 반걸음 비교로 잘게 나눠 오차를
+tolerance 이하로 맞춘다 (출력 간격은 그대로 dt).
+
+Author: GNJz (Qquarts)
+Version: 0.1.0
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 0.5 * (1.0 + np.tanh(0.5 * x)),
+    "relu": lambda x: np.maximum(x, 0.0),
+    "linear": lambda x: x,
+}
+
+INTEGRATORS = ("euler", "rk4", "adaptive")
+
+TRAJECTORY_MODES = ("full", "decimate", "ring", "final")
+
+# 에너지를 한 번에 계산할 상태 수
+ENERGY_CHUNK = 64
+
+# adaptive: 한 스텝을 나누는 최대 횟수
+MAX_SUBSTEPS = 1024
+
+
+@dataclass
+class ContinuousDynamicsConfig:
+    """연속시간 동역학 설정"""
+    dt: float = 0.01  # 시간 스텝
+    tau: float = 0.1  # 시간 상수
+    activation: str = "tanh"  # 활성 함수 ("tanh", "sigmoid", "relu", "linear")
+    integrator: str = "euler"  # 적분기 ("euler", "rk4", "adaptive")
+    tolerance: float = 1e-6  # adaptive 스텝의 국소 오차 허용치
+
+
+class NeuralDynamicsCore:
+    """NumPy Hopfield형 연속시간 신경 동역학 코어
+
+    Attributes:
+        W: 연결 행렬 (n × n)
+        b: 바이어스 벡터 (n)
+        config: 동역학 설정
+    """
+
+    def __init__(
+        self,
+        W: Union[Sequence[Sequence[float]], np.ndarray],
+        b: Optional[Union[Sequence[float], np.ndarray]] = None,
+        config: Optional[ContinuousDynamicsConfig] = None,
+    ):
+        """
+        Args:
+            W: 연결 행렬 (n × n)
+            b: 바이어스 벡터 (없으면 0)
+            config: 동역학 설정 (없으면 기본값)
+        """
+        self.W = np.array(W, dtype=np.float64)
+        if self.W.ndim != 2 or self.W.shape[0] != self.W.shape[1]:
+            raise ValueError(f"W must be a square matrix, got shape {self.W.shape}")
+        self.b = np.zeros(self.n) if b is None else np.array(b, dtype=np.float64)
+        if self.b.shape != (self.n,):
+            raise ValueError(f"b length {self.b.shape} != n {self.n}")
+        self.config = config or ContinuousDynamicsConfig()
+        if self.config.activation not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation: {self.config.activation}")
+        if self.config.integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator: {self.config.integrator}")
+        self._f = ACTIVATIONS[self.config.activation]
+
+    @property
+    def n(self) -> int:
+        """뉴런 수"""
+        return self.W.shape[0]
+
+    def derivative(self, x: np.ndarray, I: np.ndarray) -> np.ndarray:
+        """dx/dt (x는 (n,) 또는 행마다 상태인 (B, n))"""
+        return (self._f(x) @ self.W.T - x + self.b + I) / self.config.tau
+
+    def step(self, x: np.ndarray, I: np.ndarray) -> np.ndarray:
+        """dt만큼 한 스텝 진행 (입력은 스텝 동안 고정)"""
+        dt = self.config.dt
+        integrator = self.config.integrator
+        if integrator == "euler":
+            return x + dt * self.derivative(x, I)
+        if integrator == "rk4":
+            return self._rk4(x, I, dt)
+        return self._adaptive(x, I, dt)
+
+    def _rk4(self, x: np.ndarray, I: np.ndarray, h: float) -> np.ndarray:
+        k1 = self.derivative(x, I)
+        k2 = self.derivative(x + 0.5 * h * k1, I)
+        k3 = self.derivative(x + 0.5 * h * k2, I)
+        k4 = self.derivative(x + h * k3, I)
+        return x + (h / 6.0) * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+    def _adaptive(self, x: np.ndarray, I: np.ndarray, dt: float) -> np.ndarray:
+        """RK4 반걸음 비교(step doubling)로 dt 구간을 적분
+
+        배치면 행마다 오차를 재고 걸음 크기를 따로 고르므로,
+        한 행이 뻣뻣해도 다른 행의 걸음은 줄지 않는다 (행별 결과 = 단일 실행).
+        """
+        tolerance = self.config.tolerance
+        min_h = dt / MAX_SUBSTEPS
+        single = x.ndim == 1
+        x = np.array(x, dtype=np.float64, ndmin=2)
+        I = np.broadcast_to(np.asarray(I, dtype=np.float64), x.shape)
+        t = np.zeros(len(x))
+        h = np.full(len(x), dt)
+        pending = np.arange(len(x))
+        while len(pending):
+            xs, Is = x[pending], I[pending]
+            hs = np.minimum(h[pending], dt - t[pending])
+            hc = hs[:, None]
+            full = self._rk4(xs, Is, hc)
+            half = self._rk4(self._rk4(xs, Is, 0.5 * hc), Is, 0.5 * hc)
+            error = np.abs(half - full).max(axis=1, initial=0.0)
+            accept = (error <= tolerance) | (hs <= min_h)
+            # 리처드슨 보정 (RK4: 2^4 - 1)
+            x[pending[accept]] = half[accept] + (half[accept] - full[accept]) / 15.0
+            t[pending[accept]] += hs[accept]
+            grow = accept & (error < tolerance / 32.0)
+            h[pending] = np.where(accept, np.where(grow, 2.0 * hs, hs), 0.5 * hs)
+            pending = pending[t[pending] < dt]
+        return x[0] if single else x
+
+    def simulate(
+        self,
+        x0: Union[Sequence[float], np.ndarray],
+        steps: int,
+        input_schedule: Optional[Callable[[int], Union[Sequence[float], np.ndarray]]] = None,
+        stop_tol: Optional[float] = None,
+        record: str = "full",
+        every: int = 10,
+        window: int = 100,
+        recent: int = 0,
+        compute_energy: bool = False,
+        energy_fn: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> "SimulationResult":
+        """steps 스텝 시뮬레이션 (배열 결과)
+
+        상태는 기록 방식(TrajectoryRecorder)에 맞게 미리 잡아 둔 배열에만 쓴다.
+        compute_energy면 상태를 ENERGY_CHUNK개씩 모아 에너지를 한 번에 계산하므로
+        궤적을 기록하지 않아도 된다 (에너지는 스칼라라 항상 전 구간).
+
+        Args:
+            x0: 초기 상태
+            steps: 최대 스텝 수
+            input_schedule: 스텝 번호 → 외부 입력 I(t) (없으면 0)
+            stop_tol: 한 스텝 변화량(최대 절댓값)이 이보다 작으면 조기 종료
+            record: 궤적 기록 방식 ("full", "decimate", "ring", "final")
+            every: decimate 간격 (스텝)
+            window: ring 길이 (상태 수)
+            recent: 기록 방식과 별도로 보관할 최근 상태 수 (0이면 보관 안 함)
+            compute_energy: 상태마다 Hopfield 에너지 계산 여부
+            energy_fn: 상태 행렬 (T × n) → 에너지 (없으면 hopfield_energy_batch)
+
+        Returns:
+            SimulationResult
+        """
+        x = np.array(x0, dtype=np.float64)
+        recorder = TrajectoryRecorder(record, steps, 1, self.n, every=every, window=window)
+        tail = TrajectoryRecorder("ring", steps, 1, self.n, window=recent) if recent else None
+        energies = None
+        if compute_energy:
+            energies = EnergyRecorder(steps, 1, self.n, energy_fn or self.hopfield_energy_batch)
+        recorder.record(0, x, 0)
+        if tail is not None:
+            tail.record(0, x, 0)
+        if energies is not None:
+            energies.record(0, x, 0)
+        zero_input = np.zeros(self.n)
+
+        taken = 0
+        for t in range(steps):
+            I = zero_input if input_schedule is None else np.asarray(input_schedule(t), dtype=np.float64)
+            x_next = self.step(x, I)
+            delta = float(np.abs(x_next - x).max(initial=0.0))
+            x = x_next
+            taken = t + 1
+            recorder.record(taken, x, 0)
+            if tail is not None:
+                tail.record(taken, x, 0)
+            if energies is not None:
+                energies.record(taken, x, 0)
+            if stop_tol is not None and delta < stop_tol:
+                break
+
+        return SimulationResult(
+            x_final=x,
+            steps=taken,
+            trajectory=recorder.states(0, taken, x),
+            recent=tail.states(0, taken, x) if tail is not None else None,
+            energies=energies.finish()[:taken + 1, 0] if energies is not None else None,
+        )
+
+    def run(
+        self,
+        x0: Union[Sequence[float], np.ndarray],
+        steps: int,
+        input_schedule: Optional[Callable[[int], Union[Sequence[float], np.ndarray]]] = None,
+        stop_tol: Optional[float] = None,
+        return_trajectory: bool = False,
+    ) -> Union[List[float], List[List[float]]]:
+        """steps 스텝 시뮬레이션 (NeuralDynamicsCore 계약)
+
+        Args:
+            x0: 초기 상태
+            steps: 최대 스텝 수
+            input_schedule: 스텝 번호 → 외부 입력 I(t) (없으면 0)
+            stop_tol: 한 스텝 변화량(최대 절댓값)이 이보다 작으면 조기 종료
+            return_trajectory: True면 x0를 포함한 궤적, False면 최종 상태
+
+        Returns:
+            궤적 (리스트의 리스트) 또는 최종 상태 (리스트)
+        """
+        result = self.simulate(
+            x0, steps, input_schedule, stop_tol, record="full" if return_trajectory else "final"
+        )
+        if return_trajectory:
+            return result.trajectory.tolist()
+        return result.x_final.tolist()
+
+    def hopfield_energy(self, x: Union[Sequence[float], np.ndarray]) -> float:
+        """Hopfield 에너지 E(x) = -½ xᵀ W x - bᵀ x"""
+        x = np.asarray(x, dtype=np.float64)
+        return float(-0.5 * (x @ self.W @ x) - self.b @ x)
+
+    def hopfield_energy_batch(self, X: np.ndarray) -> np.ndarray:
+        """상태 행렬 (T × n)의 행별 Hopfield 에너지 (이차 형식 한 번)"""
+        X = np.asarray(X, dtype=np.float64)
+        return -0.5 * np.einsum("ti,ij,tj->t", X, self.W, X, optimize=True) - X @ self.b
+
+
+@dataclass
+class SimulationResult:
+    """simulate() 결과"""
+    x_final: np.ndarray  # 최종 상태
+    steps: int  # 실제로 진행한 스텝 수
+    trajectory: np.ndarray  # 기록 방식에 따른 상태들 (시간 순, 행 = 상태)
+    recent: Optional[np.ndarray] = None  # 최근 상태들 (simulate의 recent개 이하)
+    energies: Optional[np.ndarray] = None  # 상태별 에너지 (steps+1)
+
+
+class TrajectoryRecorder:
+    """궤적 기록기 (미리 잡아 둔 배열)
+
+    기록 방식:
+    - "full": 모든 상태 (steps+1개)
+    - "decimate": every 스텝마다 한 상태 + 최종 상태
+    - "ring": 최근 window개 상태 (원형 버퍼)
+    - "final": 최종 상태만
+
+    배치(행마다 다른 스텝에서 멈춤)를 위해 버퍼는 (칸 수, 배치, n)이고,
+    record()는 아직 움직이는 행만 쓴다. ring/final은 스텝 수와 무관한 크기다.
+    """
+
+    def __init__(self, mode: str, steps: int, batch: int, n: int, every: int = 10, window: int = 100):
+        if mode not in TRAJECTORY_MODES:
+            raise ValueError(f"Unknown trajectory mode: {mode} (available: {TRAJECTORY_MODES})")
+        if mode == "decimate" and every <= 0:
+            raise ValueError(f"every must be positive: {every}")
+        if mode == "ring" and window <= 0:
+            raise ValueError(f"window must be positive: {window}")
+        self.mode = mode
+        self.every = every
+        self.window = window
+        if mode == "full":
+            capacity = steps + 1
+        elif mode == "decimate":
+            capacity = steps // every + 1
+        elif mode == "ring":
+            capacity = min(window, steps + 1)
+        else:
+            capacity = 0
+        self.buffer = np.empty((capacity, batch, n), dtype=np.float64)
+
+    def record(self, t: int, x: np.ndarray, rows) -> None:
+        """t번째 상태 기록 (rows: 배치 행 번호 또는 배열)"""
+        mode = self.mode
+        if mode == "full":
+            self.buffer[t, rows] = x
+        elif mode == "decimate":
+            if t % self.every == 0:
+                self.buffer[t // self.every, rows] = x
+        elif mode == "ring":
+            self.buffer[t % len(self.buffer), rows] = x
+
+    def states(self, row: int, taken: int, final: np.ndarray) -> np.ndarray:
+        """row의 기록된 상태들 (시간 순)
+
+        Args:
+            row: 배치 행 번호
+            taken: 그 행이 진행한 스텝 수
+            final: 그 행의 최종 상태
+        """
+        mode = self.mode
+        if mode == "full":
+            return self.buffer[:taken + 1, row]
+        if mode == "decimate":
+            kept = self.buffer[:taken // self.every + 1, row]
+            if taken % self.every:
+                kept = np.concatenate([kept, np.asarray(final)[None, :]])
+            return kept
+        if mode == "ring":
+            capacity = len(self.buffer)
+            count = min(taken + 1, capacity)
+            slots = np.arange(taken - count + 1, taken + 1) % capacity
+            return self.buffer[slots, row]
+        return np.asarray(final, dtype=np.float64)[None, :]
+
+
+class EnergyRecorder:
+    """스텝별 에너지 기록기
+
+    상태를 ENERGY_CHUNK 스텝씩 (칸 수, 배치, n) 버퍼에 모았다가 energy_fn을
+    한 번 호출해 에너지를 채운다. 상태 버퍼는 스텝 수와 무관한 크기이고,
+    에너지 배열은 (steps+1, 배치) 스칼라다.
+    """
+
+    def __init__(
+        self,
+        steps: int,
+        batch: int,
+        n: int,
+        energy_fn: Callable[[np.ndarray], np.ndarray],
+        chunk: int = ENERGY_CHUNK
+    ):
+        self.energies = np.full((steps + 1, batch), np.nan)
+        self._energy_fn = energy_fn
+        self._states = np.empty((min(chunk, steps + 1), batch, n), dtype=np.float64)
+        self._filled = np.zeros((len(self._states), batch), dtype=bool)
+        self._start = 0  # 버퍼 첫 칸의 스텝 번호
+
+    def record(self, t: int, x: np.ndarray, rows) -> None:
+        """t번째 상태 기록 (rows: 배치 행 번호 또는 배열)"""
+        slot = t - self._start
+        self._states[slot, rows] = x
+        self._filled[slot, rows] = True
+        if slot == len(self._states) - 1:
+            self._flush()
+            self._start += len(self._states)
+
+    def finish(self) -> np.ndarray:
+        """남은 상태의 에너지를 채우고 (steps+1, 배치) 에너지 배열 반환"""
+        self._flush()
+        return self.energies
+
+    def _flush(self) -> None:
+        slots, rows = np.nonzero(self._filled)
+        if len(slots):
+            self.energies[self._start + slots, rows] = self._energy_fn(self._states[slots, rows])
+            self._filled[:] = False
+
+
+def select_trajectory(trajectory: np.ndarray, mode: str, every: int = 10, window: int = 100) -> np.ndarray:
+    """이미 쌓인 전체 궤적 (T × n)에서 기록 방식에 맞는 상태만 고르기
+
+    TrajectoryRecorder와 같은 결과 (run()만 제공하는 외부 코어용).
+    """
+    if mode not in TRAJECTORY_MODES:
+        raise ValueError(f"Unknown trajectory mode: {mode} (available: {TRAJECTORY_MODES})")
+    if mode == "full":
+        return trajectory
+    if mode == "decimate":
+        if every <= 0:
+            raise ValueError(f"every must be positive: {every}")
+        kept = trajectory[::every]
+        if (len(trajectory) - 1) % every:
+            kept = np.concatenate([kept, trajectory[-1:]])
+        return kept
+    if mode == "ring":
+        if window <= 0:
+            raise ValueError(f"window must be positive: {window}")
+        return trajectory[-window:]
+    return trajectory[-1:]
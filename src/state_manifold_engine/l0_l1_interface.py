@@ -14,11 +14,19 @@ Version: 0.1.0
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Any, Callable, Union
 import sys
 from pathlib import Path
 
+import numpy as np
+
+from .attractor_registry import AttractorRegistry
+from .l0_dynamics import NeuralDynamicsCore as BundledDynamicsCore
+from .l0_dynamics import EnergyRecorder, TrajectoryRecorder, select_trajectory
+from .models import StateManifold
+
 # L0 (NeuralDynamicsCore) import
+# L0_AVAILABLE: 외부 L0(Cognitive_Kernel)를 찾았는지, L0_BACKEND: 실제로 쓰는 구현
 try:
     # Cognitive_Kernel에서 import
     cognitive_kernel_path = Path(__file__).parent.parent.parent.parent.parent.parent / "Cognitive_Kernel" / "src"
@@ -29,25 +37,34 @@ try:
         ContinuousDynamicsConfig,
     )
     L0_AVAILABLE = True
+    L0_BACKEND = "cognitive_kernel"
 except ImportError:
+    # 없으면 번들 NumPy 코어 (같은 계약)
+    from .l0_dynamics import NeuralDynamicsCore, ContinuousDynamicsConfig
     L0_AVAILABLE = False
-    NeuralDynamicsCore = None
-    ContinuousDynamicsConfig = None
+    L0_BACKEND = "numpy"
 
-from .models import StateManifold
+# L0 실행의 조기 종료 허용치 (한 스텝 변화량)
+L0_STOP_TOL = 1e-6
+
+# 진동 판정에 쓰는 최근 상태 수 (궤적 기록 방식과 무관하게 항상 보관)
+OSCILLATION_WINDOW = 10
 
 
 # ============================================================================
 # L0 입력/출력 타입 정의
 # ============================================================================
 
+# 벡터 인자: 리스트 또는 float64 배열
+Vector = Union[Sequence[float], np.ndarray]
+
 @dataclass
 class L0Input:
     """L0 (NeuralDynamicsCore) 입력"""
-    I: List[float]  # 외부 입력 벡터 I(t)
+    I: Vector  # 외부 입력 벡터 I(t)
     W: Optional[List[List[float]]] = None  # 연결 행렬 (옵션, 없으면 기존 W 사용)
-    b: Optional[List[float]] = None  # 바이어스 벡터 (옵션)
-    x0: Optional[List[float]] = None  # 초기 상태 (없으면 현재 상태 사용)
+    b: Optional[Vector] = None  # 바이어스 벡터 (옵션)
+    x0: Optional[Vector] = None  # 초기 상태 (없으면 현재 상태 사용)
     noise_scale: float = 0.0  # 노이즈 스케일
     dt: float = 0.01  # 시간 스텝
     T: float = 1.0  # 시뮬레이션 시간
@@ -57,19 +74,41 @@ class L0Input:
 @dataclass
 class L0Output:
     """L0 (NeuralDynamicsCore) 출력"""
-    x_trajectory: List[List[float]]  # x(t) 궤적
+    x_trajectory: List[List[float]]  # x(t) 궤적 (기록 방식에 따라 일부)
     x_final: List[float]  # 최종 상태
     converged: bool  # 수렴 여부
     steps: int  # 실제 시뮬레이션 스텝 수
     energy_trajectory: Optional[List[float]] = None  # energy(t) (옵션)
     final_energy: Optional[float] = None  # 최종 에너지 (옵션)
+    recent_states: Optional[List[List[float]]] = None  # 최근 상태 (진동 판정용, 최대 OSCILLATION_WINDOW개)
 
 
 # ============================================================================
 # L1 → L0 매핑 규칙
 # ============================================================================
 
-def map_risk_to_input(risk_map: Dict[str, float]) -> List[float]:
+def _risk_vector(risk_map: Union[Mapping[str, float], Vector]) -> np.ndarray:
+    """위험도 맵(삽입 순서) 또는 위험도 벡터 → float64 배열"""
+    if isinstance(risk_map, Mapping):
+        return np.fromiter(risk_map.values(), dtype=np.float64, count=len(risk_map))
+    return np.asarray(risk_map, dtype=np.float64)
+
+
+def _output(out: Optional[np.ndarray], source: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """출력 버퍼 준비 (source와 겹치면 source를 복사해 둔다)"""
+    if out is None:
+        return np.empty(len(source), dtype=np.float64), source
+    if out.shape != source.shape:
+        raise ValueError(f"Output buffer shape {out.shape} != input shape {source.shape}")
+    if np.may_share_memory(out, source):
+        source = source.copy()
+    return out, source
+
+
+def map_risk_to_input(
+    risk_map: Union[Mapping[str, float], Vector],
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     L1의 위험도 맵을 L0의 외부 입력 I(t)로 변환
     
@@ -77,47 +116,61 @@ def map_risk_to_input(risk_map: Dict[str, float]) -> List[float]:
           위험도가 낮으면 탐색 신호 (양수 입력)
     
     Args:
-        risk_map: 조건 서명 → 위험도 (0~1)
+        risk_map: 조건 서명 → 위험도 (0~1), 또는 위험도 벡터 (리스트/배열)
+        out: 결과를 쓸 배열 (옵션, 길이 = 조건 수)
     
     Returns:
-        I: 외부 입력 벡터
+        I: 외부 입력 벡터 (float64 배열)
     """
-    I = []
-    for condition, risk in risk_map.items():
-        # 위험도 → 입력 변환: risk=1.0 → I=-1.0, risk=0.0 → I=+0.5
-        I_value = -risk + 0.5 * (1.0 - risk)
-        I.append(I_value)
-    return I
+    risks = _risk_vector(risk_map)
+    out, risks = _output(out, risks)
+    # 위험도 → 입력 변환: risk=1.0 → I=-1.0, risk=0.0 → I=+0.5
+    np.subtract(1.0, risks, out=out)
+    out *= 0.5
+    out -= risks
+    return out
 
 
-def map_state_to_bias(state_vector: List[float]) -> List[float]:
+def map_state_to_bias(state_vector: Vector, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     L1의 상태 벡터를 L0의 바이어스 b로 변환
     
     Args:
-        state_vector: L1 상태 벡터
+        state_vector: L1 상태 벡터 (리스트/배열)
+        out: 결과를 쓸 배열 (옵션)
     
     Returns:
-        b: 바이어스 벡터 (스케일 조정)
+        b: 바이어스 벡터 (스케일 조정, float64 배열)
     """
     # 상태 벡터를 정규화하여 바이어스로 사용
-    return [v * 0.5 for v in state_vector]
+    state = np.asarray(state_vector, dtype=np.float64)
+    out, state = _output(out, state)
+    return np.multiply(state, 0.5, out=out)
 
 
-def apply_importance_gate(I: List[float], importance: List[float]) -> List[float]:
+def apply_importance_gate(
+    I: Vector,
+    importance: Vector,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     중요도에 따라 입력을 게이팅
     
     Args:
         I: 원본 입력
         importance: 중요도 벡터 (0~1)
+        out: 결과를 쓸 배열 (옵션, I 자신이어도 됨)
     
     Returns:
-        gated_I: 게이팅된 입력
+        gated_I: 게이팅된 입력 (float64 배열)
     """
+    I = np.asarray(I, dtype=np.float64)
+    importance = np.asarray(importance, dtype=np.float64)
     if len(I) != len(importance):
         raise ValueError(f"Input length {len(I)} != importance length {len(importance)}")
-    return [I[i] * importance[i] for i in range(len(I))]
+    if out is None:
+        return I * importance
+    return np.multiply(I, importance, out=out)
 
 
 # ============================================================================
@@ -155,8 +208,15 @@ def interpret_convergence(l0_output: L0Output) -> Dict[str, Any]:
     else:
         # 수렴하지 않았으면 불안정 또는 진동
         # 궤적 분석으로 진동 여부 판단
-        if len(l0_output.x_trajectory) > 10:
-            last_10 = l0_output.x_trajectory[-10:]
+        # (recent_states가 있으면 궤적 기록 방식과 무관하게 그것으로)
+        if l0_output.recent_states is not None:
+            n_states = l0_output.steps + 1
+            recent = l0_output.recent_states
+        else:
+            n_states = len(l0_output.x_trajectory)
+            recent = l0_output.x_trajectory
+        if n_states > OSCILLATION_WINDOW:
+            last_10 = recent[-OSCILLATION_WINDOW:]
             variance = sum(
                 sum((last_10[i][j] - last_10[i-1][j])**2 for j in range(len(last_10[0])))
                 for i in range(1, len(last_10))
@@ -210,22 +270,23 @@ class L0L1Interface:
         self,
         neural_core: Optional[NeuralDynamicsCore] = None,
         state_manifold: Optional[StateManifold] = None,
-        default_n_neurons: int = 4
+        default_n_neurons: int = 4,
+        attractor_registry: Optional[AttractorRegistry] = None
     ):
         """
         Args:
             neural_core: L0 (NeuralDynamicsCore) 인스턴스
+                        (없으면 기본 네트워크. Cognitive_Kernel이 없으면
+                        번들 NumPy 코어 l0_dynamics.NeuralDynamicsCore)
             state_manifold: L1 (StateManifold) 인스턴스
             default_n_neurons: L0가 없을 때 기본 뉴런 수
+            attractor_registry: 어트랙터 레지스트리 (옵션). 주어지면 수렴 결과를
+                                등록해 안정적인 attractor_id를 주고, 이미 본 입력은
+                                알려진 어트랙터에서 시작하거나 시뮬레이션을 건너뛴다
         """
-        if not L0_AVAILABLE:
-            raise ImportError(
-                "NeuralDynamicsCore is not available. "
-                "Please ensure Cognitive_Kernel is installed and accessible."
-            )
-        
         self.l0 = neural_core
         self.l1 = state_manifold
+        self.attractors = attractor_registry
         
         # L0가 없으면 기본 네트워크 생성
         if self.l0 is None:
@@ -239,44 +300,46 @@ class L0L1Interface:
     
     def l1_to_l0(
         self,
-        risk_map: Dict[str, float],
-        state_vector: Optional[List[float]] = None,
-        importance: Optional[List[float]] = None
+        risk_map: Union[Dict[str, float], Vector],
+        state_vector: Optional[Vector] = None,
+        importance: Optional[Vector] = None
     ) -> L0Input:
         """
         L1 출력을 L0 입력으로 변환
         
+        I와 b는 L0 뉴런 수 길이의 float64 배열 (넘치면 자르고 모자라면 0).
+        
         Args:
-            risk_map: 조건 서명 → 위험도 맵
+            risk_map: 조건 서명 → 위험도 맵 (또는 위험도 벡터)
             state_vector: L1 상태 벡터 (옵션)
-            importance: 중요도 벡터 (옵션)
+            importance: 중요도 벡터 (옵션, 길이 = 조건 수)
         
         Returns:
             L0Input: L0 입력
         """
-        # 위험도 → 입력
-        I = map_risk_to_input(risk_map)
+        # 게이팅·패딩/자르기를 L0 뉴런 수 크기의 버퍼 위에서 한 번에
+        n_neurons = self.l0.n
+        risks = _risk_vector(risk_map)
+        gate = None
+        if importance is not None and len(importance):
+            gate = np.asarray(importance, dtype=np.float64)
+            if len(gate) != len(risks):
+                raise ValueError(f"Input length {len(risks)} != importance length {len(gate)}")
+        
+        # 위험도 → 입력 (앞쪽 n개만 계산, 나머지는 0)
+        m = min(len(risks), n_neurons)
+        I = np.zeros(n_neurons, dtype=np.float64)
+        map_risk_to_input(risks[:m], out=I[:m])
         
         # 중요도 게이팅
-        if importance:
-            I = apply_importance_gate(I, importance)
+        if gate is not None:
+            apply_importance_gate(I[:m], gate[:m], out=I[:m])
         
         # 상태 벡터 → 바이어스
-        if state_vector:
-            b = map_state_to_bias(state_vector)
-        else:
-            b = [0.0] * len(I)
-        
-        # L0 뉴런 수와 맞추기
-        n_neurons = self.l0.n
-        if len(I) != n_neurons:
-            # 패딩 또는 자르기
-            if len(I) < n_neurons:
-                I = I + [0.0] * (n_neurons - len(I))
-                b = b + [0.0] * (n_neurons - len(b))
-            else:
-                I = I[:n_neurons]
-                b = b[:n_neurons]
+        b = np.zeros(n_neurons, dtype=np.float64)
+        if state_vector is not None and len(state_vector):
+            state = np.asarray(state_vector, dtype=np.float64)[:n_neurons]
+            map_state_to_bias(state, out=b[:len(state)])
         
         return L0Input(
             I=I,
@@ -304,24 +367,47 @@ class L0L1Interface:
             **convergence_info,
             "attention": attention_signal,
             "final_state": l0_output.x_final,
-            "trajectory_length": len(l0_output.x_trajectory)
+            "trajectory_length": l0_output.steps + 1  # x0 포함 상태 수 (궤적을 기록하지 않아도)
         }
     
     def run_integrated(
         self,
-        risk_map: Dict[str, float],
-        state_vector: Optional[List[float]] = None,
-        importance: Optional[List[float]] = None,
-        compute_energy: bool = False
+        risk_map: Union[Dict[str, float], Vector],
+        state_vector: Optional[Vector] = None,
+        importance: Optional[Vector] = None,
+        compute_energy: bool = False,
+        record: str = "full",
+        record_every: int = 10,
+        record_window: int = 100
     ) -> Tuple[L0Output, Dict[str, Any]]:
         """
         L1 → L0 → L1 통합 실행
         
+        궤적 기록 방식 (x_trajectory):
+        - "full": 모든 상태 (x0 포함 steps+1개)
+        - "decimate": record_every 스텝마다 한 상태 + 최종 상태
+        - "ring": 최근 record_window개 상태
+        - "final": 최종 상태만
+        번들 NumPy 코어는 고른 방식의 크기로 미리 잡아 둔 배열에만 기록하므로
+        ring/final의 메모리는 스텝 수와 무관하다. 진동 판정용 최근 상태
+        (OSCILLATION_WINDOW개)는 방식과 무관하게 따로 보관하므로 판정 결과는
+        모든 방식에서 같다. 에너지 궤적은 항상 전 구간이며, 적분하면서 상태를
+        ENERGY_CHUNK 스텝씩 모아 _energies로 한 번에 계산한다.
+        외부 코어는 전체 궤적을 받은 뒤 같은 방식으로 고른다.
+        
+        어트랙터 레지스트리가 있으면 입력(I, b)이 이미 본 입력과 가까울 때
+        그 어트랙터에서 시작하거나 (skip_simulation이면) 적분 없이 돌려주고,
+        수렴 결과를 등록해 피드백의 attractor_id를 레지스트리 ID로 바꾼다
+        (피드백의 "attractor_reuse": None | "warm_start" | "skip").
+        
         Args:
             risk_map: 조건 서명 → 위험도 맵
             state_vector: L1 상태 벡터 (옵션)
             importance: 중요도 벡터 (옵션)
             compute_energy: 에너지 궤적 계산 여부
+            record: 궤적 기록 방식 ("full", "decimate", "ring", "final")
+            record_every: decimate 간격 (스텝)
+            record_window: ring 길이 (상태 수)
         
         Returns:
             (L0Output, L1 피드백)
@@ -329,8 +415,17 @@ class L0L1Interface:
         # L1 → L0
         l0_input = self.l1_to_l0(risk_map, state_vector, importance)
         
+        # 이미 본 입력이면 알려진 어트랙터 재사용
+        key, known = self._recall(l0_input)
+        if known is not None and self.attractors.skip_simulation:
+            l0_output = self._recalled_output(known, compute_energy)
+            return l0_output, self._attractor_feedback(key, l0_output, "skip", known)
+        
         # L0 실행
-        x0 = l0_input.x0 if l0_input.x0 else [0.0] * self.l0.n
+        if known is not None:
+            x0 = self.attractors.state(known).tolist()
+        else:
+            x0 = list(l0_input.x0) if l0_input.x0 is not None and len(l0_input.x0) else [0.0] * self.l0.n
         if len(x0) != self.l0.n:
             x0 = x0[:self.l0.n] if len(x0) > self.l0.n else x0 + [0.0] * (self.l0.n - len(x0))
         
@@ -340,38 +435,260 @@ class L0L1Interface:
         def input_schedule(t: int) -> List[float]:
             return l0_input.I
         
-        trajectory = self.l0.run(
-            x0=x0,
-            steps=steps,
-            input_schedule=input_schedule,
-            stop_tol=1e-6,
-            return_trajectory=True
+        if isinstance(self.l0, BundledDynamicsCore):
+            result = self.l0.simulate(
+                x0,
+                steps,
+                input_schedule=input_schedule,
+                stop_tol=L0_STOP_TOL,
+                record=record,
+                every=record_every,
+                window=record_window,
+                recent=OSCILLATION_WINDOW,
+                compute_energy=compute_energy,
+                energy_fn=self._energies
+            )
+            l0_output = self._make_output(
+                result.trajectory, result.recent, result.x_final, result.steps, steps,
+                compute_energy, energies=result.energies
+            )
+        else:
+            trajectory = self.l0.run(
+                x0=x0,
+                steps=steps,
+                input_schedule=input_schedule,
+                stop_tol=L0_STOP_TOL,
+                return_trajectory=True
+            )
+            trajectory = np.asarray(trajectory, dtype=np.float64).reshape(-1, self.l0.n)
+            if not len(trajectory):
+                trajectory = np.asarray([x0], dtype=np.float64)
+            energies = self._energies(trajectory) if compute_energy else None
+            l0_output = self._make_output(
+                select_trajectory(trajectory, record, record_every, record_window),
+                trajectory[-OSCILLATION_WINDOW:], trajectory[-1], len(trajectory) - 1, steps,
+                compute_energy, energies=energies
+            )
+        
+        # L0 → L1
+        if self.attractors is not None:
+            reuse = "warm_start" if known is not None else None
+            return l0_output, self._attractor_feedback(key, l0_output, reuse)
+        l1_feedback = self.l0_to_l1(l0_output)
+        
+        return l0_output, l1_feedback
+    
+    def run_integrated_batch(
+        self,
+        risk_maps: Sequence[Union[Dict[str, float], Vector]],
+        state_vectors: Optional[Sequence[Optional[Vector]]] = None,
+        importances: Optional[Sequence[Optional[Vector]]] = None,
+        compute_energy: bool = False,
+        record: str = "full",
+        record_every: int = 10,
+        record_window: int = 100
+    ) -> Tuple[List[L0Output], List[Dict[str, Any]]]:
+        """
+        여러 위험도 맵의 L1 → L0 → L1 통합 실행 (배치)
+        
+        입력을 (B × n) 행렬로 쌓아 모든 네트워크 상태를 한 번의 행렬 곱으로
+        함께 적분한다. 행마다 자기 허용치에서 멈추며, 멈춘 행은 이후 계산에서
+        빠진다. 결과는 행마다 run_integrated()와 같은 형태다 (기록 방식도 같음).
+        번들 NumPy 코어가 아니면 행마다 run_integrated()를 호출한다.
+        
+        Args:
+            risk_maps: 위험도 맵들 (B개)
+            state_vectors: 행별 L1 상태 벡터 (옵션)
+            importances: 행별 중요도 벡터 (옵션)
+            compute_energy: 에너지 궤적 계산 여부
+            record: 궤적 기록 방식 ("full", "decimate", "ring", "final")
+            record_every: decimate 간격 (스텝)
+            record_window: ring 길이 (상태 수)
+        
+        Returns:
+            ([L0Output] * B, [L1 피드백] * B)
+        """
+        batch = len(risk_maps)
+        state_vectors = state_vectors if state_vectors is not None else [None] * batch
+        importances = importances if importances is not None else [None] * batch
+        if len(state_vectors) != batch or len(importances) != batch:
+            raise ValueError("state_vectors / importances length must match risk_maps")
+        
+        if not isinstance(self.l0, BundledDynamicsCore):
+            results = [
+                self.run_integrated(
+                    risk_map, state_vector, importance, compute_energy,
+                    record, record_every, record_window
+                )
+                for risk_map, state_vector, importance in zip(risk_maps, state_vectors, importances)
+            ]
+            return [r[0] for r in results], [r[1] for r in results]
+        
+        if not batch:
+            return [], []
+        
+        # L1 → L0 (행별 입력을 쌓기)
+        n = self.l0.n
+        l0_inputs = [
+            self.l1_to_l0(risk_map, state_vector, importance)
+            for risk_map, state_vector, importance in zip(risk_maps, state_vectors, importances)
+        ]
+        inputs = np.stack([l0_input.I for l0_input in l0_inputs])
+        steps = int(l0_inputs[0].T / l0_inputs[0].dt)
+        
+        # 이미 본 입력: 알려진 어트랙터에서 시작 (skip_simulation이면 적분에서 제외)
+        recalled = [self._recall(l0_input) for l0_input in l0_inputs]
+        x0 = np.zeros((batch, n), dtype=np.float64)
+        skipped = np.zeros(batch, dtype=bool)
+        for row, (_, known) in enumerate(recalled):
+            if known is not None:
+                x0[row] = self.attractors.state(known)
+                skipped[row] = self.attractors.skip_simulation
+        
+        # L0 실행: 아직 움직이는 행만 함께 적분
+        recorder = TrajectoryRecorder(
+            record, steps, batch, n, every=record_every, window=record_window
         )
+        tail = TrajectoryRecorder("ring", steps, batch, n, window=OSCILLATION_WINDOW)
+        energies = EnergyRecorder(steps, batch, n, self._energies) if compute_energy else None
+        final = x0
+        lengths = np.full(batch, steps, dtype=np.int64)
+        active = np.flatnonzero(~skipped)
+        x = final[active]
+        I = inputs[active]
+        recorder.record(0, x, active)
+        tail.record(0, x, active)
+        if energies is not None:
+            energies.record(0, x, active)
+        for t in range(steps if len(active) else 0):
+            x_next = self.l0.step(x, I)
+            final[active] = x_next
+            recorder.record(t + 1, x_next, active)
+            tail.record(t + 1, x_next, active)
+            if energies is not None:
+                energies.record(t + 1, x_next, active)
+            done = np.abs(x_next - x).max(axis=1, initial=0.0) < L0_STOP_TOL
+            if done.any():
+                lengths[active[done]] = t + 1
+                keep = ~done
+                active, x, I = active[keep], x_next[keep], I[keep]
+                if not len(active):
+                    break
+            else:
+                x = x_next
         
-        x_final = trajectory[-1] if trajectory else x0
-        converged = len(trajectory) < steps
+        if energies is not None:
+            energies = energies.finish()
+        
+        outputs = []
+        feedback = []
+        for row, (key, known) in enumerate(recalled):
+            if skipped[row]:
+                l0_output = self._recalled_output(known, compute_energy)
+                outputs.append(l0_output)
+                feedback.append(self._attractor_feedback(key, l0_output, "skip", known))
+                continue
+            taken = int(lengths[row])
+            l0_output = self._make_output(
+                recorder.states(row, taken, final[row]),
+                tail.states(row, taken, final[row]),
+                final[row], taken, steps, compute_energy,
+                energies=energies[:taken + 1, row] if energies is not None else None
+            )
+            outputs.append(l0_output)
+            if self.attractors is not None:
+                reuse = "warm_start" if known is not None else None
+                feedback.append(self._attractor_feedback(key, l0_output, reuse))
+            else:
+                feedback.append(self.l0_to_l1(l0_output))
+        return outputs, feedback
+    
+    def _recall(self, l0_input: L0Input) -> Tuple[Optional[np.ndarray], Optional[int]]:
+        """레지스트리 입력 키 (I, b)와 이미 본 입력의 어트랙터 ID (없으면 None)"""
+        if self.attractors is None:
+            return None, None
+        key = np.concatenate([
+            np.asarray(l0_input.I, dtype=np.float64),
+            np.asarray(l0_input.b, dtype=np.float64),
+        ])
+        return key, self.attractors.recall(key)
+    
+    def _recalled_output(self, attractor_id: int, compute_energy: bool) -> L0Output:
+        """시뮬레이션 없이 알려진 어트랙터를 L0Output으로 (0스텝, 수렴)"""
+        state = self.attractors.state(attractor_id)[None, :]
+        energies = self._energies(state) if compute_energy else None
+        output = self._make_output(state, state, state[0], 0, 0, compute_energy, energies=energies)
+        output.converged = True
+        return output
+    
+    def _attractor_feedback(
+        self,
+        key: np.ndarray,
+        l0_output: L0Output,
+        reuse: Optional[str],
+        attractor_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """L1 피드백 + 레지스트리 등록 (수렴했으면 attractor_id = 레지스트리 ID)"""
+        feedback = self.l0_to_l1(l0_output)
+        if feedback["stability"] == "stable":
+            if attractor_id is None:
+                attractor_id = self.attractors.register(l0_output.x_final)
+                self.attractors.remember(key, attractor_id)
+            feedback["attractor_id"] = attractor_id
+        feedback["attractor_reuse"] = reuse
+        return feedback
+    
+    def _energies(self, states: np.ndarray) -> np.ndarray:
+        """상태 행렬 (T × n)의 Hopfield 에너지
+        
+        코어가 hopfield_energy_batch를 제공하면 이차 형식 한 번으로,
+        아니면 상태마다 hopfield_energy를 호출한다.
+        """
+        batch_energy = getattr(self.l0, "hopfield_energy_batch", None)
+        if batch_energy is not None:
+            return np.asarray(batch_energy(states), dtype=np.float64)
+        return np.array([self.l0.hopfield_energy(x) for x in states.tolist()], dtype=np.float64)
+    
+    def _make_output(
+        self,
+        trajectory: np.ndarray,
+        recent: Optional[np.ndarray],
+        x_final: np.ndarray,
+        taken: int,
+        steps: int,
+        compute_energy: bool,
+        energies: Optional[np.ndarray] = None
+    ) -> L0Output:
+        """시뮬레이션 결과로 L0Output 구성 (수렴 판정·에너지 궤적)
+        
+        Args:
+            trajectory: 기록 방식에 따라 남긴 상태들 (시간 순)
+            recent: 최근 상태들 (진동 판정용, 없으면 None)
+            x_final: 최종 상태
+            taken: 실제로 진행한 스텝 수
+            steps: 최대 스텝 수
+            compute_energy: 에너지 궤적 계산 여부
+            energies: 적분 중에 계산한 에너지 (있으면 그대로 사용)
+        """
+        # 궤적 길이(x0 포함) < 최대 스텝 수면 조기 종료 = 수렴
+        converged = taken + 1 < steps
         
         # 에너지 궤적 계산 (옵션)
         energy_trajectory = None
         final_energy = None
         if compute_energy:
-            energy_trajectory = []
-            for x in trajectory:
-                energy = self.l0.hopfield_energy(x)
-                energy_trajectory.append(energy)
+            if energies is None:
+                energies = self._energies(trajectory)
+            energy_trajectory = energies.tolist()
             final_energy = energy_trajectory[-1] if energy_trajectory else None
         
-        l0_output = L0Output(
-            x_trajectory=trajectory,
+        x_final = np.asarray(x_final).tolist()
+        return L0Output(
+            x_trajectory=trajectory.tolist(),
             x_final=x_final,
             energy_trajectory=energy_trajectory,
             converged=converged,
-            steps=len(trajectory) - 1,
-            final_energy=final_energy
+            steps=taken,
+            final_energy=final_energy,
+            recent_states=recent.tolist() if recent is not None else None
         )
-        
-        # L0 → L1
-        l1_feedback = self.l0_to_l1(l0_output)
-        
-        return l0_output, l1_feedback
-
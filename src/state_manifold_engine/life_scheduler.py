@@ -0,0 +1,137 @@
+"""
+StateManifoldEngine - 생명 유지 스케줄러
+
+maintain_life()의 "한 번의 숨결"을 asyncio 위에서 일정한 박자로 반복한다.
+매 틱은 원본을 건드리지 않는 요동(fluctuate_snapshot)으로 새 상태 공간을 만들고,
+engine.manifold 참조를 한 번에 바꿔 게시한다. 이미 시작된 흐름 질의는
+시작할 때 읽은 상태 공간을 끝까지 사용하므로 질의 경로에 잠금이 필요 없다.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Callable, Optional
+
+from .models import StateManifold
+
+
+class LifeMaintenanceScheduler:
+    """백그라운드 생명 유지 스케줄러
+
+    틱 간격은 1 / rate_hz 초. 요동 계산은 executor(기본: 이벤트 루프의
+    기본 스레드 풀)에서 실행되며, 한 틱의 CPU 시간이 cpu_budget 비율을
+    넘지 않도록 다음 틱까지 충분히 쉰다. CPU 시간은 작업 스레드 안에서
+    time.thread_time()으로 재므로 executor 대기열·GIL 대기는 들어가지 않는다.
+
+    Attributes:
+        ticks: 게시된 스냅샷 수
+        skipped: 계산 도중 상태 공간이 바뀌어 버려진 틱 수
+        busy_seconds: 요동 계산에 쓴 누적 CPU 시간 (작업 스레드 기준, 초)
+    """
+
+    def __init__(
+        self,
+        engine,
+        rate_hz: float = 1.0,
+        fluctuation_scale: float = 0.01,
+        iterations_per_tick: int = 1,
+        cpu_budget: float = 0.1,
+        executor: Optional[Executor] = None,
+        on_publish: Optional[Callable[[StateManifold], None]] = None,
+    ):
+        """
+        Args:
+            engine: StateManifoldEngine
+            rate_hz: 초당 틱 수 (상한)
+            fluctuation_scale: 미세 요동의 크기
+            iterations_per_tick: 틱 하나의 요동 반복 횟수
+            cpu_budget: 요동 계산에 쓸 수 있는 CPU 시간 비율 (0.0 ~ 1.0]
+            executor: 요동 계산을 실행할 Executor (None이면 루프 기본값)
+            on_publish: 새 스냅샷이 게시될 때 호출 (이벤트 루프 스레드)
+        """
+        if rate_hz <= 0.0:
+            raise ValueError(f"rate_hz는 양수여야 합니다: {rate_hz}")
+        if not 0.0 < cpu_budget <= 1.0:
+            raise ValueError(f"cpu_budget은 (0, 1] 범위여야 합니다: {cpu_budget}")
+        self.engine = engine
+        self.period = 1.0 / rate_hz
+        self.fluctuation_scale = fluctuation_scale
+        self.iterations_per_tick = iterations_per_tick
+        self.cpu_budget = cpu_budget
+        self.executor = executor
+        self.on_publish = on_publish
+
+        self.ticks = 0
+        self.skipped = 0
+        self.busy_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        """실행 중인 이벤트 루프에서 스케줄러 시작"""
+        if self.running:
+            raise RuntimeError("스케줄러가 이미 실행 중입니다.")
+        self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """스케줄러 정지 (진행 중인 틱은 게시하지 않음)"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def run(self, max_ticks: Optional[int] = None) -> None:
+        """틱 반복 (max_ticks회 시도 후 종료, None이면 취소될 때까지)"""
+        attempts = 0
+        while max_ticks is None or attempts < max_ticks:
+            elapsed = await self.tick()
+            attempts += 1
+            if max_ticks is not None and attempts >= max_ticks:
+                break
+            # 박자 유지 + 계산 CPU 시간 / 전체 시간 ≤ cpu_budget
+            delay = max(self.period - elapsed, elapsed * (1.0 / self.cpu_budget - 1.0))
+            await asyncio.sleep(delay)
+
+    async def tick(self) -> float:
+        """한 번의 숨결: 새 스냅샷을 계산해 게시
+
+        계산하는 동안 engine.manifold가 다른 것으로 바뀌었으면
+        (build_state_space 등) 덮어쓰지 않고 버린다.
+
+        Returns:
+            요동 계산에 쓴 CPU 시간 (초)
+        """
+        base = self.engine.manifold
+        if not base:
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        snapshot, elapsed = await loop.run_in_executor(self.executor, self._fluctuate, base)
+        self.busy_seconds += elapsed
+
+        if self.engine.manifold is not base:
+            self.skipped += 1
+            return elapsed
+        if snapshot is not base:
+            # 참조 한 번 바꾸기 = 원자적 게시
+            self.engine.manifold = snapshot
+            if self.on_publish is not None:
+                self.on_publish(snapshot)
+        self.ticks += 1
+        return elapsed
+
+    def _fluctuate(self, base: StateManifold):
+        """executor에서 실행: (새 스냅샷, 이 스레드가 쓴 CPU 시간)"""
+        started = time.thread_time()
+        snapshot = self.engine.fluctuate_snapshot(
+            self.fluctuation_scale, self.iterations_per_tick, manifold=base
+        )
+        return snapshot, time.thread_time() - started
@@ -4,8 +4,22 @@ StateManifoldEngine - 데이터 모델
 메타 엔진: 여러 난제가 동시에 겹쳐진 상태 공간
 """
 
+import copy
+import itertools
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Any
+
+import numpy as np
+
+from .condition_index import ConditionIndex
+from .risk_matrix import MatrixBias, RiskMatrix, fuse_risks
+from .routing import NeighborhoodGraph, min_step_cost
+from .zone_index import CollapseZoneIndex
+
+
+# 상태 공간 버전 번호 (프로세스 전역, 단조 증가)
+_versions = itertools.count(1)
 
 
 @dataclass
@@ -13,7 +27,11 @@ class CollapseZone:
     """붕괴 영역
     
     여러 난제의 붕괴 조건이 겹쳐진 영역.
+    StateManifold는 영역을 CollapseZoneTable(배열)로 들고 있고,
+    이 객체는 영역에 접근할 때 그때그때 만들어진다.
     """
+    __slots__ = ("condition_signature", "dimensions", "organic_risk")
+    
     condition_signature: str  # 조건 서명
     dimensions: Dict[str, float]  # 차원별 위험도 (예: {"three_body": 0.8, "navier_stokes": 0.7})
     organic_risk: float  # 유기적 위험도 (단순 합산이 아님)
@@ -23,6 +41,176 @@ class CollapseZone:
         return self.organic_risk
 
 
+class CollapseZoneTable(Sequence):
+    """붕괴 영역 표 (구조체 배열)
+    
+    영역마다 객체와 딕셔너리를 두는 대신 평행 배열로 저장한다.
+    차원별 위험도는 CSR(영역별 구간)로 담는다. CollapseZone은 인덱싱·순회할
+    때만 만들어지며, 배열은 만든 뒤 바꾸지 않으므로 여러 버전이 표를 공유한다.
+    
+    Attributes:
+        condition_index: 조건 서명 ↔ ID 색인
+        dimension_names: 차원 이름 (dims가 가리키는 목록)
+        condition_ids: 영역의 조건 ID (오름차순)
+        organic_risks: 영역의 유기적 위험도
+        indptr: 영역별 차원 구간 시작 위치 (길이 영역 수 + 1)
+        dims: 차원 번호 (dimension_names 위치)
+        values: 차원별 위험도
+    """
+    
+    def __init__(
+        self,
+        condition_index: ConditionIndex,
+        dimension_names: List[str],
+        condition_ids: np.ndarray,
+        organic_risks: np.ndarray,
+        indptr: np.ndarray,
+        dims: np.ndarray,
+        values: np.ndarray,
+    ):
+        self.condition_index = condition_index
+        self.dimension_names = dimension_names
+        self.condition_ids = condition_ids
+        self.organic_risks = organic_risks
+        self.indptr = indptr
+        self.dims = dims
+        self.values = values
+    
+    @classmethod
+    def empty(cls, condition_index: ConditionIndex) -> "CollapseZoneTable":
+        return cls(
+            condition_index, [],
+            np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64),
+            np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64),
+        )
+    
+    @classmethod
+    def from_zones(
+        cls,
+        zones: Iterable[CollapseZone],
+        condition_index: ConditionIndex
+    ) -> "CollapseZoneTable":
+        """CollapseZone 목록으로 표 만들기 (조건 서명은 색인에 등록, 조건 ID 순 정렬)"""
+        zones = list(zones)
+        names: Dict[str, int] = {}
+        dims: List[int] = []
+        values: List[float] = []
+        indptr = [0]
+        for zone in zones:
+            for name, risk in zone.dimensions.items():
+                dims.append(names.setdefault(name, len(names)))
+                values.append(risk)
+            indptr.append(len(dims))
+        table = cls(
+            condition_index,
+            list(names),
+            np.array([condition_index.intern(z.condition_signature) for z in zones], dtype=np.int64),
+            np.array([z.organic_risk for z in zones], dtype=np.float64),
+            np.array(indptr, dtype=np.int64),
+            np.array(dims, dtype=np.int64),
+            np.array(values, dtype=np.float64),
+        )
+        return table.take(np.argsort(table.condition_ids, kind="stable"))
+    
+    def __len__(self) -> int:
+        return len(self.condition_ids)
+    
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.zone(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"붕괴 영역 위치 범위 밖: {position}")
+        return self.zone(position)
+    
+    def __iter__(self) -> Iterator[CollapseZone]:
+        for position in range(len(self)):
+            yield self.zone(position)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CollapseZoneTable) and other.condition_index is self.condition_index:
+            names = np.array(self.dimension_names, dtype=object)
+            other_names = np.array(other.dimension_names, dtype=object)
+            return (
+                np.array_equal(self.condition_ids, other.condition_ids)
+                and np.array_equal(self.organic_risks, other.organic_risks)
+                and np.array_equal(self.indptr, other.indptr)
+                and np.array_equal(names[self.dims], other_names[other.dims])
+                and np.array_equal(self.values, other.values)
+            )
+        if isinstance(other, (CollapseZoneTable, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"CollapseZoneTable(n_zones={len(self)})"
+    
+    def zone(self, position: int) -> CollapseZone:
+        """position번째 영역의 CollapseZone"""
+        start, stop = int(self.indptr[position]), int(self.indptr[position + 1])
+        names = self.dimension_names
+        return CollapseZone(
+            condition_signature=self.condition_index.signature(int(self.condition_ids[position])),
+            dimensions={
+                names[d]: v
+                for d, v in zip(self.dims[start:stop].tolist(), self.values[start:stop].tolist())
+            },
+            organic_risk=float(self.organic_risks[position]),
+        )
+    
+    def positions(self, condition_ids) -> np.ndarray:
+        """조건 ID들의 표 안 위치 (모두 표에 있어야 함)"""
+        return np.searchsorted(self.condition_ids, np.asarray(condition_ids, dtype=np.int64))
+    
+    def zone_dimensions(self, position: int) -> List[str]:
+        """position번째 영역에 얽힌 차원 이름들"""
+        start, stop = int(self.indptr[position]), int(self.indptr[position + 1])
+        return [self.dimension_names[d] for d in self.dims[start:stop].tolist()]
+    
+    def take(self, positions: np.ndarray) -> "CollapseZoneTable":
+        """positions 행만 골라 새 표 (주어진 순서)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.indptr[positions]
+        lengths = self.indptr[positions + 1] - starts
+        indptr = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        flat = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1], dtype=np.int64)
+        return CollapseZoneTable(
+            self.condition_index, self.dimension_names,
+            self.condition_ids[positions], self.organic_risks[positions],
+            indptr, self.dims[flat], self.values[flat],
+        )
+    
+    def replace(self, condition_ids: np.ndarray, zones: "CollapseZoneTable") -> "CollapseZoneTable":
+        """condition_ids의 영역을 지우고 zones를 합친 새 표 (조건 ID 순서 유지)
+        
+        Args:
+            condition_ids: 다시 판정한 조건 ID들 (지금 영역이 아니어도 됨)
+            zones: 그 조건들의 새 판정 결과
+        """
+        kept = self.take(np.flatnonzero(~np.isin(self.condition_ids, condition_ids)))
+        
+        # zones의 차원 번호를 이 표의 이름 목록으로 옮긴다 (새 이름은 뒤에 추가)
+        names = list(self.dimension_names)
+        lookup = {name: d for d, name in enumerate(names)}
+        remap = np.array(
+            [lookup.setdefault(name, len(lookup)) for name in zones.dimension_names],
+            dtype=np.int64,
+        )
+        names.extend(list(lookup)[len(names):])
+        
+        merged = CollapseZoneTable(
+            self.condition_index, names,
+            np.concatenate([kept.condition_ids, zones.condition_ids]),
+            np.concatenate([kept.organic_risks, zones.organic_risks]),
+            np.concatenate([kept.indptr[:-1], zones.indptr + kept.indptr[-1]]),
+            np.concatenate([kept.dims, remap[zones.dims]]),
+            np.concatenate([kept.values, zones.values]),
+        )
+        return merged.take(np.argsort(merged.condition_ids, kind="stable"))
+
+
 @dataclass
 class StateManifold:
     """상태 공간 (Manifold)
@@ -33,10 +221,65 @@ class StateManifold:
         dimensions: 차원별 위험 지형 (난제 이름 → SearchBias)
         organic_connections: 유기적 연결 가중치 (난제 쌍 → 가중치)
         collapse_zones: 통합 붕괴 영역
+        condition_index: 조건 서명 ↔ 정수 ID 색인
+        risk_matrix: 조건 × 차원 위험도 행렬 (행 = 조건 ID)
+        neighborhood: 조건 ID 간 인접 구조 (dijkstra/astar 흐름용, 선택)
+        version: 버전 번호 (생성·변경될 때마다 새로 부여, 캐시 키용)
+    
+    StateManifoldEngine의 갱신 API(update_dimension, apply_risk_deltas,
+    maintain_life 등)는 기존 상태 공간을 바꾸지 않고 새 버전을 만든다.
+    새 버전은 바뀌지 않은 위험도 열을 이전 버전과 공유한다 (쓰기 시 복사).
+    위험도 행렬이 기준이며 SearchBias에는 다시 쓰지 않는다.
     """
     dimensions: Dict[str, Any] = field(default_factory=dict)  # 차원별 위험 지형
     organic_connections: Dict[Tuple[str, str], float] = field(default_factory=dict)  # 유기적 연결
-    collapse_zones: List[CollapseZone] = field(default_factory=list)  # 통합 붕괴 영역
+    collapse_zones: CollapseZoneTable = field(default_factory=list)  # 통합 붕괴 영역 (조건 ID 순)
+    condition_index: Optional[ConditionIndex] = field(default=None, repr=False, compare=False)  # 조건 서명 ↔ ID
+    risk_matrix: Optional[RiskMatrix] = field(default=None, repr=False, compare=False)  # 컴파일된 위험도 행렬
+    neighborhood: Optional[NeighborhoodGraph] = field(default=None, repr=False, compare=False)  # 조건 간 인접 구조
+    
+    # 통합 위험도 캐시 (조건 ID → 통합 위험도, 유효 여부)
+    # 두 배열을 튜플 하나로 바꿔 끼우므로 읽는 쪽은 항상 짝이 맞는 쌍을 본다
+    _fused: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    _fused_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _risk_order: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    # 경로 탐색용 (통합 위험도, A* 한 걸음 비용 하한) — 정렬 색인과 같이 무효화
+    _route: Optional[Tuple[np.ndarray, float]] = field(default=None, init=False, repr=False, compare=False)
+    # 차원 쌍별 (공통 조건 수, 동시 고위험 조건 수) — 증분 갱신용
+    _pair_counts: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    # 행별로 항목이 있는 차원 수 (0이면 차원 제거·교체로 어디에도 남지 않은 조건)
+    _coverage: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    # 붕괴 영역 정렬 색인 (처음 질의할 때 만들고 이후 증분 갱신)
+    _collapse_index: Optional[CollapseZoneIndex] = field(default=None, init=False, repr=False, compare=False)
+    # 색인을 만든(또는 마지막으로 맞춘) 붕괴 영역 표 — 다른 표로 바뀌면 색인은 낡은 것
+    _collapse_index_table: Optional[CollapseZoneTable] = field(default=None, init=False, repr=False, compare=False)
+    # 다른 버전과 공유 중인 캐시 필드 이름 (쓰기 전에 _own으로 복사)
+    _shared: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    fused_cache_hits: int = field(default=0, init=False, repr=False, compare=False)
+    fused_cache_misses: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.version = next(_versions)
+        # 직접 생성된 경우에도 조건 색인과 위험도 행렬을 컴파일해 둔다
+        if self.condition_index is None:
+            self.condition_index = ConditionIndex()
+        if self.risk_matrix is None and self.dimensions:
+            self.risk_matrix = RiskMatrix.from_biases(self.dimensions, self.condition_index)
+        if not isinstance(self.collapse_zones, CollapseZoneTable):
+            self.collapse_zones = CollapseZoneTable.from_zones(self.collapse_zones, self.condition_index)
+        if self.risk_matrix is not None:
+            n_rows = self.risk_matrix.n_rows
+            self._fused = (np.zeros(n_rows, dtype=np.float64), np.zeros(n_rows, dtype=bool))
+    
+    def condition_id(self, condition_signature: str) -> Optional[int]:
+        """조건 서명의 ID (행렬에 없으면 None)"""
+        condition_id = self.condition_index.id_of(condition_signature)
+        if condition_id is None or self.risk_matrix is None:
+            return None
+        if condition_id >= self.risk_matrix.n_rows or not self.coverage()[condition_id]:
+            return None
+        return condition_id
     
     def get_risk(
         self,
@@ -52,34 +295,403 @@ class StateManifold:
         Returns:
             위험도 (0.0 ~ 1.0)
         """
+        matrix = self.risk_matrix
+        row = self.condition_id(condition_signature)
+        
         if dimension:
             # 특정 차원의 위험도
+            if row is not None:
+                return matrix.value(row, dimension)
             bias = self.dimensions.get(dimension)
             if bias and hasattr(bias, 'get_risk'):
                 return bias.get_risk(condition_signature)
             return 0.0
         
-        # 통합 위험도: 모든 차원의 위험도를 유기적으로 결합
+        # 통합 위험도: 모든 차원의 위험도를 유기적으로 결합 (캐시 우선)
+        if row is not None:
+            cache, valid = self._ensure_fused_cache()
+            if valid[row]:
+                self.fused_cache_hits += 1
+                return float(cache[row])
+            self.fused_cache_misses += 1
+            risk = fuse_risks(matrix.row_risks(row))
+            # 값을 먼저 쓰고 유효 표시 (동시에 써도 같은 값)
+            cache, valid = self._own("_fused")
+            cache[row] = risk
+            valid[row] = True
+            return risk
+        
+        # 행렬에 없는 조건: 차원별 SearchBias에 직접 질의
         risks = []
         for dim_name, bias in self.dimensions.items():
             if bias and hasattr(bias, 'get_risk'):
-                risk = bias.get_risk(condition_signature)
-                risks.append((dim_name, risk))
+                risks.append(bias.get_risk(condition_signature))
         
-        if not risks:
-            return 0.0
+        return fuse_risks(risks)
+    
+    def get_risks(self, condition_signatures: Iterable[str]) -> List[float]:
+        """여러 조건의 통합 위험도를 한 번에 반환
+        
+        행렬에 있는 조건은 한 번의 벡터화 패스로 계산한다.
+        
+        Args:
+            condition_signatures: 조건 서명들
+        
+        Returns:
+            통합 위험도 리스트 (입력 순서)
+        """
+        conditions = list(condition_signatures)
+        matrix = self.risk_matrix
+        if matrix is None:
+            return [self.get_risk(c) for c in conditions]
+        
+        rows = [self.condition_id(c) for c in conditions]
+        known = [i for i, row in enumerate(rows) if row is not None]
+        fused = self.get_risks_by_id([rows[i] for i in known]).tolist()
+        
+        risks: List[float] = [0.0] * len(conditions)
+        for i, risk in zip(known, fused):
+            risks[i] = risk
+        if len(known) != len(conditions):
+            for i, row in enumerate(rows):
+                if row is None:
+                    risks[i] = self.get_risk(conditions[i])
+        return risks
+    
+    def get_risks_by_id(self, condition_ids) -> np.ndarray:
+        """조건 ID 배열의 통합 위험도 (경로 탐색 등 내부용)
+        
+        캐시에 없는 행만 한 번의 벡터화 패스로 계산해 채운다.
+        
+        Args:
+            condition_ids: 조건 ID 배열 (None이면 전체)
+        
+        Returns:
+            통합 위험도 배열
+        """
+        if self.risk_matrix is None:
+            return np.zeros(0 if condition_ids is None else len(condition_ids))
+        
+        cache, valid = self._ensure_fused_cache()
+        if condition_ids is None:
+            missing = np.flatnonzero(~valid)
+            requested = len(valid)
+        else:
+            condition_ids = np.asarray(condition_ids, dtype=np.int64)
+            missing = np.unique(condition_ids[~valid[condition_ids]])
+            requested = len(condition_ids)
+        
+        if len(missing):
+            cache, valid = self._own("_fused")
+            cache[missing] = self.risk_matrix.fused_risk(missing)
+            valid[missing] = True
+        self.fused_cache_misses += len(missing)
+        self.fused_cache_hits += requested - len(missing)
+        
+        if condition_ids is None:
+            return cache.copy()
+        return cache[condition_ids]
+    
+    def invalidate_risks(self, condition_ids=None) -> None:
+        """통합 위험도 캐시 무효화
         
-        # 유기적 결합: 단순 평균이 아니라 가중 평균 + 유기적 증폭
-        base_risk = sum(risk for _, risk in risks) / len(risks)
+        Args:
+            condition_ids: 무효화할 조건 ID들 (None이면 전체)
+        """
+        self._risk_order = None
+        self._route = None
+        if self._fused is None:
+            return
+        valid = self._own("_fused")[1]
+        if condition_ids is None:
+            valid[:] = False
+        else:
+            # 캐시가 아직 모르는 새 행은 어차피 무효 상태
+            condition_ids = np.asarray(condition_ids, dtype=np.int64)
+            valid[condition_ids[condition_ids < len(valid)]] = False
+    
+    def risk_order(self) -> Tuple[np.ndarray, np.ndarray]:
+        """통합 위험도 오름차순 조건 색인
+        
+        안정 정렬이므로 위험도가 같으면 ID가 작은 조건이 앞선다.
+        어느 차원에도 항목이 없는 조건(coverage 0)은 빠진다.
+        위험도가 바뀔 때까지 한 번만 만들고 재사용한다.
+        
+        Returns:
+            (조건 ID 배열, 정렬된 통합 위험도 배열)
+        """
+        order = self._risk_order
+        if order is None:
+            fused = self.get_risks_by_id(None)
+            ids = np.argsort(fused, kind="stable")
+            # 어느 차원에도 없는 조건은 후보가 아니다
+            ids = ids[self.coverage()[ids] > 0]
+            order = self._risk_order = (ids, fused[ids])
+        return order
+    
+    def coverage(self) -> np.ndarray:
+        """행별로 항목이 있는 차원 수 (처음 한 번 계산, 이후 증분 갱신)"""
+        coverage = self._coverage
+        n_rows = self.risk_matrix.n_rows
+        if coverage is None or len(coverage) < n_rows:
+            if coverage is None:
+                coverage = self.risk_matrix.row_coverage()
+            else:
+                coverage = np.pad(coverage, (0, n_rows - len(coverage)))
+            self._coverage = coverage
+            self._shared.discard("_coverage")
+        return coverage
+    
+    def adjust_coverage(self, rows: np.ndarray, delta) -> None:
+        """rows의 항목 차원 수를 delta만큼 증감 (아직 계산 전이면 무시)"""
+        if self._coverage is None:
+            return
+        self.coverage()
+        self._own("_coverage")[rows] += delta
+        self._risk_order = None
+        self._route = None
+    
+    def route_risks(self) -> np.ndarray:
+        """경로 탐색용 통합 위험도 (어느 차원에도 없는 조건은 통과 불가 = inf, 읽기 전용)"""
+        return self._routing()[0]
+    
+    def route_step_cost(self) -> float:
+        """route_risks()의 min_step_cost (A* 휴리스틱용, 위험도가 바뀔 때까지 재사용)"""
+        return self._routing()[1]
+    
+    def _routing(self) -> Tuple[np.ndarray, float]:
+        routing = self._route
+        if routing is None or len(routing[0]) != self.risk_matrix.n_rows:
+            risks = self.get_risks_by_id(None)
+            risks[self.coverage() == 0] = np.inf
+            risks.setflags(write=False)
+            routing = self._route = (risks, min_step_cost(risks))
+        return routing
+    
+    def pair_counts(self, writable: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """차원 쌍별 공통 조건 수 / 동시 고위험 조건 수 (D×D, 처음 한 번만 계산)
+        
+        Args:
+            writable: True면 제자리에서 고쳐 쓸 수 있는 이 버전 전용 배열
+        """
+        if self._pair_counts is None:
+            self._pair_counts = self.risk_matrix.pair_counts()
+            self._shared.discard("_pair_counts")
+        elif writable:
+            return self._own("_pair_counts")
+        return self._pair_counts
+    
+    def collapse_zone_ids(self) -> np.ndarray:
+        """collapse_zones 각 영역의 조건 ID (같은 순서, 오름차순)"""
+        return self.collapse_zones.condition_ids
+    
+    def collapse_index(self) -> CollapseZoneIndex:
+        """붕괴 영역 정렬 색인 (유기적 위험도 순, 차원별)"""
+        index = self._collapse_index
+        table = self.collapse_zones
+        if index is None or self._collapse_index_table is not table:
+            index = self._collapse_index = CollapseZoneIndex.from_table(table)
+            self._collapse_index_table = table
+            self._shared.discard("_collapse_index")
+        return index
+    
+    def top_collapse_zones(self, k: int, dimension: Optional[str] = None) -> List[CollapseZone]:
+        """유기적 위험도가 가장 높은 붕괴 영역 k개 (내림차순)
+        
+        Args:
+            k: 개수
+            dimension: 주어지면 그 차원이 얽힌 영역 중에서만
+        """
+        return self._zones_of(self.collapse_index().top_k(k, dimension))
+    
+    def collapse_zones_in_range(
+        self,
+        low: float,
+        high: float,
+        dimension: Optional[str] = None
+    ) -> List[CollapseZone]:
+        """유기적 위험도가 [low, high]인 붕괴 영역 (내림차순)
         
-        # 유기적 증폭: 여러 차원에서 동시에 위험한 경우 증폭
-        high_risk_count = sum(1 for _, risk in risks if risk > 0.7)
-        if high_risk_count > 1:
-            # 여러 차원에서 동시에 위험 → 유기적 증폭
-            organic_boost = 1.0 + (high_risk_count - 1) * 0.2
-            base_risk = min(1.0, base_risk * organic_boost)
+        Args:
+            low: 하한 (포함)
+            high: 상한 (포함)
+            dimension: 주어지면 그 차원이 얽힌 영역 중에서만
+        """
+        return self._zones_of(self.collapse_index().in_range(low, high, dimension))
+    
+    def collapse_zones_by_dimension(self, dimension: str) -> List[CollapseZone]:
+        """dimension이 얽힌 붕괴 영역 (유기적 위험도 내림차순)"""
+        return self._zones_of(self.collapse_index().by_dimension(dimension))
+    
+    def _zones_of(self, condition_ids: List[int]) -> List[CollapseZone]:
+        """조건 ID들의 CollapseZone (필요한 영역만 만든다)"""
+        table = self.collapse_zones
+        return [table.zone(position) for position in table.positions(condition_ids).tolist()]
+    
+    def fused_cache_info(self) -> Dict[str, int]:
+        """통합 위험도 캐시 통계
         
-        return base_risk
+        Returns:
+            {"hits", "misses", "size" (캐시된 조건 수), "capacity" (전체 조건 수)}
+        """
+        valid = self._fused[1] if self._fused is not None else None
+        return {
+            "hits": self.fused_cache_hits,
+            "misses": self.fused_cache_misses,
+            "size": int(valid.sum()) if valid is not None else 0,
+            "capacity": len(valid) if valid is not None else 0,
+        }
+    
+    def _ensure_fused_cache(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(캐시, 유효 여부) 배열 쌍을 행렬 행 수에 맞춘다 (새 행은 무효 상태)
+        
+        행렬이 늘어났을 때만 잠금 안에서 새 쌍을 만들어 한 번에 바꿔 끼운다.
+        """
+        fused = self._fused
+        n_rows = self.risk_matrix.n_rows
+        if fused is not None and len(fused[1]) == n_rows:
+            return fused
+        with self._fused_lock:
+            fused = self._fused
+            if fused is None or len(fused[1]) != n_rows:
+                cache = np.zeros(n_rows, dtype=np.float64)
+                valid = np.zeros(n_rows, dtype=bool)
+                if fused is not None:
+                    kept = min(len(fused[1]), n_rows)
+                    # 유효 표시를 먼저 복사 (표시된 행의 값은 이미 쓰여 있다)
+                    valid[:kept] = fused[1][:kept]
+                    cache[:kept] = fused[0][:kept]
+                fused = self._fused = (cache, valid)
+                self._shared.discard("_fused")
+                self._risk_order = None
+                self._route = None
+        return fused
+    
+    def _own(self, name: str):
+        """캐시 필드를 쓰기 전에 다른 버전과 공유 중이면 복사해 이 버전 전용으로"""
+        if name not in self._shared:
+            return getattr(self, name)
+        with self._fused_lock:
+            value = getattr(self, name)
+            if name in self._shared:
+                if isinstance(value, tuple):
+                    value = tuple(array.copy() for array in value)
+                elif value is not None:
+                    value = value.copy()
+                setattr(self, name, value)
+                self._shared.discard(name)
+        return value
+    
+    def save(self, path) -> None:
+        """단일 바이너리 파일로 저장 (storage.save_manifold)
+        
+        Args:
+            path: 파일 경로
+        """
+        from .storage import save_manifold
+        save_manifold(self, path)
+    
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "StateManifold":
+        """save()로 저장한 파일 적재 (storage.load_manifold)
+        
+        Args:
+            path: 파일 경로
+            mmap: True면 위험도 행렬 등을 메모리 맵으로 (복사 없음, 읽기 전용)
+        
+        Returns:
+            상태 공간 (dimensions는 위험도 행렬 열의 MatrixBias 뷰)
+        """
+        from .storage import load_manifold
+        return load_manifold(path, mmap=mmap)
+    
+    def _clone(self) -> "StateManifold":
+        """새 버전 (쓰기 시 복사)
+        
+        조건 색인·인접 구조·붕괴 영역 표(바뀌지 않는 배열)는 공유하고,
+        위험도 행렬은 열을 공유하는 사본으로, 나머지 컨테이너는 얕게 복사한다.
+        통합 위험도·쌍별 셀 수·행별 차원 수·붕괴 영역 색인 캐시는 양쪽이
+        공유하다가 어느 쪽이든 처음 쓸 때 복사한다 (_own).
+        SearchBias는 공유한다 (set_risk는 행렬에만 쓴다).
+        """
+        matrix = self.risk_matrix.copy() if self.risk_matrix is not None else None
+        clone = StateManifold(
+            # 행렬 열 뷰(MatrixBias)는 새 행렬에 다시 묶는다
+            dimensions={
+                name: bias.rebind(matrix) if isinstance(bias, MatrixBias) and matrix is not None else bias
+                for name, bias in self.dimensions.items()
+            },
+            organic_connections=dict(self.organic_connections),
+            collapse_zones=self.collapse_zones,
+            condition_index=self.condition_index,
+            risk_matrix=matrix,
+            neighborhood=self.neighborhood,
+        )
+        # 캐시는 양쪽이 공유하고, 먼저 쓰는 쪽이 복사한다 (_own)
+        with self._fused_lock:
+            for name in ("_fused", "_pair_counts", "_coverage", "_collapse_index"):
+                value = getattr(self, name)
+                if value is not None:
+                    setattr(clone, name, value)
+                    self._shared.add(name)
+                    clone._shared.add(name)
+        clone._collapse_index_table = self._collapse_index_table
+        clone._risk_order = self._risk_order
+        clone._route = self._route
+        return clone
+    
+    def set_risk(
+        self,
+        condition_signature: str,
+        dimension: str,
+        risk: float
+    ) -> "StateManifold":
+        """특정 차원의 위험도를 바꾼 새 버전
+        
+        이 상태 공간은 그대로 두고 (_clone으로 만든) 새 버전의 위험도 행렬만
+        갱신한 뒤, 해당 조건의 통합 위험도 캐시만 무효화해 돌려준다.
+        행렬이 기준이므로 SearchBias에는 쓰지 않는다 (버전끼리 SearchBias를
+        공유하므로). 행렬에 없는 차원이면 SearchBias를 새 버전 전용 사본으로
+        바꾼 뒤 기록한다 (set_risk 메서드가 없으면 risk_map을 직접 수정).
+        
+        Args:
+            condition_signature: 조건 서명
+            dimension: 차원 이름
+            risk: 새 위험도
+        
+        Returns:
+            갱신된 새 버전의 상태 공간 (엔진에 게시하지 않음)
+        """
+        clone = self._clone()
+        matrix = clone.risk_matrix
+        if matrix is not None and dimension in matrix.dim_index:
+            condition_id = clone.condition_index.intern(condition_signature)
+            j = matrix.dim_index[dimension]
+            was_present = condition_id < matrix.n_rows and bool(
+                matrix.gather_present(j, np.array([condition_id]))[0]
+            )
+            matrix.set_value(condition_id, dimension, risk)
+            if not was_present:
+                clone.adjust_coverage(np.array([condition_id]), 1)
+            # 바뀐 조건의 통합 위험도만 무효화 (쌍별 셀 수는 다시 만든다)
+            clone.invalidate_risks(np.array([condition_id]))
+            clone._pair_counts = None
+        else:
+            bias = clone.dimensions[dimension] = copy.deepcopy(clone.dimensions[dimension])
+            if hasattr(bias, 'set_risk'):
+                bias.set_risk(condition_signature, risk)
+            elif hasattr(bias, 'risk_map') and isinstance(bias.risk_map, dict):
+                bias.risk_map[condition_signature] = risk
+        return clone
+    
+    def set_risk_by_id(
+        self,
+        condition_id: int,
+        dimension: str,
+        risk: float
+    ) -> "StateManifold":
+        """조건 ID로 특정 차원의 위험도를 바꾼 새 버전"""
+        return self.set_risk(self.condition_index.signature(condition_id), dimension, risk)
 
 
 @dataclass
@@ -88,6 +700,8 @@ class FlowResult:
     
     값이 상태 공간을 통과한 결과.
     """
+    __slots__ = ("value", "path", "flow_energy", "form_preservation", "stability")
+    
     value: Any  # 통과한 값 (형태 보존)
     path: List[str]  # 경로 (조건 서명 리스트)
     flow_energy: float  # 흐름 에너지 (공간의 저항)
@@ -0,0 +1,808 @@
+"""
+StateManifoldEngine - 위험도 행렬
+
+여러 SearchBias를 조건 × 차원 실수 행렬로 컴파일한 열 지향(columnar) 저장소.
+통합 위험도(평균 + 유기적 증폭)를 조건 묶음 단위의 벡터화 연산으로 계산한다.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Any
+
+import numpy as np
+
+from .condition_index import ConditionIndex
+
+
+# 유기적 증폭 규칙 (StateManifold.get_risk와 동일)
+ORGANIC_HIGH_RISK = 0.7  # 이 값을 넘는 차원이 여러 개면 증폭
+ORGANIC_BOOST_STEP = 0.2  # 고위험 차원 하나당 증폭률
+
+# 붕괴 영역 판정 규칙
+COLLAPSE_DIM_RISK = 0.5  # 이 값을 넘는 차원만 붕괴 위험도에 반영
+COLLAPSE_ZONE_RISK = 0.7  # 유기적 위험도가 이 값을 넘으면 붕괴 영역
+
+# 저장 방식: 채움 비율(항목 수 / (조건 수 × 차원 수))이 이보다 낮으면 희소
+SPARSE_FILL_RATIO = 0.25
+MATRIX_LAYOUTS = ("auto", "dense", "sparse")
+
+# 미세 요동 규칙 (StateManifoldEngine.maintain_life)
+FLUCTUATION_MIN_RISK = 0.2  # 이 값보다 낮은 위험도는 건드리지 않음
+FLUCTUATION_HIGH_RISK = 0.8  # 이 값을 넘는 차원이 여러 개면 더 강하게 완화
+
+
+def fuse_risks(risks: Sequence[float]) -> float:
+    """차원별 위험도 리스트를 통합 위험도로 결합
+
+    단순 평균이 아니라 평균 + 유기적 증폭.
+    """
+    if not risks:
+        return 0.0
+
+    base_risk = sum(risks) / len(risks)
+
+    # 여러 차원에서 동시에 위험한 경우 증폭
+    high_risk_count = sum(1 for risk in risks if risk > ORGANIC_HIGH_RISK)
+    if high_risk_count > 1:
+        organic_boost = 1.0 + (high_risk_count - 1) * ORGANIC_BOOST_STEP
+        base_risk = min(1.0, base_risk * organic_boost)
+
+    return base_risk
+
+
+def is_risk_bias(bias: Any) -> bool:
+    """위험도 행렬의 열이 되는 SearchBias인지 (get_risk 보유)"""
+    return bool(bias) and hasattr(bias, "get_risk")
+
+
+def _bias_entries(bias: Any, index: ConditionIndex):
+    """SearchBias의 risk_map 항목을 (행 번호, 위험도) 배열로 (조건은 index에 등록)"""
+    keys = list(getattr(bias, "risk_map", {}))
+    rows = np.fromiter((index.intern(c) for c in keys), dtype=np.int64, count=len(keys))
+    values = np.fromiter((bias.get_risk(c) for c in keys), dtype=np.float64, count=len(keys))
+    return rows, values
+
+
+def _scatter(rows: np.ndarray, values: np.ndarray, n_rows: int):
+    """(행 번호, 위험도) 배열을 길이 n_rows의 열과 포함 마스크로"""
+    column = np.zeros(n_rows, dtype=np.float64)
+    column[rows] = values
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[rows] = True
+    return column, mask
+
+
+def lookup_entries(entry_rows: np.ndarray, entry_values: np.ndarray, rows: np.ndarray):
+    """정렬된 (행 번호, 위험도) 항목에서 rows의 값 찾기
+
+    Returns:
+        (위험도 배열 (없으면 0.0), 포함 여부 배열)
+    """
+    if len(entry_rows) == 0:
+        return np.zeros(len(rows), dtype=np.float64), np.zeros(len(rows), dtype=bool)
+    positions = np.minimum(np.searchsorted(entry_rows, rows), len(entry_rows) - 1)
+    hit = entry_rows[positions] == rows
+    return np.where(hit, entry_values[positions], 0.0), hit
+
+
+def last_wins(rows: np.ndarray, values: np.ndarray):
+    """같은 행이 여러 번 나오면 마지막 값만 남긴다 (결과는 행 번호 순)"""
+    _, first_from_end = np.unique(rows[::-1], return_index=True)
+    last = len(rows) - 1 - first_from_end
+    return rows[last], values[last]
+
+
+def _boosted_mean(total: np.ndarray, high_count: np.ndarray, n_dims: int) -> np.ndarray:
+    """합계 / 차원 수 + 고위험 차원 수에 따른 유기적 증폭 (fuse_risks와 같은 순서)"""
+    fused = total / n_dims
+
+    # 여러 차원에서 동시에 위험 → 유기적 증폭
+    boosted = high_count > 1
+    if boosted.any():
+        organic_boost = 1.0 + (high_count[boosted] - 1) * ORGANIC_BOOST_STEP
+        fused[boosted] = np.minimum(1.0, fused[boosted] * organic_boost)
+
+    return fused
+
+
+class MatrixBias:
+    """위험도 행렬 열 하나를 SearchBias처럼 보여주는 읽기 전용 뷰
+
+    SearchBias 없이 만들어진 상태 공간(파일 적재, 레코드 스트림 구축)의
+    dimensions에 들어간다. get_risk와 risk_map 계약은 SearchBias와 같다.
+    뷰는 값을 들고 있지 않고 행렬을 직접 읽으므로, 새 버전은 rebind()로
+    자기 행렬에 묶인 뷰를 받는다.
+    """
+
+    def __init__(self, name: str, index, matrix: "RiskMatrix"):
+        self.name = name
+        self._index = index
+        self._matrix = matrix
+
+    def rebind(self, matrix: "RiskMatrix") -> "MatrixBias":
+        """같은 열을 matrix에서 읽는 뷰 (StateManifold._clone용)"""
+        return type(self)(self.name, self._index, matrix)
+
+    def get_risk(self, condition_signature: str) -> float:
+        """조건 서명의 위험도 (없으면 0.0)"""
+        condition_id = self._index.id_of(condition_signature)
+        if condition_id is None or condition_id >= self._matrix.n_rows:
+            return 0.0
+        return self._matrix.value(condition_id, self.name)
+
+    @property
+    def risk_map(self) -> Dict[str, float]:
+        """조건 서명 → 위험도 (접근할 때마다 열에서 만든다, O(열 항목 수))"""
+        rows, values = self._matrix.column_entries(self._matrix.dim_index[self.name])
+        return dict(zip(self._index.signatures(rows.tolist()), values.tolist()))
+
+
+class WritableMatrixBias(MatrixBias):
+    """set_risk를 가진 MatrixBias (maintain_life 요동 대상 차원용)
+
+    위험도는 StateManifold.set_risk가 행렬에 직접 쓰므로 set_risk는 아무것도
+    하지 않는다 (요동 대상 표시용).
+    """
+
+    def set_risk(self, condition_signature: str, risk: float) -> None:
+        pass
+
+
+class RiskMatrix:
+    """조건 × 차원 위험도 행렬
+
+    차원마다 길이 C(조건 수)의 float64 열 하나를 가진다.
+    열 하나는 SearchBias 하나에 해당하며, risk_map에 없는 조건은 0.0
+    (SearchBias.get_risk 계약과 동일). 행 번호는 ConditionIndex의 조건 ID.
+
+    채움 비율이 낮은 경우에는 SparseRiskMatrix(항목만 저장)를 쓴다.
+    두 저장 방식은 같은 메서드를 제공하며, 열 저장소에 직접 접근하지 않는
+    호출자(gather, column_entries 등)는 방식을 구분할 필요가 없다.
+
+    Attributes:
+        dimensions: 차원 이름 (열 순서 = StateManifold.dimensions 순서)
+        columns: 차원별 위험도 열
+        present: 차원별 risk_map 포함 여부 열
+    """
+
+    layout = "dense"
+
+    def __init__(
+        self,
+        dimensions: List[str],
+        columns: List[np.ndarray],
+        present: List[np.ndarray],
+        owned: Optional[List[bool]] = None,
+    ):
+        self.dimensions = dimensions
+        self.dim_index: Dict[str, int] = {d: j for j, d in enumerate(dimensions)}
+        self.columns = columns
+        self.present = present
+        # 열별 소유 여부 (False면 다른 사본과 공유 중 → 쓰기 전에 복사)
+        self._owned = owned if owned is not None else [True] * len(columns)
+
+    @classmethod
+    def from_biases(
+        cls,
+        biases: Dict[str, Any],
+        index: ConditionIndex,
+        layout: str = "auto"
+    ) -> "RiskMatrix":
+        """차원별 SearchBias를 행렬로 컴파일
+
+        get_risk를 가진 차원만 열이 된다 (StateManifold.get_risk와 동일한 기준, is_risk_bias).
+        risk_map의 조건 서명은 index에 등록되며, 행 번호는 그 ID.
+
+        Args:
+            biases: 차원별 SearchBias
+            index: 조건 색인
+            layout: "dense" / "sparse" / "auto" (채움 비율로 선택)
+        """
+        dimensions = [
+            name for name, bias in biases.items()
+            if is_risk_bias(bias)
+        ]
+
+        entries = [_bias_entries(biases[name], index) for name in dimensions]
+        return RiskMatrix.from_entries(dimensions, entries, len(index), layout)
+
+    @staticmethod
+    def from_entries(
+        dimensions: List[str],
+        entries: List[Any],
+        n_rows: int,
+        layout: str = "auto"
+    ) -> "RiskMatrix":
+        """차원별 (행 번호, 위험도) 항목으로 행렬 만들기
+
+        Args:
+            dimensions: 차원 이름들
+            entries: 차원별 (행 번호 배열, 위험도 배열) — 차원 안에서 행은 유일
+            n_rows: 행 수 (조건 수)
+            layout: "dense" / "sparse" / "auto" (채움 비율 < SPARSE_FILL_RATIO면 희소)
+        """
+        if layout not in MATRIX_LAYOUTS:
+            raise ValueError(f"알 수 없는 저장 방식: {layout} (가능: {MATRIX_LAYOUTS})")
+        if layout == "auto":
+            n_entries = sum(len(rows) for rows, _ in entries)
+            n_cells = n_rows * len(dimensions)
+            layout = "sparse" if n_cells and n_entries < SPARSE_FILL_RATIO * n_cells else "dense"
+
+        if layout == "sparse":
+            sorted_rows = []
+            sorted_values = []
+            for rows, values in entries:
+                order = np.argsort(rows, kind="stable")
+                sorted_rows.append(rows[order])
+                sorted_values.append(values[order])
+            return SparseRiskMatrix(list(dimensions), sorted_rows, sorted_values, n_rows)
+
+        columns = []
+        present = []
+        for rows, values in entries:
+            column, mask = _scatter(rows, values, n_rows)
+            columns.append(column)
+            present.append(mask)
+        return RiskMatrix(list(dimensions), columns, present)
+
+    def copy(self) -> "RiskMatrix":
+        """쓰기 시 복사(copy-on-write) 사본
+
+        열 배열은 원본과 공유하고, 어느 쪽이든 처음 쓰는 열만 그때 복사한다.
+        """
+        for j in range(self.n_dims):
+            self._owned[j] = False
+        return RiskMatrix(
+            list(self.dimensions),
+            list(self.columns),
+            list(self.present),
+            owned=[False] * self.n_dims,
+        )
+
+    def _own(self, j: int) -> None:
+        """열 j를 쓰기 전에 공유 중이면 복사"""
+        if not self._owned[j]:
+            self.columns[j] = self.columns[j].copy()
+            self.present[j] = self.present[j].copy()
+            self._owned[j] = True
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    @property
+    def n_dims(self) -> int:
+        return len(self.dimensions)
+
+    @property
+    def n_entries(self) -> int:
+        """저장된 항목 수 (risk_map 항목 수의 합)"""
+        return int(sum(np.count_nonzero(mask) for mask in self.present))
+
+    def gather(self, j: int, rows: np.ndarray) -> np.ndarray:
+        """열 j의 rows 위험도"""
+        return self.columns[j][rows]
+
+    def gather_present(self, j: int, rows: np.ndarray) -> np.ndarray:
+        """열 j의 rows 포함 여부"""
+        return self.present[j][rows]
+
+    def column_entries(self, j: int):
+        """열 j의 저장 항목 (행 번호 오름차순 배열, 위험도 배열)"""
+        rows = np.flatnonzero(self.present[j])
+        return rows, self.columns[j][rows]
+
+    def dense_column(self, j: int):
+        """열 j 전체 (위험도 배열, 포함 여부 배열)"""
+        return self.columns[j], self.present[j]
+
+    def row_risks(self, row: int) -> List[float]:
+        """한 행의 차원별 위험도 (열 순서)"""
+        return [float(column[row]) for column in self.columns]
+
+    def value(self, row: int, dimension: str) -> float:
+        """특정 셀의 위험도"""
+        j = self.dim_index.get(dimension)
+        if j is None or row >= self.n_rows:
+            return 0.0
+        return float(self.columns[j][row])
+
+    def set_value(self, row: int, dimension: str, risk: float) -> None:
+        """특정 셀의 위험도 갱신 (행이 모자라면 늘린다)"""
+        if row >= self.n_rows:
+            self.grow(row + 1)
+        j = self.dim_index[dimension]
+        self._own(j)
+        self.columns[j][row] = risk
+        self.present[j][row] = True
+
+    def set_values(self, rows: np.ndarray, dimension: str, risks: np.ndarray) -> None:
+        """한 열의 여러 셀을 한 번에 갱신 (행이 모자라면 늘린다)"""
+        if len(rows) and rows.max() >= self.n_rows:
+            self.grow(int(rows.max()) + 1)
+        j = self.dim_index[dimension]
+        self._own(j)
+        self.columns[j][rows] = risks
+        self.present[j][rows] = True
+
+    def set_column(self, dimension: str, bias: Any, index: ConditionIndex) -> int:
+        """SearchBias 하나로 열을 교체 (없는 차원이면 마지막 열로 추가)
+
+        새 조건은 index에 등록되고 행렬도 그만큼 늘어난다.
+
+        Returns:
+            열 번호
+        """
+        rows, values = _bias_entries(bias, index)
+        self.grow(len(index))
+        column, mask = _scatter(rows, values, max(self.n_rows, len(index)))
+
+        j = self.dim_index.get(dimension)
+        if j is None:
+            j = len(self.dimensions)
+            self.dimensions.append(dimension)
+            self.dim_index[dimension] = j
+            self.columns.append(column)
+            self.present.append(mask)
+            self._owned.append(True)
+        else:
+            self.columns[j] = column
+            self.present[j] = mask
+            self._owned[j] = True
+        return j
+
+    def remove_column(self, dimension: str) -> int:
+        """열 하나를 제거 (뒤 열들의 번호가 하나씩 당겨진다)
+
+        Returns:
+            제거된 열의 번호
+        """
+        j = self.dim_index[dimension]
+        del self.dimensions[j]
+        del self.columns[j]
+        del self.present[j]
+        del self._owned[j]
+        self.dim_index = {d: k for k, d in enumerate(self.dimensions)}
+        return j
+
+    def grow(self, n_rows: int) -> None:
+        """행 수를 n_rows로 늘린다 (새 행은 모든 차원 0.0)"""
+        extra = n_rows - self.n_rows
+        if extra <= 0:
+            return
+        self.columns = [np.concatenate([c, np.zeros(extra)]) for c in self.columns]
+        self.present = [np.concatenate([m, np.zeros(extra, dtype=bool)]) for m in self.present]
+        self._owned = [True] * len(self.columns)
+
+    def fused_risk(self, rows: Optional[Iterable[int]] = None) -> np.ndarray:
+        """통합 위험도 벡터 (한 번의 벡터화 패스)
+
+        fuse_risks()와 비트 단위로 같은 결과를 낸다:
+        열 순서대로 순차 합산 → 평균 → 고위험 차원 수에 따른 증폭.
+
+        Args:
+            rows: 계산할 행 번호 = 조건 ID (None이면 전체)
+
+        Returns:
+            행별 통합 위험도
+        """
+        if rows is None:
+            selected = list(self.columns)
+            n = self.n_rows
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            selected = [self.gather(j, rows) for j in range(self.n_dims)]
+            n = len(rows)
+
+        if not selected:
+            return np.zeros(n, dtype=np.float64)
+
+        total = np.zeros(n, dtype=np.float64)
+        high_count = np.zeros(n, dtype=np.int64)
+        for values in selected:
+            total += values
+            high_count += values > ORGANIC_HIGH_RISK
+
+        return _boosted_mean(total, high_count, len(selected))
+
+    def collapse_scores(
+        self,
+        rows: Optional[Iterable[int]] = None
+    ):
+        """붕괴 영역 판정 (배치)
+
+        차원별 위험도 > 0.5인 셀만 모아 평균(마스크 평균)을 내고,
+        그런 차원이 여러 개면 증폭한 뒤 유기적 위험도 > 0.7인 행만 남긴다.
+        StateManifoldEngine의 원래 조건별 루프와 비트 단위로 같은 결과.
+
+        Args:
+            rows: 판정할 행 번호 = 조건 ID (None이면 전체)
+
+        Returns:
+            (붕괴 영역 조건 ID 배열, 유기적 위험도 배열, 차원 마스크 (영역 수 × 차원 수))
+        """
+        if rows is None:
+            rows = np.arange(self.n_rows, dtype=np.int64)
+            selected = list(self.columns)
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            selected = [self.gather(j, rows) for j in range(self.n_dims)]
+        n = len(rows)
+
+        total = np.zeros(n, dtype=np.float64)
+        high_count = np.zeros(n, dtype=np.int64)
+        masks = []
+        for values in selected:
+            mask = values > COLLAPSE_DIM_RISK
+            total += np.where(mask, values, 0.0)
+            high_count += mask
+            masks.append(mask)
+
+        # 위험한 차원이 하나도 없는 행은 제외
+        has_risk = high_count > 0
+        organic = np.zeros(n, dtype=np.float64)
+        organic[has_risk] = total[has_risk] / high_count[has_risk]
+
+        # 여러 차원에서 동시에 위험한 경우 증폭
+        boosted = high_count > 1
+        if boosted.any():
+            organic_boost = 1.0 + (high_count[boosted] - 1) * ORGANIC_BOOST_STEP
+            organic[boosted] = np.minimum(1.0, organic[boosted] * organic_boost)
+
+        # 붕괴 영역으로 식별 (유기적 위험도가 높은 경우)
+        is_zone = has_risk & (organic > COLLAPSE_ZONE_RISK)
+        if masks:
+            dim_mask = np.column_stack(masks)[is_zone]
+        else:
+            dim_mask = np.zeros((0, 0), dtype=bool)
+        return rows[is_zone], organic[is_zone], dim_mask
+
+    def pair_counts(self):
+        """차원 쌍별 공통 조건 수 / 동시 고위험 조건 수 (행렬 곱 한 번씩)
+
+        공통 조건 수 = Pᵀ·P (P: risk_map 포함 마스크),
+        동시 고위험 수 = Hᵀ·H (H: 포함 & 위험도 > 0.7 마스크).
+
+        Returns:
+            (공통 조건 수 D×D, 동시 고위험 조건 수 D×D) 정수 배열
+        """
+        if not self.n_dims:
+            empty = np.zeros((0, 0), dtype=np.int64)
+            return empty, empty.copy()
+
+        presence = np.column_stack(self.present).astype(np.float64)
+        high = np.column_stack([
+            mask & (column > ORGANIC_HIGH_RISK)
+            for column, mask in zip(self.columns, self.present)
+        ]).astype(np.float64)
+
+        common_counts = np.rint(presence.T @ presence).astype(np.int64)
+        high_counts = np.rint(high.T @ high).astype(np.int64)
+        return common_counts, high_counts
+
+    def pair_counts_for(self, j: int):
+        """열 j와 모든 열 사이의 공통 조건 수 / 동시 고위험 조건 수
+
+        열 j에 포함된 행만 훑으므로 비용은 그 열의 항목 수 × 차원 수.
+
+        Returns:
+            (공통 조건 수 길이 D, 동시 고위험 조건 수 길이 D) 정수 배열
+        """
+        rows = np.flatnonzero(self.present[j])
+        high_rows = rows[self.columns[j][rows] > ORGANIC_HIGH_RISK]
+        common_counts = np.array(
+            [np.count_nonzero(mask[rows]) for mask in self.present], dtype=np.int64
+        )
+        high_counts = np.array([
+            np.count_nonzero(mask[high_rows] & (column[high_rows] > ORGANIC_HIGH_RISK))
+            for column, mask in zip(self.columns, self.present)
+        ], dtype=np.int64)
+        return common_counts, high_counts
+
+    def row_coverage(self) -> np.ndarray:
+        """행별로 항목이 있는 열 수 (0 = 어느 차원의 risk_map에도 없는 행)"""
+        coverage = np.zeros(self.n_rows, dtype=np.int64)
+        for j in range(self.n_dims):
+            coverage[self.column_entries(j)[0]] += 1
+        return coverage
+
+    def row_flags(self, rows: np.ndarray):
+        """행 묶음의 포함 / 고위험 여부 (행 수 × 차원 수)"""
+        presence = np.column_stack([self.gather_present(j, rows) for j in range(self.n_dims)])
+        high = np.column_stack([
+            presence[:, j] & (self.gather(j, rows) > ORGANIC_HIGH_RISK)
+            for j in range(self.n_dims)
+        ])
+        return presence, high
+
+    def fluctuate(
+        self,
+        fluctuation_scale: float,
+        iterations: int,
+        dims: List[int]
+    ) -> Dict[int, np.ndarray]:
+        """미세 요동 k회를 한 번의 배열 패스로 적용
+
+        매 반복마다 원래의 조건별 루프와 같은 규칙을 모든 행에 동시에 적용한다:
+        - 위험도 < 0.2인 셀은 건드리지 않음
+        - 위험도 > 0.8인 차원이 한 행에 둘 이상이면 그 셀들은 1.5배 완화
+        - new = max(0.0, risk - attenuation * risk)
+        반복마다 임계값 판정을 다시 하므로 임계값을 넘나드는 경우도 루프와
+        비트 단위로 같다. 한 번 0.2 아래로 내려간 행은 다시 바뀌지 않으므로
+        반복에서 제외한다.
+
+        Args:
+            fluctuation_scale: 기본 완화 계수
+            iterations: 반복 횟수
+            dims: 요동을 적용할 열 번호들
+
+        Returns:
+            열 번호 → 값이 바뀐 행 번호 배열 (열은 제자리에서 갱신됨)
+        """
+        if not dims or iterations <= 0 or self.n_rows == 0:
+            return {}
+
+        block = np.column_stack([self.columns[j] for j in dims])
+        result = block.copy()
+        boosted_scale = fluctuation_scale * 1.5
+
+        # 완화 대상이 하나라도 있는 행만 반복
+        active = np.flatnonzero((block >= FLUCTUATION_MIN_RISK).any(axis=1))
+        values = block[active]
+
+        for _ in range(iterations):
+            if len(active) == 0:
+                break
+            touched = values >= FLUCTUATION_MIN_RISK
+
+            # 여러 차원에서 동시에 높은 위험 → 더 강하게 완화
+            high = values > FLUCTUATION_HIGH_RISK
+            multi_high = high & (high.sum(axis=1) > 1)[:, None]
+            attenuation = np.where(multi_high, boosted_scale, fluctuation_scale)
+
+            attenuated = np.maximum(0.0, values - attenuation * values)
+            values = np.where(touched, attenuated, values)
+
+            # 더 이상 바뀌지 않을 행은 결과에 기록하고 제외
+            alive = (values >= FLUCTUATION_MIN_RISK).any(axis=1)
+            if not alive.all():
+                result[active[~alive]] = values[~alive]
+                active = active[alive]
+                values = values[alive]
+
+        result[active] = values
+
+        changed: Dict[int, np.ndarray] = {}
+        for k, j in enumerate(dims):
+            rows = np.flatnonzero(result[:, k] != block[:, k])
+            if len(rows):
+                self._own(j)
+                self.columns[j][rows] = result[rows, k]
+                self.present[j][rows] = True
+                changed[j] = rows
+        return changed
+
+
+class SparseRiskMatrix(RiskMatrix):
+    """희소 위험도 행렬 (열별 CSC 항목)
+
+    차원마다 risk_map 항목만 (행 번호 오름차순 배열, 위험도 배열)로 저장하고
+    나머지는 0.0으로 본다. 메모리는 조건 수 × 차원 수가 아니라 항목 수에 비례하며,
+    통합 위험도·붕괴 영역·유기적 연결·요동 계산도 항목 위에서만 돈다.
+    결과는 RiskMatrix와 비트 단위로 같다 (0.0을 더하는 것은 값을 바꾸지 않음).
+
+    항목 배열은 제자리에서 고치지 않고 항상 새 배열로 바꾸므로
+    사본끼리 배열을 그대로 공유해도 된다 (쓰기 시 복사).
+
+    Attributes:
+        dimensions: 차원 이름
+        entry_rows: 차원별 항목 행 번호 (오름차순, 유일)
+        entry_values: 차원별 항목 위험도
+    """
+
+    layout = "sparse"
+
+    def __init__(
+        self,
+        dimensions: List[str],
+        entry_rows: List[np.ndarray],
+        entry_values: List[np.ndarray],
+        n_rows: int,
+    ):
+        self.dimensions = dimensions
+        self.dim_index: Dict[str, int] = {d: j for j, d in enumerate(dimensions)}
+        self.entry_rows = entry_rows
+        self.entry_values = entry_values
+        self._n_rows = n_rows
+
+    def copy(self) -> "SparseRiskMatrix":
+        return SparseRiskMatrix(
+            list(self.dimensions), list(self.entry_rows), list(self.entry_values), self._n_rows
+        )
+
+    @property
+    def n_rows(self) -> int:
+        return self._n_rows
+
+    @property
+    def n_entries(self) -> int:
+        return int(sum(len(rows) for rows in self.entry_rows))
+
+    def gather(self, j: int, rows: np.ndarray) -> np.ndarray:
+        return lookup_entries(self.entry_rows[j], self.entry_values[j], rows)[0]
+
+    def gather_present(self, j: int, rows: np.ndarray) -> np.ndarray:
+        return lookup_entries(self.entry_rows[j], self.entry_values[j], rows)[1]
+
+    def column_entries(self, j: int):
+        return self.entry_rows[j], self.entry_values[j]
+
+    def dense_column(self, j: int):
+        return _scatter(self.entry_rows[j], self.entry_values[j], self._n_rows)
+
+    def row_risks(self, row: int) -> List[float]:
+        rows = np.array([row], dtype=np.int64)
+        return [float(self.gather(j, rows)[0]) for j in range(self.n_dims)]
+
+    def value(self, row: int, dimension: str) -> float:
+        j = self.dim_index.get(dimension)
+        if j is None or row >= self._n_rows:
+            return 0.0
+        return float(self.gather(j, np.array([row], dtype=np.int64))[0])
+
+    def set_value(self, row: int, dimension: str, risk: float) -> None:
+        self.set_values(np.array([row], dtype=np.int64), dimension, np.array([risk], dtype=np.float64))
+
+    def set_values(self, rows: np.ndarray, dimension: str, risks: np.ndarray) -> None:
+        rows = np.asarray(rows, dtype=np.int64)
+        risks = np.asarray(risks, dtype=np.float64)
+        if len(rows) and rows.max() >= self._n_rows:
+            self.grow(int(rows.max()) + 1)
+        rows, risks = last_wins(rows, risks)
+        j = self.dim_index[dimension]
+        entry_rows, entry_values = self.entry_rows[j], self.entry_values[j]
+
+        # 이미 있는 항목은 값만 바꾸고, 새 항목은 병합 후 다시 정렬
+        _, hit = lookup_entries(entry_rows, entry_values, rows)
+        entry_values = entry_values.copy()
+        entry_values[np.searchsorted(entry_rows, rows[hit])] = risks[hit]
+        if not hit.all():
+            entry_rows = np.concatenate([entry_rows, rows[~hit]])
+            entry_values = np.concatenate([entry_values, risks[~hit]])
+            order = np.argsort(entry_rows, kind="stable")
+            entry_rows, entry_values = entry_rows[order], entry_values[order]
+        self.entry_rows[j], self.entry_values[j] = entry_rows, entry_values
+
+    def set_column(self, dimension: str, bias: Any, index: ConditionIndex) -> int:
+        rows, values = _bias_entries(bias, index)
+        self.grow(len(index))
+        order = np.argsort(rows, kind="stable")
+        rows, values = rows[order], values[order]
+
+        j = self.dim_index.get(dimension)
+        if j is None:
+            j = len(self.dimensions)
+            self.dimensions.append(dimension)
+            self.dim_index[dimension] = j
+            self.entry_rows.append(rows)
+            self.entry_values.append(values)
+        else:
+            self.entry_rows[j] = rows
+            self.entry_values[j] = values
+        return j
+
+    def remove_column(self, dimension: str) -> int:
+        j = self.dim_index[dimension]
+        del self.dimensions[j]
+        del self.entry_rows[j]
+        del self.entry_values[j]
+        self.dim_index = {d: k for k, d in enumerate(self.dimensions)}
+        return j
+
+    def grow(self, n_rows: int) -> None:
+        # 새 행은 항목이 없으므로 행 수만 늘린다
+        self._n_rows = max(self._n_rows, n_rows)
+
+    def fused_risk(self, rows: Optional[Iterable[int]] = None) -> np.ndarray:
+        if rows is not None:
+            return super().fused_risk(rows)
+
+        n = self._n_rows
+        if not self.n_dims:
+            return np.zeros(n, dtype=np.float64)
+
+        # 열 순서대로 항목만 더한다 (행은 열 안에서 유일)
+        total = np.zeros(n, dtype=np.float64)
+        high_count = np.zeros(n, dtype=np.int64)
+        for entry_rows, entry_values in zip(self.entry_rows, self.entry_values):
+            total[entry_rows] += entry_values
+            high_count[entry_rows] += entry_values > ORGANIC_HIGH_RISK
+
+        return _boosted_mean(total, high_count, self.n_dims)
+
+    def collapse_scores(self, rows: Optional[Iterable[int]] = None):
+        if rows is None:
+            # 위험도 > 0.5인 항목이 하나라도 있는 행만 후보
+            candidates = [
+                entry_rows[entry_values > COLLAPSE_DIM_RISK]
+                for entry_rows, entry_values in zip(self.entry_rows, self.entry_values)
+            ]
+            rows = np.unique(np.concatenate(candidates)) if candidates else np.zeros(0, dtype=np.int64)
+        return super().collapse_scores(rows)
+
+    def _high_rows(self, j: int) -> np.ndarray:
+        return self.entry_rows[j][self.entry_values[j] > ORGANIC_HIGH_RISK]
+
+    def pair_counts(self):
+        n_dims = self.n_dims
+        common_counts = np.zeros((n_dims, n_dims), dtype=np.int64)
+        high_counts = np.zeros((n_dims, n_dims), dtype=np.int64)
+        for j in range(n_dims):
+            common_row, high_row = self.pair_counts_for(j)
+            common_counts[j] = common_row
+            high_counts[j] = high_row
+        return common_counts, high_counts
+
+    def pair_counts_for(self, j: int):
+        rows = self.entry_rows[j]
+        high_rows = self._high_rows(j)
+        common_counts = np.array([
+            len(np.intersect1d(rows, other, assume_unique=True)) for other in self.entry_rows
+        ], dtype=np.int64)
+        high_counts = np.array([
+            len(np.intersect1d(high_rows, self._high_rows(k), assume_unique=True))
+            for k in range(self.n_dims)
+        ], dtype=np.int64)
+        return common_counts, high_counts
+
+    def fluctuate(
+        self,
+        fluctuation_scale: float,
+        iterations: int,
+        dims: List[int]
+    ) -> Dict[int, np.ndarray]:
+        """미세 요동 (RiskMatrix.fluctuate와 같은 규칙, 항목 위에서만)
+
+        0.2 미만 항목은 바뀌지도 않고 고위험 판정에도 들지 않으므로,
+        0.2 이상인 항목만 (행, 열, 값) 목록으로 모아 반복한다.
+
+        Returns:
+            열 번호 → 값이 바뀐 행 번호 배열 (열 항목 배열은 새 배열로 교체됨)
+        """
+        if not dims or iterations <= 0:
+            return {}
+
+        positions = [np.flatnonzero(self.entry_values[j] >= FLUCTUATION_MIN_RISK) for j in dims]
+        values = np.concatenate([self.entry_values[j][p] for j, p in zip(dims, positions)])
+        if not len(values):
+            return {}
+        entry_rows = np.concatenate([self.entry_rows[j][p] for j, p in zip(dims, positions)])
+        _, row_codes = np.unique(entry_rows, return_inverse=True)
+        n_codes = int(row_codes.max()) + 1
+        boosted_scale = fluctuation_scale * 1.5
+        original = values
+
+        for _ in range(iterations):
+            touched = values >= FLUCTUATION_MIN_RISK
+            if not touched.any():
+                break
+
+            # 여러 차원에서 동시에 높은 위험 → 더 강하게 완화
+            high = values > FLUCTUATION_HIGH_RISK
+            high_count = np.bincount(row_codes[high], minlength=n_codes)
+            multi_high = high & (high_count[row_codes] > 1)
+            attenuation = np.where(multi_high, boosted_scale, fluctuation_scale)
+
+            attenuated = np.maximum(0.0, values - attenuation * values)
+            values = np.where(touched, attenuated, values)
+
+        changed: Dict[int, np.ndarray] = {}
+        start = 0
+        for j, p in zip(dims, positions):
+            end = start + len(p)
+            moved = values[start:end] != original[start:end]
+            if moved.any():
+                column_values = self.entry_values[j].copy()
+                column_values[p[moved]] = values[start:end][moved]
+                self.entry_values[j] = column_values
+                changed[j] = self.entry_rows[j][p[moved]]
+            start = end
+        return changed
@@ -0,0 +1,359 @@
+"""
+StateManifoldEngine - 이웃 구조와 흐름 경로 탐색
+
+조건 ID 위의 명시적 인접 구조(NeighborhoodGraph)와
+통합 위험도를 간선 비용으로 쓰는 Dijkstra / A* 경로 탐색.
+
+인접 구조는 두 가지 방법으로 만든다:
+- 사용자 이웃 함수: 조건 서명 → 이웃 조건 서명들
+- 조건 서명 격자: "mass_1.0_dist_1.0_mismatch_0.1"의 숫자 필드를 좌표로 해석해
+  한 축에서만 인접한 값(정렬 순위 ±1)을 가진 조건끼리 연결
+"""
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .condition_index import ConditionIndex
+
+
+def parse_signature(signature: str) -> Optional[Tuple[Tuple[str, ...], Tuple[float, ...]]]:
+    """조건 서명을 (필드 이름들, 숫자 값들)로 해석
+
+    예: "mass_1.0_dist_1.0_mismatch_0.1" → (("mass", "dist", "mismatch"), (1.0, 1.0, 0.1))
+
+    Returns:
+        해석 결과 (숫자 필드가 없거나 값 없는 이름이 남으면 None)
+    """
+    keys: List[str] = []
+    values: List[float] = []
+    name_parts: List[str] = []
+    for token in signature.split("_"):
+        try:
+            value = float(token)
+        except ValueError:
+            name_parts.append(token)
+            continue
+        keys.append("_".join(name_parts))
+        values.append(value)
+        name_parts = []
+
+    if not values or name_parts:
+        return None
+    return tuple(keys), tuple(values)
+
+
+class NeighborhoodGraph:
+    """조건 ID 인접 구조 (CSR)
+
+    Attributes:
+        indptr: 노드별 이웃 구간 시작 위치 (길이 N+1)
+        indices: 이웃 조건 ID
+        schema: 노드별 격자 스키마 번호 (격자가 아니면 None, 해석 불가 노드는 -1)
+        coordinates: 노드별 격자 좌표 (축별 정렬 순위, 격자가 아니면 None)
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        schema: Optional[np.ndarray] = None,
+        coordinates: Optional[np.ndarray] = None,
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.schema = schema
+        self.coordinates = coordinates
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def from_edges(
+        cls,
+        n_nodes: int,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        **grid
+    ) -> "NeighborhoodGraph":
+        """간선 목록(출발 → 도착)으로 CSR 구성 (중복 간선 제거)"""
+        if len(sources):
+            # (출발, 도착)을 정수 키 하나로 묶어 정렬 + 중복 제거
+            keys = np.unique(np.asarray(sources, dtype=np.int64) * n_nodes + targets)
+            sources, targets = keys // n_nodes, keys % n_nodes
+        counts = np.bincount(sources, minlength=n_nodes)
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(indptr, np.asarray(targets, dtype=np.int64), **grid)
+
+    @classmethod
+    def from_neighbor_fn(
+        cls,
+        index: ConditionIndex,
+        neighbor_fn: Callable[[str], Iterable[str]],
+    ) -> "NeighborhoodGraph":
+        """사용자 이웃 함수로 인접 구조 구성
+
+        색인에 없는 이웃 서명은 무시한다.
+
+        Args:
+            index: 조건 서명 ↔ ID 색인
+            neighbor_fn: 조건 서명 → 이웃 조건 서명들
+        """
+        sources: List[int] = []
+        targets: List[int] = []
+        for condition_id, signature in enumerate(index):
+            for neighbor in neighbor_fn(signature):
+                neighbor_id = index.id_of(neighbor)
+                if neighbor_id is not None and neighbor_id != condition_id:
+                    sources.append(condition_id)
+                    targets.append(neighbor_id)
+        return cls.from_edges(
+            len(index),
+            np.asarray(sources, dtype=np.int64),
+            np.asarray(targets, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_signature_grid(cls, index: ConditionIndex) -> "NeighborhoodGraph":
+        """조건 서명의 숫자 필드를 격자로 해석해 인접 구조 구성
+
+        필드 이름 구성(스키마)이 같은 조건끼리만 연결하며,
+        한 축의 값만 정렬 순위 1 차이로 다르고 나머지 축이 모두 같으면 이웃.
+        해석할 수 없는 서명은 고립 노드가 된다.
+        """
+        n_nodes = len(index)
+        groups: Dict[Tuple[str, ...], List[Tuple[int, Tuple[float, ...]]]] = {}
+        for condition_id, signature in enumerate(index):
+            parsed = parse_signature(signature)
+            if parsed is not None:
+                groups.setdefault(parsed[0], []).append((condition_id, parsed[1]))
+
+        n_axes = max((len(keys) for keys in groups), default=0)
+        schema = np.full(n_nodes, -1, dtype=np.int64)
+        coordinates = np.zeros((n_nodes, n_axes), dtype=np.int64)
+        sources: List[np.ndarray] = []
+        targets: List[np.ndarray] = []
+
+        for schema_id, members in enumerate(groups.values()):
+            ids = np.array([condition_id for condition_id, _ in members], dtype=np.int64)
+            values = np.array([v for _, v in members], dtype=np.float64)
+
+            # 축별 정렬 순위를 좌표로 사용
+            ranks = np.empty(values.shape, dtype=np.int64)
+            for axis in range(values.shape[1]):
+                ranks[:, axis] = np.unique(values[:, axis], return_inverse=True)[1].ravel()
+            schema[ids] = schema_id
+            coordinates[ids, :ranks.shape[1]] = ranks
+
+            for axis in range(ranks.shape[1]):
+                # 다른 축 좌표 → 이 축 좌표 순으로 정렬하면 이웃은 바로 옆에 놓인다
+                others = [ranks[:, a] for a in range(ranks.shape[1]) if a != axis]
+                order = np.lexsort([ranks[:, axis]] + others[::-1])
+                sorted_ranks = ranks[order]
+                same_line = np.all(
+                    np.delete(sorted_ranks[1:] == sorted_ranks[:-1], axis, axis=1), axis=1
+                )
+                adjacent = same_line & (sorted_ranks[1:, axis] - sorted_ranks[:-1, axis] == 1)
+                lower = ids[order[:-1][adjacent]]
+                upper = ids[order[1:][adjacent]]
+                sources += [lower, upper]
+                targets += [upper, lower]
+
+        if sources:
+            all_sources = np.concatenate(sources)
+            all_targets = np.concatenate(targets)
+        else:
+            all_sources = all_targets = np.zeros(0, dtype=np.int64)
+        return cls.from_edges(
+            n_nodes, all_sources, all_targets, schema=schema, coordinates=coordinates
+        )
+
+    def neighbors(self, condition_id: int) -> np.ndarray:
+        """이웃 조건 ID 배열"""
+        if condition_id >= self.n_nodes:
+            return self.indices[:0]
+        return self.indices[self.indptr[condition_id]:self.indptr[condition_id + 1]]
+
+    def grid_distance(self, condition_id: int, goal_id: int) -> int:
+        """격자 맨해튼 거리 (간선 수의 하한, 격자가 아니면 0)"""
+        if self.schema is None or condition_id >= self.n_nodes or goal_id >= self.n_nodes:
+            return 0
+        if self.schema[condition_id] < 0 or self.schema[condition_id] != self.schema[goal_id]:
+            return 0
+        return int(np.abs(self.coordinates[condition_id] - self.coordinates[goal_id]).sum())
+
+
+def build_neighborhood(
+    index: ConditionIndex,
+    neighbors,
+) -> NeighborhoodGraph:
+    """이웃 지정값으로 인접 구조 구성
+
+    Args:
+        index: 조건 서명 ↔ ID 색인
+        neighbors: "grid" (조건 서명 격자) 또는 이웃 함수 (조건 서명 → 이웃 서명들)
+    """
+    if isinstance(neighbors, NeighborhoodGraph):
+        return neighbors
+    if neighbors == "grid":
+        return NeighborhoodGraph.from_signature_grid(index)
+    if callable(neighbors):
+        return NeighborhoodGraph.from_neighbor_fn(index, neighbors)
+    raise ValueError(f"알 수 없는 이웃 지정: {neighbors!r} ('grid' 또는 이웃 함수)")
+
+
+def min_step_cost(risks: np.ndarray, max_risk: float = 0.8) -> float:
+    """통과 가능한 조건의 최소 통합 위험도 (A* 휴리스틱의 한 걸음 비용 하한, 없으면 0.0)"""
+    passable = risks[risks <= max_risk]
+    return float(passable.min()) if len(passable) else 0.0
+
+
+def route(
+    graph: NeighborhoodGraph,
+    risks: np.ndarray,
+    start_id: int,
+    goal_id: int,
+    max_risk: float = 0.8,
+    max_cost: Optional[float] = None,
+    use_heuristic: bool = False,
+    step_cost: Optional[float] = None,
+) -> Optional[List[int]]:
+    """Dijkstra / A* 흐름 경로 탐색
+
+    간선 u → v의 비용은 도착 조건 v의 통합 위험도.
+    통합 위험도가 max_risk를 넘는 조건은 통과할 수 없다 (그리디 탐색의 0.8 중단 규칙).
+    A*는 격자 거리 × 통과 가능한 최소 위험도를 휴리스틱으로 쓰며,
+    이는 실제 비용의 하한이므로 Dijkstra와 같은 최적 비용을 보장한다.
+
+    Args:
+        graph: 인접 구조
+        risks: 조건 ID별 통합 위험도
+        start_id: 시작 조건 ID
+        goal_id: 목표 조건 ID
+        max_risk: 통과 가능한 최대 통합 위험도
+        max_cost: 경로 비용 상한 (넘으면 탐색하지 않음)
+        use_heuristic: True면 A*, False면 Dijkstra
+        step_cost: 같은 risks·max_risk로 미리 구한 min_step_cost (None이면 여기서 계산)
+
+    Returns:
+        시작 이후 경로의 조건 ID 리스트 (시작 제외, 경로 없으면 None)
+    """
+    if start_id == goal_id:
+        return []
+    if goal_id >= len(risks) or risks[goal_id] > max_risk:
+        return None
+
+    if use_heuristic:
+        if step_cost is None:
+            step_cost = min_step_cost(risks, max_risk)
+        use_heuristic = step_cost > 0.0 and graph.schema is not None
+
+    def heuristic(condition_id: int) -> float:
+        if not use_heuristic:
+            return 0.0
+        return graph.grid_distance(condition_id, goal_id) * step_cost
+
+    parent = _search(graph, risks, start_id, {goal_id}, max_risk, max_cost, heuristic)
+    return _trace(parent, start_id, goal_id)
+
+
+def route_many(
+    graph: NeighborhoodGraph,
+    risks: np.ndarray,
+    start_id: int,
+    goal_ids: Iterable[int],
+    max_risk: float = 0.8,
+    max_cost: Optional[float] = None,
+) -> Dict[int, Optional[List[int]]]:
+    """한 시작점에서 여러 목표로의 Dijkstra 경로 (탐색 전선 공유)
+
+    모든 목표가 확정되거나 전선이 빌 때까지 한 번만 탐색한다.
+
+    Args:
+        graph: 인접 구조
+        risks: 조건 ID별 통합 위험도
+        start_id: 시작 조건 ID
+        goal_ids: 목표 조건 ID들
+        max_risk: 통과 가능한 최대 통합 위험도
+        max_cost: 경로 비용 상한
+
+    Returns:
+        목표 조건 ID → 시작 이후 경로 (경로 없으면 None)
+    """
+    goals = set(goal_ids)
+    reachable = {
+        goal_id for goal_id in goals
+        if goal_id != start_id and goal_id < len(risks) and risks[goal_id] <= max_risk
+    }
+    parent = _search(graph, risks, start_id, reachable, max_risk, max_cost, lambda _: 0.0)
+
+    paths: Dict[int, Optional[List[int]]] = {}
+    for goal_id in goals:
+        if goal_id == start_id:
+            paths[goal_id] = []
+        elif goal_id in reachable:
+            paths[goal_id] = _trace(parent, start_id, goal_id)
+        else:
+            paths[goal_id] = None
+    return paths
+
+
+def _search(
+    graph: NeighborhoodGraph,
+    risks: np.ndarray,
+    start_id: int,
+    targets: set,
+    max_risk: float,
+    max_cost: Optional[float],
+    heuristic: Callable[[int], float],
+) -> Dict[int, int]:
+    """최선 우선 탐색 (목표가 모두 확정되면 중단)
+
+    Returns:
+        확정된 조건 ID → 직전 조건 ID
+    """
+    best_cost: Dict[int, float] = {start_id: 0.0}
+    parent: Dict[int, int] = {}
+    settled = set()
+    remaining = set(targets)
+    frontier = [(heuristic(start_id), 0.0, start_id)]
+
+    while frontier and remaining:
+        _, cost, current = heapq.heappop(frontier)
+        if current in settled:
+            continue
+        settled.add(current)
+        remaining.discard(current)
+        if not remaining:
+            break
+
+        for neighbor in graph.neighbors(current).tolist():
+            if neighbor in settled:
+                continue
+            step_risk = float(risks[neighbor])
+            if step_risk > max_risk:
+                continue
+            new_cost = cost + step_risk
+            if max_cost is not None and new_cost > max_cost:
+                continue
+            if new_cost < best_cost.get(neighbor, float("inf")):
+                best_cost[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(frontier, (new_cost + heuristic(neighbor), new_cost, neighbor))
+
+    # 확정되지 않은 목표는 경로 없음
+    return {node: parent[node] for node in settled if node in parent}
+
+
+def _trace(parent: Dict[int, int], start_id: int, goal_id: int) -> Optional[List[int]]:
+    """직전 조건 사슬을 따라 시작 이후 경로 복원"""
+    if goal_id not in parent:
+        return None
+    path = [goal_id]
+    while parent[path[-1]] != start_id:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
@@ -14,8 +14,29 @@ Version: 0.2.0
 PHAM Signed: 2026-02-04
 """
 
-from typing import List, Optional, Dict, Any, Set
-from .models import StateManifold, FlowResult, CollapseZone
+from concurrent.futures import Executor
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from .condition_index import ConditionIndex
+from .models import StateManifold, FlowResult, CollapseZone, CollapseZoneTable
+from .flow_cache import NO_PATH, FlowCache
+from .ingest import DEFAULT_CHUNK_SIZE, build_risk_matrix
+from .risk_matrix import (
+    COLLAPSE_DIM_RISK,
+    RiskMatrix,
+    WritableMatrixBias,
+    is_risk_bias,
+    lookup_entries,
+)
+from .routing import build_neighborhood, route, route_many
+
+# 흐름 경로 탐색 모드
+FLOW_MODES = ("greedy", "dijkstra", "astar")
+
+# 그리디 탐색 최대 반복 횟수
+GREEDY_MAX_ITERATIONS = 100
 
 # UP 엔진들의 SearchBias 타입 (타입 힌트용)
 try:
@@ -41,18 +62,24 @@ class StateManifoldEngine:
     
     def __init__(
         self,
-        problem_engines: Optional[List[Any]] = None
+        problem_engines: Optional[List[Any]] = None,
+        flow_cache_size: int = 0
     ):
         """
         Args:
             problem_engines: UP 엔진 리스트 (선택적)
+            flow_cache_size: 흐름 결과 LRU 캐시 크기 (0이면 캐시 없음).
+                            키는 (시작, 목표, 모드, 비용 상한, 상태 공간 버전)
         """
         self.problem_engines = problem_engines or []
         self.manifold: Optional[StateManifold] = None
+        self.flow_cache: Optional[FlowCache] = FlowCache(flow_cache_size) if flow_cache_size else None
     
     def build_state_space(
         self,
-        biases: Dict[str, 'SearchBias']
+        biases: Dict[str, 'SearchBias'],
+        neighbors: Optional[Any] = None,
+        layout: str = "auto"
     ) -> StateManifold:
         """상태 공간 구축
         
@@ -61,6 +88,12 @@ class StateManifoldEngine:
         Args:
             biases: 차원별 SearchBias 딕셔너리
                    예: {"three_body": SearchBias, "navier_stokes": SearchBias}
+            neighbors: 조건 간 인접 구조 (선택, dijkstra/astar 흐름에 필요).
+                      "grid"면 조건 서명의 숫자 필드를 격자로 해석,
+                      함수면 조건 서명 → 이웃 조건 서명들.
+            layout: 위험도 행렬 저장 방식. "dense"는 (조건 × 차원) 열,
+                    "sparse"는 차원별 (행, 위험도) 항목 배열,
+                    "auto"는 채워진 칸 비율로 선택.
         
         Returns:
             통합된 상태 공간 (StateManifold)
@@ -68,26 +101,315 @@ class StateManifoldEngine:
         # 차원별 위험 지형 저장
         dimensions = biases.copy()
         
+        # 조건 서명에 정수 ID 부여 + 위험도 행렬 컴파일 (조건 × 차원)
+        condition_index = ConditionIndex()
+        risk_matrix = RiskMatrix.from_biases(dimensions, condition_index, layout)
+        
+        return self._assemble_manifold(dimensions, condition_index, risk_matrix, neighbors)
+    
+    def build_state_space_from_records(
+        self,
+        records: Iterable[Tuple[str, str, float]],
+        neighbors: Optional[Any] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        layout: str = "auto"
+    ) -> StateManifold:
+        """레코드 스트림으로 상태 공간 구축
+        
+        (차원, 조건 서명, 위험도) 레코드를 chunk_size개씩 읽어 차원별 항목
+        배열에 바로 모은다. 차원별 SearchBias를 만들지 않으므로 추가 메모리는
+        유일 항목 수와 조각 하나 크기로 제한된다. 파일은 ingest.read_records()로
+        스트림이 된다.
+        
+        같은 (차원, 조건)이 여러 번 나오면 마지막 레코드가 이긴다.
+        차원은 위험도 행렬 열의 WritableMatrixBias 뷰로 들어간다
+        (maintain_life 요동 대상).
+        
+        Args:
+            records: (차원, 조건 서명, 위험도) 레코드들
+            neighbors: 조건 간 인접 구조 (build_state_space와 같음)
+            chunk_size: 한 번에 처리할 레코드 수
+            layout: 위험도 행렬 저장 방식 (build_state_space와 같음)
+        
+        Returns:
+            통합된 상태 공간 (StateManifold)
+        """
+        condition_index = ConditionIndex()
+        risk_matrix = build_risk_matrix(records, condition_index, chunk_size, layout)
+        dimensions = {
+            name: WritableMatrixBias(name, condition_index, risk_matrix)
+            for name in risk_matrix.dimensions
+        }
+        return self._assemble_manifold(dimensions, condition_index, risk_matrix, neighbors)
+    
+    def _assemble_manifold(
+        self,
+        dimensions: Dict[str, Any],
+        condition_index: ConditionIndex,
+        risk_matrix: RiskMatrix,
+        neighbors: Optional[Any]
+    ) -> StateManifold:
+        """컴파일된 위험도 행렬로 연결·붕괴 영역·인접 구조를 계산해 게시"""
         # 유기적 연결 가중치 계산
-        organic_connections = self._calculate_organic_connections(biases)
+        pair_counts = risk_matrix.pair_counts()
+        organic_connections = self._calculate_organic_connections(risk_matrix, pair_counts)
         
         # 통합 붕괴 영역 식별
-        collapse_zones = self._identify_collapse_zones(biases)
+        collapse_zones = self._collapse_zone_table(risk_matrix, condition_index)
+        
+        # 조건 간 인접 구조 (선택)
+        neighborhood = None
+        if neighbors is not None:
+            neighborhood = build_neighborhood(condition_index, neighbors)
         
         self.manifold = StateManifold(
             dimensions=dimensions,
             organic_connections=organic_connections,
-            collapse_zones=collapse_zones
+            collapse_zones=collapse_zones,
+            condition_index=condition_index,
+            risk_matrix=risk_matrix,
+            neighborhood=neighborhood
         )
+        self.manifold._pair_counts = pair_counts
+        
+        # 새로 구축한 상태 공간: 이전 흐름 결과는 모두 버린다
+        if self.flow_cache is not None:
+            self.flow_cache.clear()
         
         return self.manifold
     
+    def update_dimension(
+        self,
+        name: str,
+        bias: 'SearchBias',
+        manifold: Optional[StateManifold] = None
+    ) -> StateManifold:
+        """차원 하나를 새 SearchBias로 교체 (없으면 추가)
+        
+        build_state_space()를 다시 부르지 않고 바뀐 차원만 반영한다:
+        - 유기적 연결: 이 차원이 포함된 D−1개 쌍만 다시 계산
+        - 붕괴 영역: 이 차원 위험도가 전후로 0.5를 넘는 조건만 다시 판정
+        - 통합 위험도 캐시: 차원 수가 같으면 값이 바뀐 조건만 무효화
+        
+        Args:
+            name: 차원 이름
+            bias: 새 SearchBias
+            manifold: 원본 StateManifold (None이면 내부 manifold, 결과를 게시)
+        
+        Returns:
+            갱신된 새 버전의 상태 공간 (원본은 그대로)
+        """
+        publish = manifold is None
+        manifold = self._resolve_manifold(manifold)._clone()
+        matrix = manifold.risk_matrix
+        manifold.dimensions[name] = bias
+        
+        if not is_risk_bias(bias):
+            # 열이 될 수 없는 차원 → 기존 열만 제거
+            if name in matrix.dim_index:
+                self._drop_column(manifold, name)
+            return self._publish(manifold, publish)
+        
+        j = matrix.dim_index.get(name)
+        old_entries = matrix.column_entries(j) if j is not None else None
+        j = matrix.set_column(name, bias, manifold.condition_index)
+        new_rows, new_values = matrix.column_entries(j)
+        if old_entries is not None:
+            manifold.adjust_coverage(old_entries[0], -1)
+        manifold.adjust_coverage(new_rows, 1)
+        
+        if old_entries is None:
+            # 새 차원: 모든 조건의 평균 분모가 바뀐다
+            manifold.invalidate_risks()
+            touched = new_rows[new_values > COLLAPSE_DIM_RISK]
+        else:
+            # 전후 어느 쪽에든 항목이 있는 행만 비교
+            rows = np.union1d(old_entries[0], new_rows)
+            old = lookup_entries(old_entries[0], old_entries[1], rows)[0]
+            new = matrix.gather(j, rows)
+            manifold.invalidate_risks(rows[old != new])
+            touched = rows[(old > COLLAPSE_DIM_RISK) | (new > COLLAPSE_DIM_RISK)]
+        
+        # 이 차원의 행/열만 다시 센다
+        common_row, high_row = matrix.pair_counts_for(j)
+        common_counts, high_counts = manifold.pair_counts(writable=True)
+        if len(common_counts) < matrix.n_dims:
+            common_counts = np.pad(common_counts, (0, 1))
+            high_counts = np.pad(high_counts, (0, 1))
+        common_counts[j, :] = common_counts[:, j] = common_row
+        high_counts[j, :] = high_counts[:, j] = high_row
+        manifold._pair_counts = (common_counts, high_counts)
+        
+        self._update_connections(manifold, j)
+        self._update_collapse_zones(manifold, touched)
+        return self._publish(manifold, publish)
+    
+    def remove_dimension(
+        self,
+        name: str,
+        manifold: Optional[StateManifold] = None
+    ) -> StateManifold:
+        """차원 하나를 제거
+        
+        이 차원이 포함된 연결 쌍을 지우고, 이 차원 위험도가 0.5를 넘던
+        조건의 붕괴 영역만 다시 판정한다.
+        
+        Args:
+            name: 차원 이름
+            manifold: 원본 StateManifold (None이면 내부 manifold, 결과를 게시)
+        
+        Returns:
+            갱신된 새 버전의 상태 공간 (원본은 그대로)
+        """
+        publish = manifold is None
+        manifold = self._resolve_manifold(manifold)
+        if name not in manifold.dimensions:
+            raise ValueError(f"알 수 없는 차원: {name}")
+        manifold = manifold._clone()
+        del manifold.dimensions[name]
+        if name in manifold.risk_matrix.dim_index:
+            self._drop_column(manifold, name)
+        return self._publish(manifold, publish)
+    
+    def apply_risk_deltas(
+        self,
+        dimension: str,
+        deltas: Dict[str, float],
+        manifold: Optional[StateManifold] = None
+    ) -> StateManifold:
+        """한 차원의 위험도 몇 개만 갱신
+        
+        위험도 행렬의 해당 열만 복사해 갱신하고 (SearchBias는 그대로),
+        연결 가중치의 셀 수는 바뀐 조건들에 대해서만 증감한다.
+        붕괴 영역은 바뀐 조건만 다시 판정한다.
+        
+        Args:
+            dimension: 차원 이름
+            deltas: 조건 서명 → 새 위험도
+            manifold: 원본 StateManifold (None이면 내부 manifold, 결과를 게시)
+        
+        Returns:
+            갱신된 새 버전의 상태 공간 (원본은 그대로)
+        """
+        publish = manifold is None
+        manifold = self._resolve_manifold(manifold)
+        if dimension not in manifold.risk_matrix.dim_index:
+            raise ValueError(f"알 수 없는 차원: {dimension}")
+        if not deltas:
+            return manifold
+        manifold = manifold._clone()
+        matrix = manifold.risk_matrix
+        
+        index = manifold.condition_index
+        common_counts, high_counts = manifold.pair_counts(writable=True)
+        rows = np.fromiter((index.intern(c) for c in deltas), dtype=np.int64, count=len(deltas))
+        risks = np.fromiter(deltas.values(), dtype=np.float64, count=len(deltas))
+        # 같은 조건이 여러 번 나오지 않으므로(dict) 행은 유일
+        matrix.grow(len(index))
+        j = matrix.dim_index[dimension]
+        
+        old_values = matrix.gather(j, rows)
+        old_presence, old_high = matrix.row_flags(rows)
+        matrix.set_values(rows, dimension, risks)
+        new_presence, new_high = matrix.row_flags(rows)
+        
+        # 열 j의 포함/고위험 여부 변화 × 다른 열의 포함/고위험 여부
+        d_presence = new_presence[:, j].astype(np.int64) - old_presence[:, j]
+        manifold.adjust_coverage(rows, d_presence)
+        d_high = new_high[:, j].astype(np.int64) - old_high[:, j]
+        common_delta = d_presence @ new_presence.astype(np.int64)
+        high_delta = d_high @ new_high.astype(np.int64)
+        common_delta[j] = d_presence.sum()
+        high_delta[j] = d_high.sum()
+        common_counts[j, :] += common_delta
+        common_counts[:, j] = common_counts[j, :]
+        high_counts[j, :] += high_delta
+        high_counts[:, j] = high_counts[j, :]
+        
+        manifold.invalidate_risks(rows)
+        self._update_connections(manifold, j)
+        touched = rows[(old_values > COLLAPSE_DIM_RISK) | (risks > COLLAPSE_DIM_RISK)]
+        self._update_collapse_zones(manifold, touched)
+        return self._publish(manifold, publish)
+    
+    def _publish(self, manifold: StateManifold, publish: bool) -> StateManifold:
+        """publish이면 새 버전을 self.manifold로 게시 (참조 한 번 바꾸기)"""
+        if publish:
+            self.manifold = manifold
+        return manifold
+    
+    def _drop_column(self, manifold: StateManifold, name: str) -> None:
+        """위험도 행렬에서 열 하나를 빼고 연결/붕괴 영역/캐시를 맞춘다"""
+        matrix = manifold.risk_matrix
+        rows, values = matrix.column_entries(matrix.dim_index[name])
+        touched = rows[values > COLLAPSE_DIM_RISK]
+        
+        common_counts, high_counts = manifold.pair_counts()
+        j = matrix.remove_column(name)
+        manifold.adjust_coverage(rows, -1)
+        manifold._pair_counts = (
+            np.delete(np.delete(common_counts, j, axis=0), j, axis=1),
+            np.delete(np.delete(high_counts, j, axis=0), j, axis=1),
+        )
+        for pair in [p for p in manifold.organic_connections if name in p]:
+            del manifold.organic_connections[pair]
+        
+        # 차원 수가 바뀌면 모든 조건의 평균 분모가 바뀐다
+        manifold.invalidate_risks()
+        self._update_collapse_zones(manifold, touched)
+    
+    def _update_connections(self, manifold: StateManifold, j: int) -> None:
+        """열 j가 포함된 차원 쌍의 유기적 연결만 다시 계산"""
+        dimension_names = manifold.risk_matrix.dimensions
+        common_counts, high_counts = manifold.pair_counts()
+        common_row = common_counts[j].tolist()
+        high_row = high_counts[j].tolist()
+        connections = manifold.organic_connections
+        
+        for k, other in enumerate(dimension_names):
+            if k == j:
+                continue
+            pair = (other, dimension_names[j]) if k < j else (dimension_names[j], other)
+            common = common_row[k]
+            connections[pair] = high_row[k] / common if common else 0.0
+    
+    def _update_collapse_zones(self, manifold: StateManifold, touched: np.ndarray) -> None:
+        """touched 조건들의 붕괴 영역만 다시 판정해 새 표로 교체 (조건 ID 순서)"""
+        if len(touched) == 0:
+            return
+        touched = np.unique(touched)
+        table = manifold.collapse_zones
+        new_zones = self._collapse_zone_table(
+            manifold.risk_matrix, manifold.condition_index, touched
+        )
+        
+        # 정렬 색인은 이 표로 만들어진 경우에만 함께 갱신 (아니면 다음 질의에서 다시 만든다)
+        zone_index = None
+        if manifold._collapse_index_table is table:
+            zone_index = manifold._own("_collapse_index")
+        if zone_index is not None:
+            zone_index.update(
+                table.condition_ids[np.isin(table.condition_ids, touched)].tolist(),
+                [
+                    (condition_id, organic_risk, new_zones.zone_dimensions(position))
+                    for position, (condition_id, organic_risk) in enumerate(zip(
+                        new_zones.condition_ids.tolist(), new_zones.organic_risks.tolist()
+                    ))
+                ],
+            )
+        
+        manifold.collapse_zones = table.replace(touched, new_zones)
+        if zone_index is not None:
+            manifold._collapse_index_table = manifold.collapse_zones
+    
     def flow_through_space(
         self,
         value: Any,
         start: str,  # ConditionSignature
         goal: str,   # ConditionSignature
         manifold: Optional[StateManifold] = None,
+        mode: str = "greedy",
+        max_cost: Optional[float] = None,
     ) -> Optional[FlowResult]:
         """값이 상태 공간을 통과
         
@@ -100,255 +422,645 @@ class StateManifoldEngine:
             goal: 목표 조건 서명
             manifold: 명시적으로 사용할 StateManifold (선택).
                      제공하지 않으면 build_state_space()로 구축된 내부 manifold를 사용.
+            mode: 경로 탐색 모드
+                 - "greedy": 전체 조건 중 통합 위험도가 가장 낮은 조건으로 이동 (기본)
+                 - "dijkstra": 인접 구조 위의 최소 비용 경로 (간선 비용 = 통합 위험도)
+                 - "astar": dijkstra와 같은 최적 비용, 격자 거리 휴리스틱으로 탐색 축소
+            max_cost: 경로 비용 상한 (dijkstra/astar 전용, 넘는 경로는 찾지 않음)
         
         Returns:
             흐름 결과 (형태 보존, 안정적 출력)
         """
-        previous = self.manifold
-        if manifold is not None:
-            self.manifold = manifold
+        if mode not in FLOW_MODES:
+            raise ValueError(f"알 수 없는 흐름 모드: {mode!r} (가능: {', '.join(FLOW_MODES)})")
 
-        try:
-            if not self.manifold:
-                raise ValueError("상태 공간이 구축되지 않았습니다. build_state_space()를 먼저 호출하세요.")
+        # 질의 시작 시점의 상태 공간을 끝까지 사용 (공유 상태를 바꾸지 않음)
+        manifold = self._resolve_manifold(manifold)
+        
+        cache = self.flow_cache
+        if cache is not None:
+            key = self._flow_key(manifold, start, goal, mode, max_cost)
+            entry = cache.get(key)
+            if entry is not None:
+                return self._cached_flow_result(entry, value)
+        
+        # 공유 캐시(통합 위험도, 정렬 색인)를 먼저 채운다 (버전당 한 번)
+        manifold.risk_order()
         
-            # 통합 위험 지형 기반으로 경로 찾기
-            path = self._find_flow_path(start, goal)
+        # 통합 위험 지형 기반으로 경로 찾기 (조건 ID)
+        if mode == "greedy":
+            path_ids = self._find_flow_path(manifold, start, goal)
+        else:
+            path_ids = self._route_flow_path(
+                manifold, start, goal, use_heuristic=(mode == "astar"), max_cost=max_cost
+            )
+        
+        if path_ids is None:
+            if cache is not None:
+                cache.put(key, NO_PATH)
+            return None
+        
+        # 경로상 통합 위험도 (조건 ID로 한 번에 계산)
+        path_risks = [manifold.get_risk(start)]
+        path_risks += manifold.get_risks_by_id(path_ids).tolist()
         
-            if not path:
-                return None
+        result = self._make_flow_result(manifold, value, start, path_ids, path_risks)
+        if cache is not None:
+            cache.put(key, self._flow_cache_entry(result))
+        return result
+    
+    def flow_many(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        value: Any = None,
+        mode: str = "greedy",
+        manifold: Optional[StateManifold] = None,
+        max_cost: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[Optional[FlowResult]]:
+        """여러 (시작, 목표) 쌍의 흐름을 한 번에 계산
         
-            # 흐름 에너지 계산 (통합 위험도 기반)
-            flow_energy = self._calculate_flow_energy(path)
+        컴파일된 통합 위험도, 정렬 색인, 인접 구조를 모든 질의가 공유하고,
+        시작 조건이 같은 쌍끼리는 탐색 자체(그리디 걸음 / Dijkstra 전선)를 공유한다.
         
-            # 형태 보존도 계산
-            form_preservation = self._calculate_form_preservation(path, value)
+        동시 질의 모드:
+            executor (예: concurrent.futures.ThreadPoolExecutor)를 주면 시작 조건별
+            묶음을 작업 스레드에 나누어 실행한다. 모든 묶음은 호출 시점의 같은
+            상태 공간을 사용하며, 공유 캐시는 미리 채운 뒤 나누므로 작업 스레드는
+            읽기만 한다. 단, 질의 도중 같은 StateManifold의 위험도 행렬을
+            직접 수정하면 안 된다 (갱신 API는 모두 새 버전을 만든다). 캐시 적중/실패 통계는
+            동시 실행 중 근사값이 될 수 있다.
         
-            # 안정성 계산
-            stability = self._calculate_stability(path)
+        Args:
+            pairs: (시작 조건 서명, 목표 조건 서명) 쌍들
+            value: 공간을 통과할 값 (모든 결과에 공통)
+            mode: 경로 탐색 모드 ("greedy", "dijkstra", "astar")
+            manifold: 명시적으로 사용할 StateManifold (선택)
+            max_cost: 경로 비용 상한 (dijkstra/astar 전용)
+            executor: 동시 실행에 쓸 concurrent.futures.Executor (선택)
         
-            return FlowResult(
-                value=value,
-                path=path,
-                flow_energy=flow_energy,
-                form_preservation=form_preservation,
-                stability=stability
+        Returns:
+            입력 순서대로 흐름 결과 (경로 없으면 None)
+        """
+        if mode not in FLOW_MODES:
+            raise ValueError(f"알 수 없는 흐름 모드: {mode!r} (가능: {', '.join(FLOW_MODES)})")
+        
+        # 모든 묶음이 같은 상태 공간을 보도록 한 번만 결정
+        manifold = self._resolve_manifold(manifold)
+        pairs = list(pairs)
+        
+        # 시작 조건별로 묶기 (입력 위치 기억)
+        groups: Dict[str, List[int]] = {}
+        for position, (start, _) in enumerate(pairs):
+            groups.setdefault(start, []).append(position)
+        
+        def run_group(start: str, positions: List[int]) -> List[Optional[FlowResult]]:
+            goals = [pairs[position][1] for position in positions]
+            return self.flow_from(
+                start, goals, value=value, mode=mode, manifold=manifold, max_cost=max_cost
             )
-        finally:
-            self.manifold = previous
+        
+        if executor is None:
+            group_results = [
+                (positions, run_group(start, positions))
+                for start, positions in groups.items()
+            ]
+        else:
+            # 공유 캐시(통합 위험도, 정렬 색인)를 미리 채워 작업 스레드는 읽기만 하도록
+            manifold.risk_order()
+            futures = [
+                (positions, executor.submit(run_group, start, positions))
+                for start, positions in groups.items()
+            ]
+            group_results = [(positions, future.result()) for positions, future in futures]
+        
+        results: List[Optional[FlowResult]] = [None] * len(pairs)
+        for positions, flows in group_results:
+            for position, result in zip(positions, flows):
+                results[position] = result
+        return results
+    
+    def flow_from(
+        self,
+        start: str,
+        goals: Iterable[str],
+        value: Any = None,
+        mode: str = "greedy",
+        manifold: Optional[StateManifold] = None,
+        max_cost: Optional[float] = None,
+    ) -> List[Optional[FlowResult]]:
+        """한 시작 조건에서 여러 목표로의 흐름
+        
+        - greedy: 그리디 걸음은 목표와 무관하므로 한 번만 걷고 목표별로 잘라낸다
+        - dijkstra: 단일 출발 Dijkstra 한 번으로 모든 목표의 경로를 확정
+        - astar: 목표별 A* (통합 위험도·인접 구조는 공유)
+        
+        Args:
+            start: 시작 조건 서명
+            goals: 목표 조건 서명들
+            value: 공간을 통과할 값 (모든 결과에 공통)
+            mode: 경로 탐색 모드 ("greedy", "dijkstra", "astar")
+            manifold: 명시적으로 사용할 StateManifold (선택)
+            max_cost: 경로 비용 상한 (dijkstra/astar 전용)
+        
+        Returns:
+            목표 순서대로 흐름 결과 (경로 없으면 None)
+        """
+        if mode not in FLOW_MODES:
+            raise ValueError(f"알 수 없는 흐름 모드: {mode!r} (가능: {', '.join(FLOW_MODES)})")
+        
+        manifold = self._resolve_manifold(manifold)
+        goals = list(goals)
+        results: List[Optional[FlowResult]] = [None] * len(goals)
+        
+        # 캐시에 있는 목표는 탐색에서 뺀다
+        cache = self.flow_cache
+        keys: List[Any] = []
+        uncached = list(range(len(goals)))
+        if cache is not None:
+            keys = [self._flow_key(manifold, start, goal, mode, max_cost) for goal in goals]
+            uncached = []
+            for i, key in enumerate(keys):
+                entry = cache.get(key)
+                if entry is None:
+                    uncached.append(i)
+                else:
+                    results[i] = self._cached_flow_result(entry, value)
+            if not uncached:
+                return results
+        
+        # 모든 질의가 공유하는 컴파일된 데이터 (어느 차원에도 없는 조건은 통과 불가)
+        risks = manifold.route_risks()
+        start_id = manifold.condition_id(start)
+        goal_ids = [manifold.condition_id(goal) for goal in goals]
+        
+        paths: List[Optional[List[int]]] = [None] * len(goals)
+        pending = [
+            i for i in uncached
+            if goals[i] != start and goal_ids[i] is not None
+        ]
+        for i in uncached:
+            if goals[i] == start:
+                paths[i] = []
+        
+        if pending and mode == "greedy":
+            walk = self._greedy_walk(manifold, start_id)
+            positions = {condition_id: i for i, condition_id in enumerate(walk)}
+            for i in pending:
+                paths[i] = self._greedy_prefix(walk, goal_ids[i], positions)
+        elif pending:
+            graph = self._require_neighborhood(manifold)
+            if start_id is not None and mode == "dijkstra":
+                routed = route_many(
+                    graph, risks, start_id, [goal_ids[i] for i in pending], max_cost=max_cost
+                )
+                for i in pending:
+                    paths[i] = routed[goal_ids[i]]
+            elif start_id is not None:
+                for i in pending:
+                    paths[i] = route(
+                        graph, risks, start_id, goal_ids[i],
+                        max_cost=max_cost, use_heuristic=True,
+                        step_cost=manifold.route_step_cost(),
+                    )
+        
+        start_risk = manifold.get_risk(start)
+        for i in uncached:
+            path_ids = paths[i]
+            if path_ids is not None:
+                path_risks = [start_risk] + risks[path_ids].tolist()
+                results[i] = self._make_flow_result(manifold, value, start, path_ids, path_risks)
+            if cache is not None:
+                cache.put(keys[i], NO_PATH if results[i] is None else self._flow_cache_entry(results[i]))
+        return results
+    
+    @staticmethod
+    def _flow_key(
+        manifold: StateManifold,
+        start: str,
+        goal: str,
+        mode: str,
+        max_cost: Optional[float]
+    ):
+        """흐름 캐시 키 (greedy는 비용 상한을 쓰지 않음)"""
+        return FlowCache.key(
+            start, goal, mode, None if mode == "greedy" else max_cost, manifold.version
+        )
+    
+    @staticmethod
+    def _flow_cache_entry(result: FlowResult):
+        """캐시에 둘 값: 값(value)을 뺀 경로와 점수"""
+        return (tuple(result.path), result.flow_energy, result.form_preservation, result.stability)
+    
+    @staticmethod
+    def _cached_flow_result(entry: Any, value: Any) -> Optional[FlowResult]:
+        """캐시 항목으로 새 흐름 결과 구성 (경로 없음이면 None)"""
+        if entry is NO_PATH:
+            return None
+        path, flow_energy, form_preservation, stability = entry
+        return FlowResult(
+            value=value,
+            path=list(path),
+            flow_energy=flow_energy,
+            form_preservation=form_preservation,
+            stability=stability
+        )
+    
+    def flow_cache_info(self) -> Dict[str, int]:
+        """흐름 결과 캐시 통계
+        
+        Returns:
+            {"hits", "misses", "evictions", "size", "capacity"} (캐시가 없으면 모두 0)
+        """
+        if self.flow_cache is None:
+            return {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "capacity": 0}
+        return self.flow_cache.info()
+    
+    def _make_flow_result(
+        self,
+        manifold: StateManifold,
+        value: Any,
+        start: str,
+        path_ids: List[int],
+        path_risks: List[float]
+    ) -> FlowResult:
+        """경로 ID와 경로상 통합 위험도로 흐름 결과 구성"""
+        # API 경계에서 조건 서명으로 복원
+        path = [start] + manifold.condition_index.signatures(path_ids)
+        
+        # 흐름 에너지 계산 (통합 위험도 기반)
+        flow_energy = self._calculate_flow_energy(path_risks)
+        
+        # 형태 보존도 계산
+        form_preservation = self._calculate_form_preservation(path_risks, value)
+        
+        # 안정성 계산
+        stability = self._calculate_stability(path_risks)
+        
+        return FlowResult(
+            value=value,
+            path=path,
+            flow_energy=flow_energy,
+            form_preservation=form_preservation,
+            stability=stability
+        )
     
     def _calculate_organic_connections(
         self,
-        biases: Dict[str, 'SearchBias']
+        risk_matrix: RiskMatrix,
+        pair_counts: Optional[Tuple[np.ndarray, np.ndarray]] = None
     ) -> Dict[tuple, float]:
         """유기적 연결 가중치 계산
         
         여러 난제의 위험 지형이 겹치는 구역에서
         유기적 증폭을 계산.
+        모든 차원 쌍의 공통 조건 수와 동시 고위험 조건 수를
+        위험도 행렬의 마스크 곱으로 한 번에 구한다.
         
         Args:
-            biases: 차원별 SearchBias 딕셔너리
+            risk_matrix: 조건 × 차원 위험도 행렬
+            pair_counts: 미리 계산한 risk_matrix.pair_counts() (선택)
         
         Returns:
             유기적 연결 가중치 (난제 쌍 → 가중치)
         """
         connections = {}
-        dimension_names = list(biases.keys())
+        dimension_names = risk_matrix.dimensions
+        if pair_counts is None:
+            pair_counts = risk_matrix.pair_counts()
+        common_counts, high_counts = pair_counts
+        common_counts = common_counts.tolist()
+        high_counts = high_counts.tolist()
         
         # 모든 난제 쌍에 대해 유기적 연결 계산
         for i, dim1 in enumerate(dimension_names):
-            for dim2 in dimension_names[i+1:]:
-                bias1 = biases[dim1]
-                bias2 = biases[dim2]
-                
-                # 공통 조건 서명 찾기
-                common_conditions = set(bias1.risk_map.keys()) & set(bias2.risk_map.keys())
+            for j in range(i + 1, len(dimension_names)):
+                dim2 = dimension_names[j]
+                common = common_counts[i][j]
                 
-                if not common_conditions:
+                if not common:
                     connections[(dim1, dim2)] = 0.0
                     continue
                 
                 # 유기적 연결 강도 계산
                 # 두 난제에서 동시에 위험한 조건이 많을수록 강한 연결
-                high_risk_pairs = sum(
-                    1 for cond in common_conditions
-                    if bias1.get_risk(cond) > 0.7 and bias2.get_risk(cond) > 0.7
-                )
-                
-                connection_strength = high_risk_pairs / len(common_conditions) if common_conditions else 0.0
-                connections[(dim1, dim2)] = connection_strength
+                connections[(dim1, dim2)] = high_counts[i][j] / common
         
         return connections
     
+    def identify_collapse_zones(
+        self,
+        conditions: Optional[List[str]] = None,
+        manifold: Optional[StateManifold] = None
+    ) -> List[CollapseZone]:
+        """통합 붕괴 영역 식별 (독립 호출)
+        
+        build_state_space() 없이도 이미 구축된 상태 공간의
+        일부 조건만 골라 붕괴 영역을 다시 판정할 수 있다.
+        
+        Args:
+            conditions: 판정할 조건 서명들 (None이면 전체, 모르는 조건은 무시)
+            manifold: 명시적으로 사용할 StateManifold (선택)
+        
+        Returns:
+            통합 붕괴 영역 리스트
+        """
+        manifold = manifold if manifold is not None else self.manifold
+        if not manifold:
+            raise ValueError("상태 공간이 구축되지 않았습니다. build_state_space()를 먼저 호출하세요.")
+        if manifold.risk_matrix is None:
+            return []
+        
+        condition_ids = None
+        if conditions is not None:
+            condition_ids = [
+                condition_id for condition_id in map(manifold.condition_id, conditions)
+                if condition_id is not None
+            ]
+        return self._identify_collapse_zones(
+            manifold.risk_matrix, manifold.condition_index, condition_ids
+        )
+    
     def _identify_collapse_zones(
         self,
-        biases: Dict[str, 'SearchBias']
+        risk_matrix: RiskMatrix,
+        condition_index: ConditionIndex,
+        condition_ids: Optional[List[int]] = None
     ) -> List[CollapseZone]:
         """통합 붕괴 영역 식별
         
         여러 난제의 붕괴 조건이 겹쳐진 영역을 식별.
         
         Args:
-            biases: 차원별 SearchBias 딕셔너리
+            risk_matrix: 조건 × 차원 위험도 행렬
+            condition_index: 조건 서명 ↔ ID 색인
+            condition_ids: 판정할 조건 ID들 (None이면 전체)
         
         Returns:
-            통합 붕괴 영역 리스트
+            통합 붕괴 영역 리스트 (조건 ID 순서)
         """
-        collapse_zones = []
-        
-        # 모든 차원의 조건 서명 수집
-        all_conditions = set()
-        for bias in biases.values():
-            all_conditions.update(bias.risk_map.keys())
-        
-        # 각 조건에 대해 통합 위험도 계산
-        for condition in all_conditions:
-            dimension_risks = {}
-            for dim_name, bias in biases.items():
-                risk = bias.get_risk(condition)
-                if risk > 0.5:  # 위험한 조건만 고려
-                    dimension_risks[dim_name] = risk
-            
-            if not dimension_risks:
-                continue
-            
-            # 유기적 위험도 계산
-            base_risk = sum(dimension_risks.values()) / len(dimension_risks)
-            
-            # 여러 차원에서 동시에 위험한 경우 증폭
-            if len(dimension_risks) > 1:
-                organic_boost = 1.0 + (len(dimension_risks) - 1) * 0.2
-                organic_risk = min(1.0, base_risk * organic_boost)
-            else:
-                organic_risk = base_risk
-            
-            # 붕괴 영역으로 식별 (유기적 위험도가 높은 경우)
-            if organic_risk > 0.7:
-                collapse_zones.append(CollapseZone(
-                    condition_signature=condition,
-                    dimensions=dimension_risks,
-                    organic_risk=organic_risk
-                ))
+        return list(self._collapse_zone_table(risk_matrix, condition_index, condition_ids))
+    
+    def _collapse_zone_table(
+        self,
+        risk_matrix: RiskMatrix,
+        condition_index: ConditionIndex,
+        condition_ids: Optional[List[int]] = None
+    ) -> CollapseZoneTable:
+        """통합 붕괴 영역 표
+        
+        마스크 평균·고위험 차원 수·증폭·임계값 판정을 위험도 행렬 위에서
+        배열 연산으로 한 번에 수행하고, 결과를 CollapseZoneTable 배열로 담는다
+        (영역별 객체를 만들지 않음).
+        
+        Args:
+            risk_matrix: 조건 × 차원 위험도 행렬
+            condition_index: 조건 서명 ↔ ID 색인
+            condition_ids: 판정할 조건 ID들 (None이면 전체)
+        
+        Returns:
+            붕괴 영역 표 (조건 ID 순서)
+        """
+        zone_ids, organic_risks, dim_mask = risk_matrix.collapse_scores(condition_ids)
+        
+        # 영역별 관련 차원 (CSR, 영역 안에서는 열 순서)
+        zone_rows, dims = np.nonzero(dim_mask)
+        values = np.zeros(len(dims), dtype=np.float64)
+        for j in range(risk_matrix.n_dims):
+            selected = np.flatnonzero(dims == j)
+            if len(selected):
+                values[selected] = risk_matrix.gather(j, zone_ids[zone_rows[selected]])
+        indptr = np.zeros(len(zone_ids) + 1, dtype=np.int64)
+        np.cumsum(dim_mask.sum(axis=1), out=indptr[1:])
         
-        return collapse_zones
+        return CollapseZoneTable(
+            condition_index,
+            list(risk_matrix.dimensions),
+            np.asarray(zone_ids, dtype=np.int64),
+            np.asarray(organic_risks, dtype=np.float64),
+            indptr,
+            dims.astype(np.int64),
+            values,
+        )
     
     def _find_flow_path(
         self,
+        manifold: StateManifold,
         start: str,
         goal: str
-    ) -> Optional[List[str]]:
+    ) -> Optional[List[int]]:
         """흐름 경로 찾기
         
         통합 위험 지형을 기반으로 경로 찾기.
         (간단한 구현, 향후 개선 가능)
         
         Args:
+            manifold: 사용할 상태 공간
             start: 시작 조건 서명
             goal: 목표 조건 서명
         
         Returns:
-            경로 (조건 서명 리스트)
+            시작 이후 경로의 조건 ID 리스트 (시작 조건 제외, 경로 없으면 None)
         """
-        if not self.manifold:
+        if not manifold:
             return None
         
+        if start == goal:
+            return []
+        
+        goal_id = manifold.condition_id(goal)
+        if goal_id is None:
+            return None
+        
+        path = self._greedy_walk(manifold, manifold.condition_id(start), goal_id)
+        return self._greedy_prefix(path, goal_id)
+    
+    def _greedy_walk(
+        self,
+        manifold: StateManifold,
+        start_id: Optional[int],
+        goal_id: Optional[int] = None
+    ) -> List[int]:
+        """그리디 흐름 걸음
+        
+        시작 조건에서 출발해 매번 방문하지 않은 조건 중 통합 위험도가 가장 낮은
+        조건으로 이동한다. 걸음은 목표와 무관하므로, 목표를 주지 않으면
+        최대 반복까지 걸은 전체 걸음을 돌려주어 여러 목표가 공유할 수 있다.
+        
+        Args:
+            manifold: 사용할 상태 공간
+            start_id: 시작 조건 ID (행렬에 없으면 None)
+            goal_id: 도달하면 멈출 목표 조건 ID (선택)
+        
+        Returns:
+            시작 이후 걸음의 조건 ID 리스트 (시작 조건 제외)
+        """
+        # 통합 위험도 오름차순 색인: 방문하지 않은 후보 중 최소 위험 조건은
+        # 항상 색인의 다음 원소 (시작 조건만 건너뜀)
+        max_iterations = GREEDY_MAX_ITERATIONS
+        order, sorted_risks = manifold.risk_order()
+        order = order[:max_iterations + 1].tolist()
+        sorted_risks = sorted_risks[:max_iterations + 1].tolist()
+        
         # 간단한 그리디 방식으로 경로 찾기
-        current = start
-        path = [current]
-        visited: Set[str] = {current}
-        max_iterations = 100
+        path: List[int] = []
+        position = 0
         
         for _ in range(max_iterations):
-            if current == goal:
+            if path and path[-1] == goal_id:
                 return path
             
-            # 다음 조건 후보 찾기 (통합 위험도가 낮은 순서로)
-            candidates = self._get_next_candidates(current, visited)
-            
-            if not candidates:
+            # 다음 후보: 색인에서 방문하지 않은 첫 조건 (동점이면 ID가 작은 조건)
+            if position < len(order) and order[position] == start_id:
+                position += 1
+            if position >= len(order):
                 break
             
-            # 통합 위험도가 가장 낮은 후보 선택
-            best_next = min(
-                candidates,
-                key=lambda c: self.manifold.get_risk(c)
-            )
-            
             # 위험도가 너무 높으면 중단
-            if self.manifold.get_risk(best_next) > 0.8:
+            if sorted_risks[position] > 0.8:
                 break
             
-            current = best_next
-            path.append(current)
-            visited.add(current)
+            path.append(order[position])
+            position += 1
         
-        return None
+        return path
     
-    def _get_next_candidates(
+    @staticmethod
+    def _greedy_prefix(
+        walk: List[int],
+        goal_id: int,
+        positions: Optional[Dict[int, int]] = None
+    ) -> Optional[List[int]]:
+        """그리디 걸음에서 목표까지의 경로 잘라내기
+        
+        목표 도달 여부는 각 반복의 시작에서 확인하므로,
+        마지막 반복에서 막 들어선 조건은 도달로 치지 않는다.
+        
+        Args:
+            walk: 그리디 걸음 (조건 ID)
+            goal_id: 목표 조건 ID
+            positions: 조건 ID → 걸음 내 위치 (여러 목표가 공유할 때)
+        """
+        if positions is None:
+            position = len(walk) - 1 if walk and walk[-1] == goal_id else None
+        else:
+            position = positions.get(goal_id)
+        if position is None or position + 1 >= GREEDY_MAX_ITERATIONS:
+            return None
+        return walk[:position + 1]
+    
+    def _route_flow_path(
         self,
-        current: str,
-        visited: Set[str]
-    ) -> List[str]:
-        """다음 조건 후보 찾기"""
-        candidates = []
-        
-        # 모든 차원의 조건 서명 수집
-        for bias in self.manifold.dimensions.values():
-            if hasattr(bias, 'risk_map'):
-                for condition in bias.risk_map.keys():
-                    if condition not in visited:
-                        candidates.append(condition)
-        
-        # 중복 제거
-        return list(set(candidates))
+        manifold: StateManifold,
+        start: str,
+        goal: str,
+        use_heuristic: bool = False,
+        max_cost: Optional[float] = None
+    ) -> Optional[List[int]]:
+        """인접 구조 위의 최적 흐름 경로 찾기 (Dijkstra / A*)
+        
+        Args:
+            manifold: 사용할 상태 공간
+            start: 시작 조건 서명
+            goal: 목표 조건 서명
+            use_heuristic: True면 A*, False면 Dijkstra
+            max_cost: 경로 비용 상한
+        
+        Returns:
+            시작 이후 경로의 조건 ID 리스트 (시작 조건 제외, 경로 없으면 None)
+        """
+        self._require_neighborhood(manifold)
+        
+        if start == goal:
+            return []
+        
+        start_id = manifold.condition_id(start)
+        goal_id = manifold.condition_id(goal)
+        if start_id is None or goal_id is None:
+            return None
+        
+        return route(
+            manifold.neighborhood,
+            manifold.route_risks(),
+            start_id,
+            goal_id,
+            max_cost=max_cost,
+            use_heuristic=use_heuristic,
+            step_cost=manifold.route_step_cost() if use_heuristic else None,
+        )
+    
+    def _resolve_manifold(self, manifold: Optional[StateManifold]) -> StateManifold:
+        """질의에 사용할 상태 공간 결정
+        
+        명시적으로 주어진 manifold가 있으면 그것을, 없으면 호출 시점의
+        self.manifold를 한 번만 읽어 사용한다. 엔진 상태를 바꾸지 않으므로
+        여러 스레드의 질의가 서로의 상태 공간을 보지 않는다.
+        """
+        if manifold is None:
+            manifold = self.manifold
+        if not manifold:
+            raise ValueError("상태 공간이 구축되지 않았습니다. build_state_space()를 먼저 호출하세요.")
+        return manifold
+    
+    @staticmethod
+    def _require_neighborhood(manifold: StateManifold):
+        """인접 구조 확인 (dijkstra/astar 흐름용)"""
+        if manifold.neighborhood is None:
+            raise ValueError(
+                "인접 구조가 없습니다. build_state_space(neighbors=...)로 구축하세요."
+            )
+        return manifold.neighborhood
     
     def _calculate_flow_energy(
         self,
-        path: List[str]
+        path_risks: List[float]
     ) -> float:
         """흐름 에너지 계산
         
         통합 위험도 기반으로 흐름 에너지 계산.
+        
+        Args:
+            path_risks: 경로상 조건들의 통합 위험도
         """
-        if not path:
+        if not path_risks:
             return float('inf')
         
-        total_risk = sum(self.manifold.get_risk(condition) for condition in path)
-        flow_energy = total_risk / len(path)
+        total_risk = sum(path_risks)
+        flow_energy = total_risk / len(path_risks)
         
         return flow_energy
     
     def _calculate_form_preservation(
         self,
-        path: List[str],
+        path_risks: List[float],
         value: Any
     ) -> float:
         """형태 보존도 계산
         
         경로를 따라가면서 형태가 얼마나 보존되는지 계산.
         """
-        if not path:
+        if not path_risks:
             return 0.0
         
         # 평균 위험도가 낮을수록 형태 보존도 높음
-        avg_risk = sum(self.manifold.get_risk(condition) for condition in path) / len(path)
+        avg_risk = sum(path_risks) / len(path_risks)
         form_preservation = 1.0 - avg_risk
         
         return max(0.0, min(1.0, form_preservation))
     
     def _calculate_stability(
         self,
-        path: List[str]
+        path_risks: List[float]
     ) -> float:
         """안정성 계산
         
         경로의 안정성을 계산.
         """
-        if not path:
+        if not path_risks:
             return 0.0
         
         # 위험도가 낮을수록 안정성 높음
-        max_risk = max(self.manifold.get_risk(condition) for condition in path)
+        max_risk = max(path_risks)
         stability = 1.0 - max_risk
         
         return max(0.0, min(1.0, stability))
@@ -372,8 +1084,9 @@ class StateManifoldEngine:
         
         구현 원칙:
         - 상태 공간이 없으면 아무 것도 하지 않음
-        - SearchBias 자체를 파괴하지 않음 (가벼운 가중치 조정만 수행)
+        - SearchBias 자체를 파괴하지 않음 (위험도 행렬에만 반영)
         - 한 번 호출은 "한 번의 미세한 숨결"에 해당 (루프/스레드 없음)
+        - 요동이 적용된 새 버전을 self.manifold로 게시 (이전 버전은 그대로)
         
         Args:
             fluctuation_scale: 미세 요동의 크기 (0.0 ~ 1.0, 기본 0.01)
@@ -386,76 +1099,51 @@ class StateManifoldEngine:
         if fluctuation_scale <= 0.0 or max_iterations <= 0:
             return
         
-        # 너무 큰 값으로 설정되는 것을 방지
-        fluctuation_scale = min(fluctuation_scale, 0.1)
-        
-        for _ in range(max_iterations):
-            self._apply_minimal_fluctuations(fluctuation_scale)
+        self.manifold = self.fluctuate_snapshot(fluctuation_scale, max_iterations)
     
-    def _apply_minimal_fluctuations(
+    def fluctuate_snapshot(
         self,
-        fluctuation_scale: float
-    ) -> None:
-        """상태 공간에 미세한 요동을 적용하여 '살아있는' 상태를 유지
+        fluctuation_scale: float = 0.01,
+        iterations: int = 1,
+        manifold: Optional[StateManifold] = None
+    ) -> StateManifold:
+        """미세 요동을 적용한 새 상태 공간 (원본 불변)
         
-        구현 전략:
-        - 각 차원의 SearchBias에서 위험도가 극단적으로 높은 조건을 완만하게 낮춤
-        - 여러 차원에서 동시에 높은 위험을 가지는 조건은 조금 더 강하게 조정
-        - 이미 낮은 위험도를 가진 조건은 거의 건드리지 않음
+        maintain_life()가 게시하는 새 버전을 만들기만 하고 게시하지 않는다.
+        원본 상태 공간과 SearchBias는 건드리지 않는다. 값이 바뀐 열만 복사하고
+        나머지는 공유하며, 통합 위험도 캐시는 바뀐 조건만 무효화해 넘겨준다.
         
-        이는 실제 물리 계에서의 열 잡음/브라운 운동이
-        퍼텐셜 우물 바닥 주변을 탐색하게 만드는 것에 해당한다.
-        """
-        if not self.manifold:
-            return
+        Args:
+            fluctuation_scale: 미세 요동의 크기 (최대 0.1)
+            iterations: 요동 반복 횟수
+            manifold: 원본 상태 공간 (None이면 내부 manifold)
         
-        # 모든 조건 서명 수집
-        all_conditions: Set[str] = set()
-        for bias in self.manifold.dimensions.values():
-            if hasattr(bias, "risk_map"):
-                all_conditions.update(bias.risk_map.keys())
+        Returns:
+            요동이 적용된 새 상태 공간 (바뀐 것이 없으면 원본 그대로)
+        """
+        manifold = self._resolve_manifold(manifold)
+        # 너무 큰 값으로 설정되는 것을 방지
+        fluctuation_scale = min(fluctuation_scale, 0.1)
+        matrix = manifold.risk_matrix
+        if fluctuation_scale <= 0.0 or iterations <= 0 or matrix is None:
+            return manifold
         
-        if not all_conditions:
-            return
+        snapshot = manifold._clone()
+        changed = snapshot.risk_matrix.fluctuate(
+            fluctuation_scale, iterations, self._writable_dims(manifold)
+        )
+        if not changed:
+            return manifold
         
-        for condition in all_conditions:
-            # 차원별 위험도 수집
-            dimension_risks: Dict[str, float] = {}
-            for dim_name, bias in self.manifold.dimensions.items():
-                if hasattr(bias, "get_risk") and hasattr(bias, "set_risk"):
-                    risk = bias.get_risk(condition)
-                    dimension_risks[dim_name] = risk
-            
-            if not dimension_risks:
-                continue
-            
-            # 여러 차원에서 동시에 높은 위험을 가지는 조건일수록 더 강하게 완화
-            high_risk_dims = [
-                name for name, risk in dimension_risks.items()
-                if risk > 0.8
-            ]
-            
-            for dim_name, risk in dimension_risks.items():
-                bias = self.manifold.dimensions[dim_name]
-                
-                # 너무 낮은 위험도는 건드리지 않음
-                if risk < 0.2:
-                    continue
-                
-                # 기본 완화 계수
-                attenuation = fluctuation_scale
-                
-                # 여러 차원에서 동시에 높은 위험을 가지면 조금 더 강하게 완화
-                if dim_name in high_risk_dims and len(high_risk_dims) > 1:
-                    attenuation *= 1.5
-                
-                # 위험도를 약간 감소시켜, 장벽을 완만하게 다듬는다
-                new_risk = max(0.0, risk - attenuation * risk)
-                
-                # SearchBias의 risk_map을 직접 수정 (set_risk 메서드가 없을 경우 대비)
-                if hasattr(bias, 'set_risk'):
-                    bias.set_risk(condition, new_risk)
-                elif hasattr(bias, 'risk_map') and isinstance(bias.risk_map, dict):
-                    # risk_map을 직접 수정
-                    bias.risk_map[condition] = new_risk
-
+        snapshot.invalidate_risks(np.unique(np.concatenate(list(changed.values()))))
+        snapshot._pair_counts = None
+        return snapshot
+    
+    @staticmethod
+    def _writable_dims(manifold: StateManifold) -> List[int]:
+        """요동 대상 열 번호 (get_risk/set_risk를 모두 가진 SearchBias)"""
+        matrix = manifold.risk_matrix
+        return [
+            matrix.dim_index[dim_name] for dim_name in matrix.dimensions
+            if hasattr(manifold.dimensions[dim_name], "set_risk")
+        ]
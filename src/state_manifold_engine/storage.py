@@ -0,0 +1,229 @@
+"""
+StateManifoldEngine - 상태 공간 저장/적재
+
+StateManifold 하나를 단일 바이너리 파일로 저장한다:
+
+    [매직 8바이트][헤더 길이 uint64][JSON 헤더][64바이트 정렬된 배열 블록들]
+
+밀집 위험도 행렬은 (조건 수 × 차원 수) Fortran 순서 블록이라 차원별 열이
+파일 안에서 연속이다. 희소 행렬은 차원별 항목을 이어 붙인 CSC 블록
+(entry_indptr / entry_rows / entry_values)으로 저장한다. mmap=True로 적재하면
+배열을 파싱하지 않고 메모리 맵 뷰로 쓰므로 적재 시간이 행렬 크기와 무관하고,
+여러 프로세스가 같은 파일을 열면 페이지를 공유한다. 적재된 배열은 읽기
+전용이며, 첫 쓰기 때 복사된다 (RiskMatrix의 쓰기 시 복사).
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .condition_index import PackedConditionIndex
+from .models import CollapseZoneTable, StateManifold
+from .risk_matrix import MatrixBias, RiskMatrix, SparseRiskMatrix, WritableMatrixBias
+from .routing import NeighborhoodGraph
+
+
+MAGIC = b"SMFLD\x00\x01\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_manifold(manifold: StateManifold, path) -> None:
+    """상태 공간을 단일 바이너리 파일로 저장
+
+    조건 색인, 위험도 행렬, 유기적 연결, 붕괴 영역 표, 인접 구조(있으면)를 담는다.
+    SearchBias 객체 자체는 저장하지 않는다 (적재 시 MatrixBias로 대체).
+
+    Args:
+        manifold: 저장할 상태 공간
+        path: 파일 경로
+    """
+    matrix = manifold.risk_matrix
+    if matrix is None:
+        matrix = RiskMatrix([], [], [])
+    n_rows = matrix.n_rows
+    index = manifold.condition_index
+
+    # 조건 서명: UTF-8 덩어리 + 시작 위치 + 정렬 순서
+    signatures = index.signatures(range(n_rows))
+    encoded = [s.encode("utf-8") for s in signatures]
+    offsets = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    order = np.array(sorted(range(n_rows), key=signatures.__getitem__), dtype=np.int64)
+
+    blocks: List[Tuple[str, np.ndarray]] = [
+        ("signature_blob", np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+        ("signature_offsets", offsets),
+        ("signature_order", order),
+    ]
+    if matrix.layout == "sparse":
+        entries = [matrix.column_entries(j) for j in range(matrix.n_dims)]
+        entry_indptr = np.zeros(matrix.n_dims + 1, dtype=np.int64)
+        np.cumsum([len(rows) for rows, _ in entries], out=entry_indptr[1:])
+        blocks += [
+            ("entry_indptr", entry_indptr),
+            ("entry_rows", np.concatenate([rows for rows, _ in entries] + [np.zeros(0, dtype=np.int64)])),
+            ("entry_values", np.concatenate([values for _, values in entries] + [np.zeros(0)])),
+        ]
+    elif matrix.n_dims:
+        blocks.append(("risk", np.column_stack(matrix.columns)))
+        blocks.append(("present", np.column_stack(matrix.present)))
+
+    # 붕괴 영역: CollapseZoneTable 배열 그대로 (조건 ID, 유기적 위험도, 차원별 위험도 CSR)
+    zones = manifold.collapse_zones
+    blocks += [
+        ("zone_ids", zones.condition_ids),
+        ("zone_organic", zones.organic_risks),
+        ("zone_indptr", zones.indptr),
+        ("zone_dims", zones.dims),
+        ("zone_values", zones.values),
+    ]
+
+    graph = manifold.neighborhood
+    if graph is not None:
+        blocks += [("graph_indptr", graph.indptr), ("graph_indices", graph.indices)]
+        if graph.schema is not None:
+            blocks += [("graph_schema", graph.schema), ("graph_coordinates", graph.coordinates)]
+
+    block_meta: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in blocks:
+        offset = _align(offset)
+        block_meta[name] = {
+            "offset": offset,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+        offset += array.nbytes
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "n_rows": n_rows,
+        "layout": matrix.layout,
+        "dimension_names": list(manifold.dimensions),
+        "columns": list(matrix.dimensions),
+        "zone_dimension_names": list(zones.dimension_names),
+        "writable": [
+            name for name in matrix.dimensions
+            if hasattr(manifold.dimensions.get(name), "set_risk")
+        ],
+        "organic_connections": [[a, b, w] for (a, b), w in manifold.organic_connections.items()],
+        "blocks": block_meta,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for name, array in blocks:
+            f.write(b"\x00" * (data_start + block_meta[name]["offset"] - f.tell()))
+            # 2차원 블록은 Fortran 순서 (열이 연속)
+            f.write(array.tobytes(order="F"))
+        # 빈 블록도 파일 범위 안을 가리키도록 끝까지 채운다
+        f.write(b"\x00" * (data_start + _align(offset) - f.tell()))
+
+
+def load_manifold(path, mmap: bool = True) -> StateManifold:
+    """save_manifold()로 저장한 상태 공간 적재
+
+    Args:
+        path: 파일 경로
+        mmap: True면 배열 블록을 메모리 맵 (읽기 전용, 복사 없음),
+              False면 파일 전체를 메모리로 읽음
+
+    Returns:
+        상태 공간 (dimensions는 MatrixBias 뷰)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"상태 공간 파일이 아닙니다: {path}")
+        header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    if header["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 파일 형식 버전: {header['format_version']}")
+
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+    data_start = _align(len(MAGIC) + 8 + header_length)
+
+    def block(name: str) -> Optional[np.ndarray]:
+        meta = header["blocks"].get(name)
+        if meta is None:
+            return None
+        return np.ndarray(
+            tuple(meta["shape"]), dtype=np.dtype(meta["dtype"]), buffer=buffer,
+            offset=data_start + meta["offset"], order="F",
+        )
+
+    index = PackedConditionIndex(
+        block("signature_blob"), block("signature_offsets"), block("signature_order")
+    )
+
+    columns_names = header["columns"]
+    n_dims = len(columns_names)
+    if header.get("layout", "dense") == "sparse":
+        # 희소 항목 배열은 제자리에서 고치지 않으므로 파일 뷰를 그대로 쓴다
+        entry_indptr = block("entry_indptr").tolist()
+        entry_rows = block("entry_rows")
+        entry_values = block("entry_values")
+        risk_matrix: RiskMatrix = SparseRiskMatrix(
+            list(columns_names),
+            [entry_rows[entry_indptr[j]:entry_indptr[j + 1]] for j in range(n_dims)],
+            [entry_values[entry_indptr[j]:entry_indptr[j + 1]] for j in range(n_dims)],
+            header["n_rows"],
+        )
+    else:
+        risk = block("risk")
+        present = block("present")
+        columns = [risk[:, j] for j in range(n_dims)]
+        masks = [present[:, j] for j in range(n_dims)]
+        # 파일 위의 열은 공유 상태로 시작 → 첫 쓰기 때 복사
+        risk_matrix = RiskMatrix(
+            list(columns_names), columns, masks, owned=[False] * n_dims
+        )
+
+    writable = set(header["writable"])
+    dimensions: Dict[str, Any] = {}
+    for name in header["dimension_names"]:
+        if name not in risk_matrix.dim_index:
+            dimensions[name] = None
+            continue
+        bias_type = WritableMatrixBias if name in writable else MatrixBias
+        dimensions[name] = bias_type(name, index, risk_matrix)
+
+    # 붕괴 영역 표도 파일 위의 배열을 그대로 쓴다 (영역 객체는 접근할 때 생성)
+    collapse_zones = CollapseZoneTable(
+        index,
+        list(header["zone_dimension_names"]),
+        block("zone_ids"),
+        block("zone_organic"),
+        block("zone_indptr"),
+        block("zone_dims"),
+        block("zone_values"),
+    )
+
+    neighborhood = None
+    graph_indptr = block("graph_indptr")
+    if graph_indptr is not None:
+        neighborhood = NeighborhoodGraph(
+            graph_indptr, block("graph_indices"),
+            schema=block("graph_schema"), coordinates=block("graph_coordinates"),
+        )
+
+    manifold = StateManifold(
+        dimensions=dimensions,
+        organic_connections={(a, b): w for a, b, w in header["organic_connections"]},
+        collapse_zones=collapse_zones,
+        condition_index=index,
+        risk_matrix=risk_matrix,
+        neighborhood=neighborhood,
+    )
+    return manifold
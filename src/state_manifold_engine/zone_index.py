@@ -0,0 +1,194 @@
+"""
+StateManifoldEngine - 붕괴 영역 정렬 색인
+
+붕괴 영역을 유기적 위험도 내림차순으로 정렬해 두고, 차원별로도 같은 순서의
+목록을 유지한다. "가장 위험한 k개", "유기적 위험도가 [a, b]인 영역",
+"특정 차원이 얽힌 영역" 질의가 이진 탐색 + 결과 크기 시간에 끝난다.
+
+색인은 조건 ID만 담는다. CollapseZone 객체는 StateManifold가 조건 ID로 찾는다.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 정렬 키: (-유기적 위험도, 조건 ID) → 오름차순 = 위험도 내림차순, 같으면 ID 오름차순
+ZoneKey = Tuple[float, int]
+
+# update(): 바뀌는 영역이 이보다 많으면 하나씩 끼워 넣지 않고 정렬 병합
+BATCH_UPDATE_THRESHOLD = 16
+
+
+class CollapseZoneIndex:
+    """붕괴 영역 정렬 색인
+
+    증분 갱신(add / remove)은 정렬 목록에 이진 탐색으로 끼워 넣는다 (영역 하나당
+    O(n) 이동). 여러 영역을 한꺼번에 바꿀 때는 update()가 목록마다 한 번 걸러내고
+    한 번 병합하므로 O(n + k log k)다.
+    """
+
+    def __init__(self):
+        self._keys: List[ZoneKey] = []
+        self._by_dimension: Dict[str, List[ZoneKey]] = {}
+        # 조건 ID → (정렬 키, 관련 차원들) — 제거용
+        self._entries: Dict[int, Tuple[ZoneKey, Tuple[str, ...]]] = {}
+
+    @classmethod
+    def from_table(cls, table) -> "CollapseZoneIndex":
+        """CollapseZoneTable로 색인 만들기 (CollapseZone 객체를 만들지 않음)"""
+        index = cls()
+        names = table.dimension_names
+        indptr = table.indptr.tolist()
+        dims = table.dims.tolist()
+        for position, (condition_id, organic_risk) in enumerate(zip(
+            table.condition_ids.tolist(), table.organic_risks.tolist()
+        )):
+            key = (-organic_risk, condition_id)
+            dimensions = tuple(names[d] for d in dims[indptr[position]:indptr[position + 1]])
+            index._entries[condition_id] = (key, dimensions)
+            index._keys.append(key)
+            for name in dimensions:
+                index._by_dimension.setdefault(name, []).append(key)
+        index._keys.sort()
+        for keys in index._by_dimension.values():
+            keys.sort()
+        return index
+
+    def copy(self) -> "CollapseZoneIndex":
+        """독립 사본 (새 버전의 상태 공간용)"""
+        index = CollapseZoneIndex()
+        index._keys = list(self._keys)
+        index._by_dimension = {name: list(keys) for name, keys in self._by_dimension.items()}
+        index._entries = dict(self._entries)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, condition_id: int) -> bool:
+        return condition_id in self._entries
+
+    def add(self, condition_id: int, organic_risk: float, dimensions: Iterable[str]) -> None:
+        """영역 추가 (이미 있으면 교체)"""
+        self.remove(condition_id)
+        key = (-organic_risk, condition_id)
+        dimensions = tuple(dimensions)
+        self._entries[condition_id] = (key, dimensions)
+        _insert(self._keys, key)
+        for name in dimensions:
+            _insert(self._by_dimension.setdefault(name, []), key)
+
+    def remove(self, condition_id: int) -> bool:
+        """영역 제거 (없으면 False)"""
+        entry = self._entries.pop(condition_id, None)
+        if entry is None:
+            return False
+        key, dimensions = entry
+        _delete(self._keys, key)
+        for name in dimensions:
+            keys = self._by_dimension[name]
+            _delete(keys, key)
+            if not keys:
+                del self._by_dimension[name]
+        return True
+
+    def update(
+        self,
+        removed: Iterable[int],
+        added: Iterable[Tuple[int, float, Iterable[str]]]
+    ) -> None:
+        """영역 여러 개를 한 번에 제거·추가
+
+        Args:
+            removed: 제거할 조건 ID들 (없는 ID는 무시)
+            added: (조건 ID, 유기적 위험도, 관련 차원들) — 이미 있으면 교체
+        """
+        added = [(condition_id, organic_risk, tuple(dimensions)) for condition_id, organic_risk, dimensions in added]
+        removed = set(removed)
+        removed.update(condition_id for condition_id, _, _ in added)
+        removed &= self._entries.keys()
+        if len(removed) + len(added) <= BATCH_UPDATE_THRESHOLD:
+            for condition_id in removed:
+                self.remove(condition_id)
+            for condition_id, organic_risk, dimensions in added:
+                self.add(condition_id, organic_risk, dimensions)
+            return
+
+        # 목록별로 지울 키 / 넣을 키 모으기
+        dropped: Dict[Optional[str], set] = {None: set()}
+        inserted: Dict[Optional[str], List[ZoneKey]] = {None: []}
+        for condition_id in removed:
+            key, dimensions = self._entries.pop(condition_id)
+            for name in (None,) + dimensions:
+                dropped.setdefault(name, set()).add(key)
+        for condition_id, organic_risk, dimensions in added:
+            key = (-organic_risk, condition_id)
+            self._entries[condition_id] = (key, dimensions)
+            for name in (None,) + dimensions:
+                inserted.setdefault(name, []).append(key)
+
+        for name in dropped.keys() | inserted.keys():
+            keys = self._keys if name is None else self._by_dimension.get(name, [])
+            gone = dropped.get(name)
+            if gone:
+                keys = [key for key in keys if key not in gone]
+            new = inserted.get(name)
+            if new:
+                # 정렬된 두 구간 → Timsort가 선형 병합
+                new.sort()
+                keys = keys + new
+                keys.sort()
+            if name is None:
+                self._keys = keys
+            elif keys:
+                self._by_dimension[name] = keys
+            else:
+                self._by_dimension.pop(name, None)
+
+    def top_k(self, k: int, dimension: Optional[str] = None) -> List[int]:
+        """유기적 위험도가 가장 높은 k개 영역의 조건 ID (내림차순)
+
+        Args:
+            k: 개수
+            dimension: 주어지면 그 차원이 얽힌 영역 중에서만
+        """
+        return [key[1] for key in self._keys_for(dimension)[:max(k, 0)]]
+
+    def in_range(
+        self,
+        low: float,
+        high: float,
+        dimension: Optional[str] = None
+    ) -> List[int]:
+        """유기적 위험도가 [low, high]인 영역의 조건 ID (내림차순)
+
+        Args:
+            low: 하한 (포함)
+            high: 상한 (포함)
+            dimension: 주어지면 그 차원이 얽힌 영역 중에서만
+        """
+        keys = self._keys_for(dimension)
+        start = bisect_left(keys, (-high, float("-inf")))
+        stop = bisect_right(keys, (-low, float("inf")))
+        return [key[1] for key in keys[start:stop]]
+
+    def by_dimension(self, dimension: str) -> List[int]:
+        """dimension이 얽힌 영역의 조건 ID (유기적 위험도 내림차순)"""
+        return [key[1] for key in self._by_dimension.get(dimension, ())]
+
+    def dimensions(self) -> List[str]:
+        """영역이 하나 이상 있는 차원들"""
+        return list(self._by_dimension)
+
+    def _keys_for(self, dimension: Optional[str]) -> List[ZoneKey]:
+        if dimension is None:
+            return self._keys
+        return self._by_dimension.get(dimension, [])
+
+
+def _insert(keys: List[ZoneKey], key: ZoneKey) -> None:
+    keys.insert(bisect_left(keys, key), key)
+
+
+def _delete(keys: List[ZoneKey], key: ZoneKey) -> None:
+    del keys[bisect_left(keys, key)]
@@ -16,6 +16,7 @@ cognitive_kernel_path = project_root.parent.parent.parent.parent / "Cognitive_Ke
 if cognitive_kernel_path.exists():
     sys.path.insert(0, str(cognitive_kernel_path))
 
+import numpy as np
 import pytest
 
 try:
@@ -28,11 +29,13 @@ try:
         apply_importance_gate,
         interpret_convergence,
         interpret_energy_change,
-    )
-    from cognitive_kernel.engines.dynamics import (
         NeuralDynamicsCore,
         ContinuousDynamicsConfig,
+        OSCILLATION_WINDOW,
     )
+    from state_manifold_engine import l0_dynamics
+    from state_manifold_engine.l0_dynamics import TrajectoryRecorder, select_trajectory
+    from state_manifold_engine.attractor_registry import AttractorRegistry, PointSet
     INTERFACE_AVAILABLE = True
 except ImportError as e:
     INTERFACE_AVAILABLE = False
@@ -183,3 +186,360 @@ class TestL0L1Interface:
         assert "final_state" in l1_feedback
         assert 0.0 <= l1_feedback["attention"] <= 1.0
 
+
+
+class TestArrayMapping:
+    """배열 경로 매핑 테스트"""
+    
+    def test_array_and_list_inputs_agree(self):
+        risks = [0.0, 0.25, 0.5, 0.8, 1.0]
+        expected = [-r + 0.5 * (1.0 - r) for r in risks]
+        
+        from_dict = map_risk_to_input({f"c{i}": r for i, r in enumerate(risks)})
+        from_array = map_risk_to_input(np.array(risks))
+        
+        assert isinstance(from_array, np.ndarray)
+        assert from_dict.tolist() == expected
+        assert from_array.tolist() == expected
+        assert map_state_to_bias(np.array([1.0, -0.5])).tolist() == [0.5, -0.25]
+    
+    def test_output_buffers(self):
+        I = np.array([1.0, -0.5, 0.3])
+        buffer = np.empty(3)
+        
+        assert map_risk_to_input([0.2, 0.4, 0.6], out=buffer) is buffer
+        assert apply_importance_gate(I, [1.0, 0.5, 0.0], out=I) is I
+        assert I.tolist() == [1.0, -0.25, 0.0]
+        # 입력과 같은 버퍼에 써도 결과가 같다
+        risks = np.array([0.2, 0.9])
+        assert map_risk_to_input(risks, out=risks).tolist() == map_risk_to_input([0.2, 0.9]).tolist()
+        with pytest.raises(ValueError):
+            map_state_to_bias([1.0, 2.0], out=np.empty(3))
+    
+    def test_l1_to_l0_pads_and_truncates(self):
+        interface = L0L1Interface(default_n_neurons=3)
+        
+        short = interface.l1_to_l0({"a": 0.2}, state_vector=np.array([1.0, 1.0, 1.0, 1.0]))
+        long = interface.l1_to_l0(
+            {f"c{i}": 0.1 * i for i in range(5)}, importance=np.full(5, 0.5)
+        )
+        
+        assert short.I.tolist() == [map_risk_to_input([0.2])[0], 0.0, 0.0]
+        assert short.b.tolist() == [0.5, 0.5, 0.5]
+        assert long.I.tolist() == (map_risk_to_input([0.0, 0.1, 0.2]) * 0.5).tolist()
+        assert long.b.tolist() == [0.0, 0.0, 0.0]
+        with pytest.raises(ValueError):
+            interface.l1_to_l0({"a": 0.2}, importance=[1.0, 1.0])
+
+
+class TestBundledDynamics:
+    """번들 NumPy L0 코어 테스트"""
+    
+    @staticmethod
+    def make_core(integrator="euler", dt=0.01):
+        W = [[0.2, -0.1, 0.0], [-0.1, 0.2, 0.1], [0.0, 0.1, 0.2]]
+        cfg = l0_dynamics.ContinuousDynamicsConfig(dt=dt, tau=0.1, integrator=integrator)
+        return l0_dynamics.NeuralDynamicsCore(W=W, b=[0.1, 0.0, -0.1], config=cfg)
+    
+    def test_converges_to_fixed_point_and_stops_early(self):
+        core = self.make_core()
+        I = [0.3, -0.2, 0.1]
+        trajectory = core.run(
+            [0.0, 0.0, 0.0], steps=5000, input_schedule=lambda t: I,
+            stop_tol=1e-9, return_trajectory=True
+        )
+        
+        assert 1 < len(trajectory) < 5001
+        x = np.array(trajectory[-1])
+        residual = -x + core.W @ np.tanh(x) + core.b + np.array(I)
+        assert np.max(np.abs(residual)) < 1e-6
+        assert core.run([0.0, 0.0, 0.0], steps=5000, input_schedule=lambda t: I, stop_tol=1e-9) == trajectory[-1]
+    
+    def test_integrators_agree(self):
+        x0 = [0.5, -0.5, 0.2]
+        reference = np.array(self.make_core("euler", dt=1e-4).run(x0, steps=1000))
+        for integrator in ("rk4", "adaptive"):
+            final = np.array(self.make_core(integrator, dt=0.01).run(x0, steps=10))
+            assert np.allclose(final, reference, atol=1e-4)
+    
+    def test_energy_and_validation(self):
+        core = self.make_core()
+        x = np.array([0.5, -0.5, 0.2])
+        assert core.hopfield_energy(x) == pytest.approx(-0.5 * x @ core.W @ x - core.b @ x)
+        with pytest.raises(ValueError):
+            l0_dynamics.NeuralDynamicsCore(W=[[1.0, 0.0]])
+        with pytest.raises(ValueError):
+            l0_dynamics.NeuralDynamicsCore(
+                W=[[1.0]], config=l0_dynamics.ContinuousDynamicsConfig(integrator="leapfrog")
+            )
+    
+    def test_interface_uses_bundled_core_without_cognitive_kernel(self):
+        from state_manifold_engine import l0_l1_interface
+        
+        interface = L0L1Interface(default_n_neurons=3)
+        if l0_l1_interface.L0_BACKEND == "numpy":
+            assert isinstance(interface.l0, l0_dynamics.NeuralDynamicsCore)
+        l0_output, feedback = interface.run_integrated({"a": 0.1, "b": 0.9})
+        assert len(l0_output.x_final) == 3
+        assert feedback["stability"] in ("stable", "unstable", "oscillating")
+
+
+class TestBatchIntegration:
+    """배치 통합 실행 테스트"""
+    
+    def test_batch_matches_single_runs(self):
+        interface = L0L1Interface(default_n_neurons=3)
+        rng = np.random.default_rng(0)
+        risk_maps = [
+            {f"c{i}": float(r) for i, r in enumerate(rng.random(3))} for _ in range(6)
+        ]
+        risk_maps.append({"c0": 0.5, "c1": 0.5, "c2": 0.5})
+        importances = [None] * 6 + [[0.0, 0.0, 0.0]]
+        
+        outputs, feedback = interface.run_integrated_batch(
+            risk_maps, importances=importances, compute_energy=True
+        )
+        
+        assert len(outputs) == len(feedback) == len(risk_maps)
+        for risk_map, importance, output, row_feedback in zip(risk_maps, importances, outputs, feedback):
+            single, single_feedback = interface.run_integrated(
+                risk_map, importance=importance, compute_energy=True
+            )
+            assert output.steps == single.steps
+            assert output.converged == single.converged
+            assert np.allclose(output.x_trajectory, single.x_trajectory, atol=1e-12)
+            assert np.allclose(output.energy_trajectory, single.energy_trajectory, atol=1e-12)
+            assert row_feedback["stability"] == single_feedback["stability"]
+    
+    def test_rows_stop_independently(self):
+        # 자기 연결이 약한 축소 네트워크: 입력 0인 행은 첫 스텝에 멈춘다
+        core = NeuralDynamicsCore(W=[[0.1, 0.0], [0.0, 0.1]], b=[0.0, 0.0])
+        interface = L0L1Interface(neural_core=core)
+        
+        outputs, _ = interface.run_integrated_batch([[1.0 / 3.0, 1.0 / 3.0], [0.0, 1.0]])
+        
+        assert outputs[0].steps == 1 and outputs[0].converged
+        assert outputs[1].steps > outputs[0].steps
+        assert interface.run_integrated_batch([]) == ([], [])
+        with pytest.raises(ValueError):
+            interface.run_integrated_batch([[0.1, 0.2]], importances=[])
+
+
+    def test_adaptive_rows_choose_their_own_steps(self):
+        # 한 행만 뻣뻣해도 다른 행의 결과는 단일 실행과 같다
+        W = np.full((4, 4), 4.0)
+        np.fill_diagonal(W, 8.0)
+        cfg = ContinuousDynamicsConfig(dt=0.01, tau=0.1, activation="tanh", integrator="adaptive", tolerance=1e-4)
+        interface = L0L1Interface(neural_core=l0_dynamics.NeuralDynamicsCore(W=W, b=[0.0] * 4, config=cfg))
+        risk_maps = [[0.1, 0.9, 0.4, 0.7], [0.5, 0.5, 0.5, 0.5], [1.0, 1.0, 0.0, 0.0]]
+        state_vectors = [None, None, [40.0, -40.0, 40.0, -40.0]]
+        
+        outputs, _ = interface.run_integrated_batch(risk_maps, state_vectors)
+        
+        for risk_map, state_vector, output in zip(risk_maps, state_vectors, outputs):
+            single, _ = interface.run_integrated(risk_map, state_vector)
+            assert np.allclose(output.x_final, single.x_final, rtol=0.0, atol=1e-12)
+
+
+class TestEnergyTrajectory:
+    """에너지 궤적 계산 테스트"""
+    
+    def test_batched_energy_matches_per_state(self):
+        interface = L0L1Interface(default_n_neurons=4)
+        risk_map = {"a": 0.1, "b": 0.9, "c": 0.4, "d": 0.7}
+        
+        output, _ = interface.run_integrated(risk_map, compute_energy=True)
+        per_state = [interface.l0.hopfield_energy(x) for x in output.x_trajectory]
+        
+        assert np.allclose(output.energy_trajectory, per_state, rtol=1e-12, atol=1e-12)
+        assert output.final_energy == output.energy_trajectory[-1]
+        batch = interface.l0.hopfield_energy_batch(np.array(output.x_trajectory))
+        assert np.allclose(batch, per_state, rtol=1e-12, atol=1e-12)
+    
+    def test_inline_energy_without_trajectory(self):
+        interface = L0L1Interface(default_n_neurons=4)
+        risk_map = {"a": 0.1, "b": 0.9, "c": 0.4, "d": 0.7}
+        
+        full, full_feedback = interface.run_integrated(risk_map, compute_energy=True)
+        light, light_feedback = interface.run_integrated(
+            risk_map, compute_energy=True, record="final"
+        )
+        
+        assert light.x_trajectory == [light.x_final]
+        assert light.x_final == full.x_final
+        assert light.steps == full.steps
+        assert np.allclose(light.energy_trajectory, full.energy_trajectory, rtol=1e-12, atol=1e-12)
+        assert light_feedback["trajectory_length"] == full_feedback["trajectory_length"] == full.steps + 1
+        assert light_feedback["attention"] == pytest.approx(full_feedback["attention"])
+    
+    def test_energy_is_evaluated_in_chunks(self):
+        interface = L0L1Interface(default_n_neurons=4)
+        risk_map = {"a": 0.1, "b": 0.9, "c": 0.4, "d": 0.7}
+        reference, _ = interface.run_integrated(risk_map, compute_energy=True)
+        
+        calls = []
+        batch_energy = interface.l0.hopfield_energy_batch
+        interface.l0.hopfield_energy = None  # 스텝별 경로를 쓰면 실패
+        interface.l0.hopfield_energy_batch = lambda states: calls.append(len(states)) or batch_energy(states)
+        output, _ = interface.run_integrated(risk_map, compute_energy=True, record="final")
+        
+        assert output.energy_trajectory == reference.energy_trajectory
+        assert len(calls) == -(-(output.steps + 1) // l0_dynamics.ENERGY_CHUNK)
+        
+        states = np.random.default_rng(0).normal(size=(10, 2, 4))
+        recorder = l0_dynamics.EnergyRecorder(9, 2, 4, batch_energy, chunk=3)
+        for t in range(10):
+            recorder.record(t, states[t, :1 if t > 6 else 2], slice(0, 1 if t > 6 else 2))
+        energies = recorder.finish()
+        assert np.allclose(energies[:, 0], batch_energy(states[:, 0]), atol=1e-12)
+        assert np.allclose(energies[:7, 1], batch_energy(states[:7, 1]), atol=1e-12)
+        assert np.isnan(energies[7:, 1]).all()
+
+
+class TestTrajectoryRecording:
+    """궤적 기록 방식 테스트"""
+    
+    risk_map = {"a": 0.1, "b": 0.9, "c": 0.4, "d": 0.7}
+    
+    def test_modes_are_subsets_of_full(self):
+        interface = L0L1Interface(default_n_neurons=4)
+        full, full_feedback = interface.run_integrated(self.risk_map, compute_energy=True)
+        states = np.array(full.x_trajectory)
+        
+        expected = {
+            "decimate": select_trajectory(states, "decimate", every=7),
+            "ring": states[-5:],
+            "final": states[-1:],
+        }
+        for mode, kept in expected.items():
+            output, feedback = interface.run_integrated(
+                self.risk_map, compute_energy=True, record=mode, record_every=7, record_window=5
+            )
+            assert np.array_equal(output.x_trajectory, kept)
+            assert output.x_final == full.x_final
+            assert output.recent_states == full.x_trajectory[-OSCILLATION_WINDOW:]
+            assert output.energy_trajectory == full.energy_trajectory
+            assert feedback == full_feedback
+        
+        decimated = expected["decimate"]
+        assert np.array_equal(decimated[:-1], states[::7]) and np.array_equal(decimated[-1], states[-1])
+    
+    def test_ring_buffer_size_is_independent_of_steps(self):
+        recorder = TrajectoryRecorder("ring", 10000, 1, 4, window=8)
+        assert recorder.buffer.shape == (8, 1, 4)
+        assert TrajectoryRecorder("final", 10000, 1, 4).buffer.size == 0
+        with pytest.raises(ValueError):
+            TrajectoryRecorder("sparse", 10, 1, 4)
+    
+    def test_oscillation_detected_in_every_mode(self):
+        swing = [[1.0, -1.0], [-1.0, 1.0]] * 5
+        for kept in ([[1.0, -1.0]], swing[-4:], swing):
+            output = L0Output(
+                x_trajectory=kept,
+                x_final=[-1.0, 1.0],
+                converged=False,
+                steps=99,
+                recent_states=swing
+            )
+            assert interpret_convergence(output)["stability"] == "oscillating"
+    
+    def test_batch_matches_single_in_ring_mode(self):
+        interface = L0L1Interface(default_n_neurons=4)
+        risk_maps = [[0.1, 0.9, 0.4, 0.7], [0.5, 0.5, 0.5, 0.5], [0.0, 0.2]]
+        
+        outputs, _ = interface.run_integrated_batch(
+            risk_maps, compute_energy=True, record="ring", record_window=6
+        )
+        for risk_map, output in zip(risk_maps, outputs):
+            single, _ = interface.run_integrated(
+                risk_map, compute_energy=True, record="ring", record_window=6
+            )
+            assert len(output.x_trajectory) == 6
+            assert np.allclose(output.x_trajectory, single.x_trajectory, atol=1e-12)
+            assert np.allclose(output.recent_states, single.recent_states, atol=1e-12)
+            assert np.allclose(output.energy_trajectory, single.energy_trajectory, atol=1e-12)
+
+
+class TestAttractorRegistry:
+    """어트랙터 레지스트리 테스트"""
+    
+    # 축소형 연결: 입력마다 하나의 고정점으로 수렴
+    W = [[-0.5, 0.1, 0.0, 0.0], [0.1, -0.5, 0.1, 0.0], [0.0, 0.1, -0.5, 0.1], [0.0, 0.0, 0.1, -0.5]]
+    
+    def _interface(self, **kwargs):
+        core = NeuralDynamicsCore(W=self.W, b=[0.0] * 4)
+        return L0L1Interface(neural_core=core, attractor_registry=AttractorRegistry(**kwargs))
+    
+    def test_registry_clusters_states(self):
+        registry = AttractorRegistry(tolerance=0.01)
+        
+        first = registry.register([0.0, 1.0])
+        assert registry.register([0.005, 1.0]) == first
+        second = registry.register([1.0, 0.0])
+        
+        assert (first, second) == (0, 1)
+        assert registry.match([1.0, 0.004]) == second
+        assert registry.match([0.5, 0.5]) is None
+        assert registry.state(first).tolist() == [0.0, 1.0]
+        with pytest.raises(ValueError):
+            AttractorRegistry(tolerance=0.0)
+    
+    def test_grid_nearest_matches_linear_scan(self):
+        rng = np.random.default_rng(7)
+        points = np.round(rng.random((500, 6)), 1)  # 겹치는 점·칸 경계 위의 점 포함
+        grid, linear = PointSet(6, cell_size=0.15), PointSet(6)
+        for point in points:
+            grid.add(point)
+            linear.add(point)
+        for position in range(0, 500, 7):
+            grid.set(position, points[position] + 0.3)
+            linear.set(position, points[position] + 0.3)
+        
+        for query in np.vstack([points[:100] + rng.normal(0.0, 0.05, (100, 6)), rng.random((100, 6))]):
+            for radius in (0.05, 0.15):
+                expected = linear.nearest(query)
+                if expected[1] > radius:
+                    expected = None
+                assert grid.nearest(query, radius) == expected
+                assert linear.nearest(query, radius) == expected
+    
+    def test_ids_are_stable_and_similar_inputs_warm_start(self):
+        interface = self._interface()
+        risk_map = [0.1, 0.9, 0.4, 0.7]
+        
+        cold, cold_feedback = interface.run_integrated(risk_map)
+        warm, warm_feedback = interface.run_integrated([0.1001, 0.9, 0.4, 0.7])
+        other, other_feedback = interface.run_integrated([0.9, 0.1, 0.5, 0.5])
+        again, again_feedback = interface.run_integrated(risk_map)
+        
+        assert cold.converged and cold_feedback["attractor_reuse"] is None
+        assert warm_feedback["attractor_reuse"] == "warm_start"
+        assert warm.steps < cold.steps
+        assert warm_feedback["attractor_id"] == cold_feedback["attractor_id"] == 0
+        assert other_feedback["attractor_id"] == 1
+        assert again_feedback["attractor_id"] == 0
+        assert np.allclose(again.x_final, cold.x_final, atol=1e-3)
+    
+    def test_skip_simulation(self):
+        interface = self._interface(skip_simulation=True)
+        risk_map = [0.1, 0.9, 0.4, 0.7]
+        
+        cold, cold_feedback = interface.run_integrated(risk_map, compute_energy=True)
+        skipped, skipped_feedback = interface.run_integrated(risk_map, compute_energy=True)
+        
+        assert skipped.steps == 0 and skipped.converged
+        assert skipped.x_final == cold.x_final
+        assert skipped.final_energy == pytest.approx(cold.final_energy)
+        assert skipped_feedback["attractor_reuse"] == "skip"
+        assert skipped_feedback["attractor_id"] == cold_feedback["attractor_id"]
+    
+    def test_batch_reuses_attractors(self):
+        interface = self._interface(skip_simulation=True)
+        interface.run_integrated([0.1, 0.9, 0.4, 0.7])
+        
+        outputs, feedback = interface.run_integrated_batch([[0.1, 0.9, 0.4, 0.7], [0.9, 0.1, 0.5, 0.5]])
+        
+        assert outputs[0].steps == 0 and feedback[0]["attractor_reuse"] == "skip"
+        assert outputs[1].converged and feedback[1]["attractor_reuse"] is None
+        assert [f["attractor_id"] for f in feedback] == [0, 1]
+        assert interface.attractors.info()["attractors"] == 2
@@ -0,0 +1,1367 @@
+"""
+StateManifoldEngine 테스트
+
+상태 공간 구축, 통합 위험도, 흐름 경로, 생명 유지 메커니즘 테스트.
+"""
+
+import asyncio
+import copy
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import numpy as np
+import pytest
+
+from state_manifold_engine import (
+    ConditionIndex,
+    FlowResult,
+    LifeMaintenanceScheduler,
+    StateManifold,
+    StateManifoldEngine,
+)
+from state_manifold_engine.ingest import read_records
+from state_manifold_engine.models import CollapseZone, CollapseZoneTable
+from state_manifold_engine.zone_index import CollapseZoneIndex
+
+
+@dataclass
+class SearchBias:
+    """UP 엔진 SearchBias 최소 구조 (테스트용)"""
+    risk_map: Dict[str, float] = field(default_factory=dict)
+    
+    def get_risk(self, condition_signature: str) -> float:
+        return self.risk_map.get(condition_signature, 0.0)
+    
+    def set_risk(self, condition_signature: str, risk: float) -> None:
+        self.risk_map[condition_signature] = risk
+
+
+def reference_fused_risk(biases, condition):
+    """원래의 dict 순회 방식 통합 위험도 (비교 기준)"""
+    risks = [bias.get_risk(condition) for bias in biases.values()]
+    if not risks:
+        return 0.0
+    base_risk = sum(risks) / len(risks)
+    high_risk_count = sum(1 for risk in risks if risk > 0.7)
+    if high_risk_count > 1:
+        organic_boost = 1.0 + (high_risk_count - 1) * 0.2
+        base_risk = min(1.0, base_risk * organic_boost)
+    return base_risk
+
+
+def reference_collapse_zones(biases):
+    """원래의 조건별 루프 방식 붕괴 영역 (비교 기준)"""
+    zones = {}
+    for condition in {c for b in biases.values() for c in b.risk_map}:
+        dimension_risks = {
+            name: bias.get_risk(condition) for name, bias in biases.items()
+            if bias.get_risk(condition) > 0.5
+        }
+        if not dimension_risks:
+            continue
+        base_risk = sum(dimension_risks.values()) / len(dimension_risks)
+        if len(dimension_risks) > 1:
+            organic_risk = min(1.0, base_risk * (1.0 + (len(dimension_risks) - 1) * 0.2))
+        else:
+            organic_risk = base_risk
+        if organic_risk > 0.7:
+            zones[condition] = (dimension_risks, organic_risk)
+    return zones
+
+
+def reference_organic_connections(biases):
+    """원래의 쌍별 집합 교집합 방식 유기적 연결 (비교 기준)"""
+    connections = {}
+    names = list(biases)
+    for i, dim1 in enumerate(names):
+        for dim2 in names[i + 1:]:
+            common = set(biases[dim1].risk_map) & set(biases[dim2].risk_map)
+            if not common:
+                connections[(dim1, dim2)] = 0.0
+                continue
+            high = sum(
+                1 for c in common
+                if biases[dim1].get_risk(c) > 0.7 and biases[dim2].get_risk(c) > 0.7
+            )
+            connections[(dim1, dim2)] = high / len(common)
+    return connections
+
+
+def make_random_biases(n_dims=4, n_conditions=300, fill=0.4, seed=0):
+    """무작위 위험 지형 (차원마다 조건 일부만 포함)"""
+    rng = random.Random(seed)
+    biases = {}
+    for d in range(n_dims):
+        risk_map = {}
+        for c in range(n_conditions):
+            if rng.random() < fill:
+                risk_map[f"cond_{c}"] = round(rng.random(), 3)
+        biases[f"dim_{d}"] = SearchBias(risk_map=risk_map)
+    return biases
+
+
+def make_biases():
+    """세 차원이 일부 조건을 공유하는 위험 지형"""
+    return {
+        "three_body": SearchBias(risk_map={
+            "c0": 0.1, "c1": 0.75, "c2": 0.9, "c3": 0.3, "c4": 0.55,
+        }),
+        "navier_stokes": SearchBias(risk_map={
+            "c1": 0.8, "c2": 0.95, "c5": 0.2, "c6": 0.65,
+        }),
+        "butterfly": SearchBias(risk_map={
+            "c2": 0.72, "c4": 0.6, "c6": 0.05, "c7": 0.4,
+        }),
+    }
+
+
+class TestRiskMatrix:
+    """위험도 행렬 테스트"""
+    
+    def test_fused_risk_matches_reference(self):
+        """행렬 기반 통합 위험도가 원래 계산과 비트 단위로 일치"""
+        biases = make_biases()
+        manifold = StateManifoldEngine().build_state_space(biases)
+        
+        conditions = sorted({c for b in biases.values() for c in b.risk_map})
+        for condition in conditions:
+            assert manifold.get_risk(condition) == reference_fused_risk(biases, condition)
+        assert manifold.get_risks(conditions) == [
+            reference_fused_risk(biases, c) for c in conditions
+        ]
+    
+    def test_unknown_condition_falls_back(self):
+        """행렬에 없는 조건은 SearchBias에 직접 질의"""
+        manifold = StateManifoldEngine().build_state_space(make_biases())
+        
+        assert manifold.get_risk("unknown") == 0.0
+        assert manifold.get_risks(["unknown", "c2"])[0] == 0.0
+    
+    def test_dimension_risk(self):
+        """특정 차원 위험도"""
+        manifold = StateManifoldEngine().build_state_space(make_biases())
+        
+        assert manifold.get_risk("c1", "navier_stokes") == 0.8
+        assert manifold.get_risk("c0", "navier_stokes") == 0.0
+        assert manifold.get_risk("c0", "missing") == 0.0
+    
+    def test_set_risk_updates_matrix_only(self):
+        """set_risk는 새 버전의 행렬만 갱신 (SearchBias와 원본은 그대로)"""
+        biases = make_biases()
+        original = StateManifoldEngine().build_state_space(biases)
+        
+        manifold = original.set_risk("c0", "butterfly", 0.9).set_risk("c8", "three_body", 0.5)
+        
+        expected = copy.deepcopy(biases)
+        expected["butterfly"].risk_map["c0"] = 0.9
+        expected["three_body"].risk_map["c8"] = 0.5
+        assert "c0" not in biases["butterfly"].risk_map
+        assert manifold.version > original.version
+        assert original.get_risk("c0") == reference_fused_risk(biases, "c0")
+        assert original.get_risk("c8") == reference_fused_risk(biases, "c8")
+        assert manifold.get_risk("c0") == reference_fused_risk(expected, "c0")
+        assert manifold.get_risk("c8") == reference_fused_risk(expected, "c8")
+    
+    def test_direct_construction_compiles(self):
+        """StateManifold를 직접 생성해도 행렬이 컴파일됨"""
+        biases = make_biases()
+        manifold = StateManifold(dimensions=biases)
+        
+        assert manifold.risk_matrix is not None
+        assert manifold.get_risk("c2") == reference_fused_risk(biases, "c2")
+
+
+class TestOrganicConnections:
+    """유기적 연결 테스트"""
+    
+    def test_matrix_connections_match_reference(self):
+        """행렬 곱 결과가 원래 쌍별 계산과 동일"""
+        biases = make_random_biases(n_dims=6)
+        biases["empty"] = SearchBias()
+        manifold = StateManifoldEngine().build_state_space(biases)
+        
+        expected = reference_organic_connections(biases)
+        
+        assert manifold.organic_connections == expected
+        assert list(manifold.organic_connections) == list(expected)
+
+
+class TestCollapseZones:
+    """붕괴 영역 식별 테스트"""
+    
+    def test_vectorized_zones_match_reference(self):
+        """배열 연산 결과가 원래 루프와 동일"""
+        biases = make_random_biases()
+        manifold = StateManifoldEngine().build_state_space(biases)
+        
+        expected = reference_collapse_zones(biases)
+        actual = {
+            z.condition_signature: (z.dimensions, z.organic_risk)
+            for z in manifold.collapse_zones
+        }
+        
+        assert actual == expected
+    
+    def test_identify_subset(self):
+        """일부 조건만 골라 판정"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        
+        zones = engine.identify_collapse_zones(["c0", "c2", "unknown"])
+        
+        assert [z.condition_signature for z in zones] == ["c2"]
+        assert set(zones[0].dimensions) == {"three_body", "navier_stokes", "butterfly"}
+
+
+class TestFusedRiskCache:
+    """통합 위험도 캐시 테스트"""
+    
+    def test_repeat_queries_hit_cache(self):
+        """같은 조건 반복 질의는 캐시 적중"""
+        manifold = StateManifoldEngine().build_state_space(make_biases())
+        
+        first = manifold.get_risk("c2")
+        second = manifold.get_risk("c2")
+        info = manifold.fused_cache_info()
+        
+        assert first == second
+        assert info["misses"] == 1
+        assert info["hits"] == 1
+    
+    def test_set_risk_invalidates_only_touched_condition(self):
+        """set_risk는 해당 조건만 무효화"""
+        biases = make_biases()
+        manifold = StateManifoldEngine().build_state_space(biases)
+        manifold.get_risks_by_id(None)
+        
+        manifold = manifold.set_risk("c1", "butterfly", 0.9)
+        info = manifold.fused_cache_info()
+        
+        expected = copy.deepcopy(biases)
+        expected["butterfly"].risk_map["c1"] = 0.9
+        assert info["size"] == info["capacity"] - 1
+        assert manifold.get_risk("c1") == reference_fused_risk(expected, "c1")
+    
+    def test_maintain_life_refreshes_cache(self):
+        """요동 후 캐시된 값도 갱신된 위험도를 반영"""
+        biases = make_biases()
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        manifold.get_risks_by_id(None)
+        
+        engine.maintain_life(fluctuation_scale=0.05, max_iterations=3)
+        updated = engine.manifold
+        
+        # c0 (모든 차원 < 0.2)는 건드리지 않으므로 캐시 유지
+        assert updated._fused[1][updated.condition_id("c0")]
+        assert not updated._fused[1][updated.condition_id("c2")]
+        current = {
+            name: SearchBias(risk_map={c: updated.get_risk(c, name) for c in bias.risk_map})
+            for name, bias in biases.items()
+        }
+        for condition in updated.condition_index:
+            assert updated.get_risk(condition) == reference_fused_risk(current, condition)
+
+
+class TestConditionIndex:
+    """조건 색인 테스트"""
+    
+    def test_intern_assigns_dense_ids(self):
+        """등록 순서대로 밀집 ID 부여"""
+        index = ConditionIndex(["a", "b"])
+        
+        assert index.intern("a") == 0
+        assert index.intern("c") == 2
+        assert index.id_of("missing") is None
+        assert index.signatures([2, 0]) == ["c", "a"]
+        assert len(index) == 3
+    
+    def test_manifold_rows_follow_index(self):
+        """행렬의 행 번호는 조건 ID"""
+        manifold = StateManifoldEngine().build_state_space(make_biases())
+        index = manifold.condition_index
+        
+        assert len(index) == manifold.risk_matrix.n_rows == 8
+        for condition in index:
+            fused = manifold.get_risks_by_id([index.id_of(condition)])
+            assert fused[0] == manifold.get_risk(condition)
+
+
+class TestFlow:
+    """흐름 경로 테스트"""
+    
+    def test_flow_through_space(self):
+        """저위험 조건을 따라 목표까지 흐름"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        
+        result = engine.flow_through_space("value", start="c0", goal="c7")
+        
+        assert result is not None
+        assert result.path[0] == "c0"
+        assert result.path[-1] == "c7"
+        assert result.is_valid()
+        assert result.stability == pytest.approx(
+            1.0 - max(engine.manifold.get_risk(c) for c in result.path)
+        )
+    
+    def test_sorted_index_matches_greedy_min(self):
+        """정렬 색인 탐색이 매 단계 min() 선택과 동일 (동점은 ID 순)"""
+        biases = make_random_biases(n_conditions=60, fill=0.5, seed=3)
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        conditions = list(manifold.condition_index)
+        
+        def greedy(start, goal):
+            current, path, visited = start, [start], {start}
+            for _ in range(100):
+                if current == goal:
+                    return path
+                candidates = [c for c in conditions if c not in visited]
+                if not candidates:
+                    break
+                best = min(candidates, key=manifold.get_risk)
+                if manifold.get_risk(best) > 0.8:
+                    break
+                current = best
+                path.append(current)
+                visited.add(current)
+            return None
+        
+        for start, goal in [(conditions[0], conditions[-1]), (conditions[5], conditions[7]),
+                            ("outside", conditions[3]), (conditions[2], "outside")]:
+            result = engine.flow_through_space(None, start=start, goal=goal)
+            expected = greedy(start, goal)
+            assert (result.path if result else None) == expected
+    
+    def test_flow_start_equals_goal(self):
+        """시작과 목표가 같으면 한 점 경로"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        
+        result = engine.flow_through_space("value", start="unknown", goal="unknown")
+        
+        assert result.path == ["unknown"]
+    
+    def test_flow_without_manifold_raises(self):
+        """상태 공간 없이 흐름 요청 시 오류"""
+        with pytest.raises(ValueError):
+            StateManifoldEngine().flow_through_space("value", start="c0", goal="c1")
+
+
+def make_grid_biases(size=8, seed=1):
+    """격자 조건 서명 위험 지형 (가운데 세로 벽은 고위험, 맨 아래 한 칸만 열림)"""
+    rng = random.Random(seed)
+    risk_map = {}
+    for x in range(size):
+        for y in range(size):
+            risk = round(rng.uniform(0.0, 0.5), 3)
+            if x == size // 2 and y < size - 1:
+                risk = 0.95
+            risk_map[f"x_{x}_y_{y}"] = risk
+    return {"terrain": SearchBias(risk_map=risk_map)}
+
+
+class TestRouting:
+    """인접 구조 기반 Dijkstra / A* 흐름 테스트"""
+    
+    def _path_cost(self, manifold, path):
+        return sum(manifold.get_risk(c) for c in path[1:])
+    
+    def test_grid_neighbors(self):
+        """격자 이웃은 한 축만 한 칸 차이"""
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(make_grid_biases(size=4), neighbors="grid")
+        index = manifold.condition_index
+        
+        neighbors = index.signatures(manifold.neighborhood.neighbors(index.id_of("x_1_y_1")))
+        
+        assert sorted(neighbors) == ["x_0_y_1", "x_1_y_0", "x_1_y_2", "x_2_y_1"]
+    
+    def test_dijkstra_and_astar_find_optimal_path(self):
+        """두 모드 모두 벽을 돌아가는 같은 최소 비용 경로"""
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(make_grid_biases(), neighbors="grid")
+        
+        dijkstra = engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="dijkstra")
+        astar = engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="astar")
+        
+        assert dijkstra is not None and astar is not None
+        assert "x_4_y_7" in dijkstra.path  # 벽의 유일한 통로
+        assert all(manifold.get_risk(c) <= 0.8 for c in dijkstra.path)
+        assert self._path_cost(manifold, astar.path) == pytest.approx(
+            self._path_cost(manifold, dijkstra.path)
+        )
+        
+        # 모든 단계가 실제 이웃
+        graph, index = manifold.neighborhood, manifold.condition_index
+        for a, b in zip(astar.path, astar.path[1:]):
+            assert index.id_of(b) in graph.neighbors(index.id_of(a))
+    
+    def test_step_cost_computed_once_per_risk_array(self, monkeypatch):
+        """A* 한 걸음 비용 하한은 위험도가 바뀔 때만 다시 구함"""
+        from state_manifold_engine import models
+        calls = []
+        original = models.min_step_cost
+        monkeypatch.setattr(models, "min_step_cost", lambda risks: calls.append(1) or original(risks))
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(make_grid_biases(), neighbors="grid")
+        
+        engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="astar")
+        engine.flow_through_space(None, "x_0_y_1", "x_7_y_2", mode="astar")
+        engine.flow_many([("x_0_y_0", "x_7_y_3"), ("x_0_y_0", "x_7_y_4")], mode="astar")
+        
+        assert len(calls) == 1
+        assert manifold.route_risks() is manifold.route_risks()
+        assert manifold.route_step_cost() == original(manifold.route_risks())
+        assert not manifold.route_risks().flags.writeable
+        
+        updated = engine.apply_risk_deltas(manifold.risk_matrix.dimensions[0], {"x_1_y_0": 0.01})
+        engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="astar")
+        assert len(calls) == 2
+        assert updated.route_step_cost() <= manifold.route_step_cost()
+    
+    def test_max_cost_bounds_search(self):
+        """비용 상한을 넘는 경로는 찾지 않음"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_grid_biases(), neighbors="grid")
+        
+        assert engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="dijkstra", max_cost=0.5) is None
+    
+    def test_neighbor_function(self):
+        """사용자 이웃 함수로 만든 인접 구조"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(
+            make_biases(),
+            neighbors=lambda c: {"c0": ["c3"], "c3": ["c7", "c0"], "c7": []}.get(c, []),
+        )
+        
+        result = engine.flow_through_space(None, "c0", "c7", mode="astar")
+        
+        assert result.path == ["c0", "c3", "c7"]
+        assert engine.flow_through_space(None, "c7", "c0", mode="dijkstra") is None
+    
+    def test_routing_requires_neighborhood(self):
+        """인접 구조 없이 dijkstra 요청 시 오류, 알 수 없는 모드도 오류"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        
+        with pytest.raises(ValueError):
+            engine.flow_through_space(None, "c0", "c7", mode="dijkstra")
+        with pytest.raises(ValueError):
+            engine.flow_through_space(None, "c0", "c7", mode="bfs")
+
+
+class TestBatchFlow:
+    """배치 흐름 API 테스트"""
+    
+    @pytest.mark.parametrize("mode", ["greedy", "dijkstra", "astar"])
+    def test_flow_many_matches_single_queries(self, mode):
+        """배치 결과가 개별 호출과 같고 입력 순서를 유지"""
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(make_grid_biases(), neighbors="grid")
+        conditions = list(manifold.condition_index)
+        pairs = [
+            (conditions[0], conditions[-1]),
+            (conditions[9], conditions[3]),
+            (conditions[0], conditions[20]),
+            (conditions[0], conditions[0]),
+            ("outside", conditions[1]),
+            (conditions[0], conditions[36]),  # 벽 (통과 불가)
+        ]
+        
+        batch = engine.flow_many(pairs, value="v", mode=mode)
+        single = [engine.flow_through_space("v", s, g, mode=mode) for s, g in pairs]
+        
+        assert batch == single
+        assert batch[0] is not None
+    
+    def test_flow_from_one_to_many(self):
+        """한 시작점에서 여러 목표"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        
+        results = engine.flow_from("c0", ["c7", "c0", "unknown"], value=1)
+        
+        assert results[0] == engine.flow_through_space(1, "c0", "c7")
+        assert results[1].path == ["c0"]
+        assert results[2] is None
+
+
+class TestConcurrentQueries:
+    """재진입/동시 질의 테스트"""
+    
+    def test_explicit_manifold_does_not_touch_engine_state(self):
+        """명시적 manifold 질의는 엔진의 manifold를 바꾸지 않음"""
+        engine = StateManifoldEngine()
+        own = engine.build_state_space(make_biases())
+        other = StateManifoldEngine().build_state_space(make_random_biases())
+        
+        engine.flow_through_space(None, "cond_0", "cond_1", manifold=other)
+        
+        assert engine.manifold is own
+    
+    def test_threads_see_their_own_manifold(self):
+        """여러 스레드가 서로 다른 manifold로 동시에 질의"""
+        engine = StateManifoldEngine()
+        manifolds = [
+            StateManifoldEngine().build_state_space(make_random_biases(seed=seed))
+            for seed in range(4)
+        ]
+        queries = [(m, f"cond_{i}", f"cond_{i + 40}") for m in manifolds for i in range(25)]
+        expected = [engine.flow_through_space(None, s, g, manifold=m) for m, s, g in queries]
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            actual = list(pool.map(
+                lambda q: engine.flow_through_space(None, q[1], q[2], manifold=q[0]), queries
+            ))
+        
+        assert actual == expected
+    
+    def test_flow_many_with_executor(self):
+        """executor 동시 실행 결과가 순차 실행과 동일"""
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_grid_biases(), neighbors="grid")
+        conditions = list(engine.manifold.condition_index)
+        pairs = [(conditions[i % 7], conditions[-1 - i]) for i in range(30)]
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            concurrent = engine.flow_many(pairs, mode="dijkstra", executor=pool)
+        
+        assert concurrent == engine.flow_many(pairs, mode="dijkstra")
+    
+    def test_cold_manifold_queried_from_threads(self):
+        """캐시가 비어 있는 manifold에 여러 스레드가 동시에 질의"""
+        engine = StateManifoldEngine()
+        biases = make_random_biases(seed=5)
+        queries = [(f"cond_{i}", f"cond_{i + 40}") for i in range(60)]
+        engine.build_state_space(biases)
+        expected = [engine.flow_through_space(None, s, g) for s, g in queries]
+        cold = StateManifoldEngine().build_state_space(biases)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            actual = list(pool.map(
+                lambda q: engine.flow_through_space(None, q[0], q[1], manifold=cold), queries
+            ))
+            risks = list(pool.map(cold.get_risk, [f"cond_{i}" for i in range(200)]))
+        
+        assert actual == expected
+        assert risks == engine.manifold.get_risks([f"cond_{i}" for i in range(200)])
+
+
+class TestMaintainLife:
+    """생명 유지 메커니즘 테스트"""
+    
+    def test_fluctuation_attenuates_risk(self):
+        """고위험 조건은 완화되고 저위험 조건은 유지"""
+        biases = make_biases()
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        
+        engine.maintain_life(fluctuation_scale=0.05)
+        updated = engine.manifold
+        
+        # c2: 세 차원 모두 0.8 초과 → 1.5배 완화
+        assert updated.get_risk("c2", "three_body") == 0.9 - 0.05 * 1.5 * 0.9
+        # c0 (0.1 < 0.2) → 그대로
+        assert updated.get_risk("c0", "three_body") == 0.1
+        # SearchBias와 이전 버전은 그대로
+        assert biases["three_body"].risk_map["c2"] == 0.9
+        assert manifold.get_risk("c2", "three_body") == 0.9
+        assert updated.version > manifold.version
+    
+    def test_multi_iteration_matches_reference_loop(self):
+        """k회 벡터화 요동 = 조건별 루프 k회 (비트 단위)"""
+        biases = make_random_biases(4, 300, fill=0.8, seed=11)
+        expected = {name: dict(bias.risk_map) for name, bias in biases.items()}
+        conditions = sorted({c for risk_map in expected.values() for c in risk_map})
+        
+        for _ in range(40):
+            for condition in conditions:
+                risks = {name: risk_map.get(condition, 0.0) for name, risk_map in expected.items()}
+                high = [name for name, risk in risks.items() if risk > 0.8]
+                for name, risk in risks.items():
+                    if risk < 0.2:
+                        continue
+                    attenuation = 0.05
+                    if name in high and len(high) > 1:
+                        attenuation *= 1.5
+                    expected[name][condition] = max(0.0, risk - attenuation * risk)
+        
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        manifold.get_risks(conditions)
+        engine.maintain_life(fluctuation_scale=0.05, max_iterations=40)
+        updated = engine.manifold
+        
+        for name, risk_map in expected.items():
+            assert {c: updated.get_risk(c, name) for c in risk_map} == risk_map
+        expected_biases = {name: SearchBias(risk_map=m) for name, m in expected.items()}
+        for condition in conditions:
+            assert updated.get_risk(condition) == reference_fused_risk(expected_biases, condition)
+
+
+class TestIncrementalUpdates:
+    """증분 갱신 테스트 (update_dimension / remove_dimension / apply_risk_deltas)"""
+    
+    @staticmethod
+    def ring_neighbors(condition):
+        """cond_i ↔ cond_{i±1} 이웃 (dijkstra 비교용)"""
+        i = int(condition.rsplit("_", 1)[1])
+        return [f"cond_{i - 1}", f"cond_{i + 1}"]
+    
+    @staticmethod
+    def assert_matches_rebuild(manifold, biases):
+        """증분 갱신 결과 = 처음부터 다시 구축한 결과 (흐름 포함)"""
+        neighbors = TestIncrementalUpdates.ring_neighbors if manifold.neighborhood is not None else None
+        rebuilt = StateManifoldEngine().build_state_space(biases, neighbors=neighbors)
+        assert manifold.organic_connections == rebuilt.organic_connections
+        
+        zones = {z.condition_signature: (z.dimensions, z.organic_risk) for z in manifold.collapse_zones}
+        assert zones == reference_collapse_zones(biases)
+        zone_ids = [manifold.condition_id(z.condition_signature) for z in manifold.collapse_zones]
+        assert zone_ids == sorted(zone_ids)
+        
+        conditions = list(rebuilt.condition_index)
+        assert manifold.get_risks(conditions) == rebuilt.get_risks(conditions)
+        common, high = manifold.pair_counts()
+        rebuilt_common, rebuilt_high = manifold.risk_matrix.pair_counts()
+        assert np.array_equal(common, rebuilt_common)
+        assert np.array_equal(high, rebuilt_high)
+        
+        # 흐름: 어느 차원에도 없는 조건은 후보도 목표도 아니다
+        engine = StateManifoldEngine()
+        uncovered = [c for c in manifold.condition_index if rebuilt.condition_id(c) is None]
+        assert all(manifold.condition_id(c) is None for c in uncovered)
+        starts = conditions[:3]
+        goals = conditions[3:][::37] + uncovered[:3]
+        modes = ["greedy"] + (["dijkstra"] if neighbors is not None else [])
+        for mode in modes:
+            for start in starts:
+                for goal in goals:
+                    result = engine.flow_through_space(None, start, goal, manifold=manifold, mode=mode)
+                    expected = engine.flow_through_space(None, start, goal, manifold=rebuilt, mode=mode)
+                    assert (result is None) == (expected is None)
+                    if result is not None:
+                        # 동점 조건의 순서는 ID 순이라 구축 순서에 따라 다를 수 있음 → 위험도로 비교
+                        assert result.path[-1] == expected.path[-1]
+                        assert manifold.get_risks(result.path) == rebuilt.get_risks(expected.path)
+    
+    def test_update_existing_dimension(self):
+        biases = make_random_biases(seed=1)
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        manifold.get_risks_by_id(None)
+        
+        replacement = make_random_biases(n_dims=1, n_conditions=400, seed=2)["dim_0"]
+        before = reference_collapse_zones(biases)
+        biases["dim_2"] = replacement
+        updated = engine.update_dimension("dim_2", replacement)
+        
+        assert engine.manifold is updated
+        self.assert_matches_rebuild(updated, biases)
+        # 이전 버전은 그대로
+        zones = {z.condition_signature: (z.dimensions, z.organic_risk) for z in manifold.collapse_zones}
+        assert zones == before
+    
+    def test_add_and_remove_dimension(self):
+        biases = make_random_biases(seed=3)
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        
+        added = make_random_biases(n_dims=1, seed=4)["dim_0"]
+        biases["extra"] = added
+        manifold = engine.update_dimension("extra", added)
+        self.assert_matches_rebuild(manifold, biases)
+        
+        del biases["dim_1"]
+        removed = engine.remove_dimension("dim_1")
+        assert not any("dim_1" in pair for pair in removed.organic_connections)
+        assert any("dim_1" in pair for pair in manifold.organic_connections)
+        self.assert_matches_rebuild(removed, biases)
+    
+    def test_remove_dimension_uncovers_conditions(self):
+        """제거된 차원에만 있던 조건은 그리디 후보도 목표도 아니다"""
+        biases = {
+            "a": SearchBias(risk_map={"s": 0.3, "g": 0.4, "m": 0.5}),
+            "b": SearchBias(risk_map={"only_b": 0.01}),
+        }
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        assert engine.flow_through_space(None, "s", "g").path == ["s", "only_b", "g"]
+        
+        removed = engine.remove_dimension("b")
+        
+        assert removed.condition_id("only_b") is None
+        assert engine.flow_through_space(None, "s", "g").path == ["s", "g"]
+        assert engine.flow_through_space(None, "s", "only_b") is None
+        assert engine.flow_through_space(None, "s", "only_b", manifold=manifold).path == ["s", "only_b"]
+        del biases["b"]
+        self.assert_matches_rebuild(removed, biases)
+    
+    def test_shrinking_dimension_with_routing(self):
+        """교체로 빠진 조건은 dijkstra로도 지나갈 수 없다"""
+        biases = make_random_biases(seed=6)
+        engine = StateManifoldEngine()
+        engine.build_state_space(biases, neighbors=self.ring_neighbors)
+        
+        for d in range(1, 4):
+            biases[f"dim_{d}"] = SearchBias(risk_map={
+                c: r for c, r in biases[f"dim_{d}"].risk_map.items() if int(c[5:]) % 3
+            })
+            manifold = engine.update_dimension(f"dim_{d}", biases[f"dim_{d}"])
+        self.assert_matches_rebuild(manifold, biases)
+        
+        del biases["dim_0"]
+        self.assert_matches_rebuild(engine.remove_dimension("dim_0"), biases)
+    
+    def test_apply_risk_deltas(self):
+        biases = make_random_biases(seed=5)
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        manifold.get_risks_by_id(None)
+        
+        deltas = {"cond_0": 0.95, "cond_1": 0.1, "cond_2": 0.75, "new_cond": 0.9}
+        engine.apply_risk_deltas("dim_0", deltas)
+        updated = engine.apply_risk_deltas("dim_3", {"cond_2": 0.85, "new_cond": 0.99})
+        
+        # SearchBias는 그대로, 새 버전의 행렬에만 반영
+        assert "new_cond" not in biases["dim_0"].risk_map
+        assert manifold.condition_id("new_cond") is None
+        expected = {name: SearchBias(risk_map=dict(b.risk_map)) for name, b in biases.items()}
+        expected["dim_0"].risk_map.update(deltas)
+        expected["dim_3"].risk_map.update({"cond_2": 0.85, "new_cond": 0.99})
+        self.assert_matches_rebuild(updated, expected)
+    
+    def test_unknown_dimension(self):
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        with pytest.raises(ValueError):
+            engine.apply_risk_deltas("missing", {"c0": 0.5})
+        with pytest.raises(ValueError):
+            engine.remove_dimension("missing")
+
+
+class TestLifeScheduler:
+    """생명 유지 스케줄러 / 스냅샷 격리 테스트"""
+    
+    def test_snapshot_leaves_original_untouched(self):
+        biases = make_biases()
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        before = manifold.get_risk("c2")
+        
+        snapshot = engine.fluctuate_snapshot(fluctuation_scale=0.05)
+        
+        assert snapshot is not manifold
+        assert engine.manifold is manifold
+        assert biases["three_body"].risk_map["c2"] == 0.9
+        assert manifold.get_risk("c2") == before
+        assert snapshot.get_risk("c2", "three_body") == 0.9 - 0.05 * 1.5 * 0.9
+        assert snapshot.get_risk("c0", "three_body") == 0.1
+    
+    def test_snapshot_matches_maintain_life(self):
+        biases = make_random_biases(seed=8)
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        manifold.get_risks_by_id(None)
+        
+        snapshot = engine.fluctuate_snapshot(0.05, iterations=5)
+        engine.maintain_life(0.05, max_iterations=5)
+        
+        conditions = list(manifold.condition_index)
+        assert snapshot.get_risks(conditions) == engine.manifold.get_risks(conditions)
+        assert snapshot.version != engine.manifold.version
+    
+    def test_scheduler_publishes_snapshots(self):
+        engine = StateManifoldEngine()
+        first = engine.build_state_space(make_biases())
+        published = []
+        scheduler = LifeMaintenanceScheduler(
+            engine, rate_hz=1000.0, fluctuation_scale=0.05, cpu_budget=1.0,
+            on_publish=published.append,
+        )
+        
+        asyncio.run(scheduler.run(max_ticks=3))
+        
+        assert scheduler.ticks == 3
+        assert published[-1] is engine.manifold
+        assert engine.manifold is not first
+        # 처음 스냅샷은 그대로 (진행 중인 질의는 이것을 계속 사용)
+        assert first.get_risk("c2", "three_body") == 0.9
+        reference = StateManifoldEngine()
+        reference.build_state_space(make_biases())
+        reference.maintain_life(0.05, max_iterations=3)
+        assert engine.manifold.get_risk("c2", "three_body") == reference.manifold.get_risk("c2", "three_body")
+    
+    def test_rebuild_during_tick_is_not_overwritten(self):
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        scheduler = LifeMaintenanceScheduler(engine, rate_hz=1000.0, cpu_budget=1.0)
+        
+        async def scenario():
+            original = scheduler._fluctuate
+            
+            def rebuild_then_fluctuate(base):
+                result = original(base)
+                engine.build_state_space(make_biases())
+                return result
+            
+            scheduler._fluctuate = rebuild_then_fluctuate
+            await scheduler.tick()
+        
+        asyncio.run(scenario())
+        
+        assert scheduler.skipped == 1
+        assert scheduler.ticks == 0
+        assert engine.manifold.get_risk("c2", "three_body") == 0.9
+    
+    def test_budget_counts_worker_cpu_time_only(self):
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        scheduler = LifeMaintenanceScheduler(engine, rate_hz=1000.0, cpu_budget=1.0)
+        
+        def waiting_snapshot(scale, iterations, manifold):
+            time.sleep(0.2)
+            return manifold
+        
+        engine.fluctuate_snapshot = waiting_snapshot
+        elapsed = asyncio.run(scheduler.tick())
+        
+        assert elapsed < 0.1
+        assert scheduler.busy_seconds == elapsed
+    
+    def test_invalid_options(self):
+        engine = StateManifoldEngine()
+        with pytest.raises(ValueError):
+            LifeMaintenanceScheduler(engine, rate_hz=0.0)
+        with pytest.raises(ValueError):
+            LifeMaintenanceScheduler(engine, cpu_budget=0.0)
+
+
+
+class TestVersioning:
+    """버전·쓰기 시 복사 테스트"""
+    
+    def test_versions_increase_and_share_columns(self):
+        biases = make_biases()
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space(biases)
+        v2 = engine.apply_risk_deltas("butterfly", {"c7": 0.9})
+        
+        assert v2.version > v1.version
+        # 바뀐 열만 복사, 나머지는 공유
+        columns1, columns2 = v1.risk_matrix.columns, v2.risk_matrix.columns
+        j = v1.risk_matrix.dim_index["butterfly"]
+        assert columns1[j] is not columns2[j]
+        assert all(columns1[k] is columns2[k] for k in range(len(columns1)) if k != j)
+        assert v1.get_risk("c7", "butterfly") == 0.4
+        assert v2.get_risk("c7", "butterfly") == 0.9
+    
+    def test_set_risk_returns_new_version(self):
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space(make_biases())
+        v2 = engine.fluctuate_snapshot(0.05)
+        
+        v3 = v2.set_risk("c3", "three_body", 0.99)
+        
+        assert v3.version > v2.version
+        assert engine.manifold is v1  # 게시하지 않음
+        assert v3.get_risk("c3", "three_body") == 0.99
+        assert v2.get_risk("c3", "three_body") != 0.99
+        assert v1.get_risk("c3", "three_body") == 0.3
+        assert v1.set_risk("c0", "three_body", 0.5).get_risk("c0", "three_body") == 0.5
+        assert v1.get_risk("c0", "three_body") == 0.1
+        assert v3.get_risk("c0", "three_body") == v2.get_risk("c0", "three_body")
+    
+    def test_new_condition_set_on_one_version_stays_private(self):
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space(make_biases())
+        v2 = engine.fluctuate_snapshot(0.05)
+        
+        v3 = v1.set_risk("cNEW", "three_body", 0.99)
+        
+        assert v3.get_risk("cNEW", "three_body") == 0.99
+        assert v1.get_risk("cNEW", "three_body") == 0.0
+        assert v2.get_risk("cNEW", "three_body") == 0.0
+        assert v2.get_risk("cNEW") == 0.0
+        assert "cNEW" not in v2.dimensions["three_body"].risk_map
+    
+    def test_caches_shared_until_first_write(self):
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space(make_random_biases(seed=7))
+        v1.get_risks_by_id(None)
+        v1.top_collapse_zones(3)
+        v1.risk_order()
+        before = v1.get_risks_by_id(None)
+        common_before = v1.pair_counts()[0].copy()
+        
+        v2 = v1._clone()
+        assert v2._fused is v1._fused
+        assert v2._pair_counts is v1._pair_counts
+        assert v2._collapse_index is v1._collapse_index
+        
+        v3 = engine.apply_risk_deltas("dim_0", {"cond_0": 0.99, "cond_1": 0.0, "new_cond": 0.9})
+        assert v3._fused is not v1._fused
+        assert v3._pair_counts is not v1._pair_counts
+        assert v3._collapse_index is not v1._collapse_index
+        assert np.array_equal(v1.get_risks_by_id(None), before)
+        assert np.array_equal(v1.pair_counts()[0], common_before)
+        assert v1.condition_id("new_cond") is None
+        # 원본 쪽이 먼저 써도 사본은 그대로
+        v1.invalidate_risks()
+        assert v2.fused_cache_info()["size"] == v2.fused_cache_info()["capacity"]
+    
+    def test_explicit_manifold_is_not_published(self):
+        engine = StateManifoldEngine()
+        current = engine.build_state_space(make_biases())
+        other = engine.update_dimension("extra", SearchBias(risk_map={"c0": 0.9}), manifold=current)
+        
+        assert engine.manifold is current
+        assert "extra" in other.dimensions and "extra" not in current.dimensions
+
+
+class TestStorage:
+    """저장/적재 테스트"""
+    
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_round_trip(self, tmp_path, mmap):
+        biases = make_random_biases(seed=12)
+        biases["korean_조건"] = SearchBias(risk_map={"조건_1.0": 0.9, "cond_3": 0.95})
+        engine = StateManifoldEngine()
+        manifold = engine.build_state_space(biases)
+        path = tmp_path / "manifold.smf"
+        
+        manifold.save(path)
+        loaded = StateManifold.load(path, mmap=mmap)
+        
+        conditions = list(manifold.condition_index)
+        assert list(loaded.condition_index) == conditions
+        assert all(loaded.condition_id(c) == manifold.condition_id(c) for c in conditions)
+        assert loaded.condition_id("missing") is None
+        assert loaded.get_risks(conditions) == manifold.get_risks(conditions)
+        assert loaded.organic_connections == manifold.organic_connections
+        assert loaded.collapse_zones == manifold.collapse_zones
+        assert loaded.dimensions["dim_0"].risk_map == biases["dim_0"].risk_map
+        assert loaded.dimensions["dim_0"].get_risk("cond_0") == biases["dim_0"].get_risk("cond_0")
+    
+    def test_mmap_columns_copied_on_write(self, tmp_path):
+        biases = make_biases()
+        engine = StateManifoldEngine()
+        engine.build_state_space(biases, neighbors=lambda c: [])
+        path = tmp_path / "manifold.smf"
+        engine.manifold.save(path)
+        
+        loaded = StateManifold.load(path)
+        assert not loaded.risk_matrix.columns[0].flags.writeable
+        assert loaded.neighborhood is not None
+        
+        loaded = loaded.set_risk("c0", "three_body", 0.99).set_risk("new_cond", "butterfly", 0.5)
+        
+        assert loaded.get_risk("c0", "three_body") == 0.99
+        assert loaded.get_risk("new_cond", "butterfly") == 0.5
+        assert StateManifold.load(path).get_risk("c0", "three_body") == 0.1
+        
+        # 적재된 상태 공간도 엔진의 갱신/요동 대상
+        engine.manifold = loaded
+        engine.maintain_life(0.05)
+        assert engine.manifold.get_risk("c2", "three_body") == 0.9 - 0.05 * 1.5 * 0.9
+    
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a manifold file")
+        with pytest.raises(ValueError):
+            StateManifold.load(path)
+
+
+class TestRecordIngestion:
+    """레코드 스트림 구축 테스트"""
+    
+    @staticmethod
+    def records_of(biases):
+        return [
+            (name, condition, risk)
+            for name, bias in biases.items()
+            for condition, risk in bias.risk_map.items()
+        ]
+    
+    def test_matches_build_state_space(self):
+        biases = make_random_biases(seed=13)
+        records = self.records_of(biases)
+        random.Random(0).shuffle(records)
+        
+        manifold = StateManifoldEngine().build_state_space_from_records(iter(records), chunk_size=97)
+        # 차원 순서 = 레코드에 처음 나온 순서 (합산 순서를 맞춰 비트 단위 비교)
+        ordered = {name: biases[name] for name in manifold.dimensions}
+        expected = StateManifoldEngine().build_state_space(ordered)
+        
+        conditions = list(expected.condition_index)
+        assert manifold.get_risks(conditions) == expected.get_risks(conditions)
+        assert manifold.organic_connections == expected.organic_connections
+        zones = lambda m: {z.condition_signature: (z.dimensions, z.organic_risk) for z in m.collapse_zones}
+        assert zones(manifold) == zones(expected)
+        assert manifold.dimensions["dim_1"].risk_map == biases["dim_1"].risk_map
+    
+    def test_last_record_wins(self):
+        records = [
+            ("a", "c0", 0.1), ("b", "c0", 0.9), ("a", "c0", 0.8),
+            ("a", "c1", 0.3), ("a", "c0", 0.95), ("b", "c1", 0.6),
+        ]
+        for chunk_size in (1, 2, 100):
+            manifold = StateManifoldEngine().build_state_space_from_records(records, chunk_size=chunk_size)
+            assert manifold.get_risk("c0", "a") == 0.95
+            assert manifold.get_risk("c0", "b") == 0.9
+            assert list(manifold.dimensions) == ["a", "b"]
+    
+    def test_views_read_their_own_version(self):
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space_from_records([("a", "c0", 0.1), ("b", "c0", 0.9)])
+        v2 = engine.fluctuate_snapshot(0.05)
+        
+        v3 = v1.set_risk("c0", "a", 0.7).set_risk("c1", "a", 0.3)
+        
+        assert v3.dimensions["a"].get_risk("c0") == 0.7
+        assert v3.dimensions["a"].risk_map == {"c0": 0.7, "c1": 0.3}
+        assert v1.dimensions["a"].risk_map == {"c0": 0.1}
+        assert v2.dimensions["a"].get_risk("c0") == v2.get_risk("c0", "a") != 0.7
+        assert v2.dimensions["a"].get_risk("c1") == 0.0
+    
+    def test_file_readers(self, tmp_path):
+        jsonl = tmp_path / "risks.jsonl"
+        jsonl.write_text(
+            '{"dimension": "a", "condition_signature": "c0", "risk": 0.9}\n'
+            '\n'
+            '["b", "c0", 0.8]\n',
+            encoding="utf-8",
+        )
+        table = tmp_path / "risks.csv"
+        table.write_text("dimension,condition_signature,risk\na,c0,0.9\nb,c0,0.8\n", encoding="utf-8")
+        
+        expected = [("a", "c0", 0.9), ("b", "c0", 0.8)]
+        assert list(read_records(jsonl)) == expected
+        assert list(read_records(table)) == expected
+        
+        manifold = StateManifoldEngine().build_state_space_from_records(read_records(table))
+        assert manifold.get_risk("c0") == reference_fused_risk(
+            {"a": SearchBias(risk_map={"c0": 0.9}), "b": SearchBias(risk_map={"c0": 0.8})}, "c0"
+        )
+    
+    def test_missing_fields(self, tmp_path):
+        table = tmp_path / "risks.csv"
+        table.write_text("dimension,risk\na,0.9\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            list(read_records(table))
+
+
+class TestSparseLayout:
+    """희소 위험도 행렬 테스트 (밀집 행렬과 비트 단위 일치)"""
+    
+    @staticmethod
+    def build_pair(biases):
+        dense = StateManifoldEngine().build_state_space(biases, layout="dense")
+        sparse = StateManifoldEngine().build_state_space(biases, layout="sparse")
+        return dense, sparse
+    
+    @staticmethod
+    def assert_same(dense, sparse):
+        conditions = list(dense.condition_index)
+        assert dense.get_risks(conditions) == sparse.get_risks(conditions)
+        assert dense.organic_connections == sparse.organic_connections
+        assert dense.collapse_zones == sparse.collapse_zones
+        for a, b in zip(dense.pair_counts(), sparse.pair_counts()):
+            assert np.array_equal(a, b)
+        for name in dense.risk_matrix.dimensions:
+            assert all(
+                dense.get_risk(c, name) == sparse.get_risk(c, name) for c in conditions
+            )
+    
+    def test_auto_layout_follows_fill_ratio(self):
+        engine = StateManifoldEngine()
+        # 행 = 어느 차원에든 나온 조건 → 차원이 많고 겹침이 적어야 희소
+        assert engine.build_state_space(make_random_biases(10, fill=0.02)).risk_matrix.layout == "sparse"
+        assert engine.build_state_space(make_random_biases(fill=0.6)).risk_matrix.layout == "dense"
+        with pytest.raises(ValueError):
+            engine.build_state_space(make_biases(), layout="csr")
+    
+    def test_matches_dense(self):
+        biases = make_random_biases(6, 2000, fill=0.08, seed=21)
+        dense, sparse = self.build_pair(biases)
+        
+        assert sparse.risk_matrix.n_entries == dense.risk_matrix.n_entries
+        self.assert_same(dense, sparse)
+        zones = {z.condition_signature: (z.dimensions, z.organic_risk) for z in sparse.collapse_zones}
+        assert zones == reference_collapse_zones(biases)
+        assert sparse.dimensions["dim_0"].risk_map == biases["dim_0"].risk_map
+    
+    def test_fluctuation_matches_dense(self):
+        biases = make_random_biases(4, 500, fill=0.15, seed=22)
+        dense_engine, sparse_engine = StateManifoldEngine(), StateManifoldEngine()
+        dense_engine.build_state_space(biases, layout="dense")
+        sparse_engine.build_state_space(biases, layout="sparse")
+        
+        dense_engine.maintain_life(fluctuation_scale=0.05, max_iterations=7)
+        sparse_engine.maintain_life(fluctuation_scale=0.05, max_iterations=7)
+        
+        self.assert_same(dense_engine.manifold, sparse_engine.manifold)
+    
+    def test_incremental_updates_match_dense(self):
+        biases = make_random_biases(4, 500, fill=0.1, seed=23)
+        replacement = make_random_biases(1, 600, fill=0.1, seed=24)["dim_0"]
+        results = []
+        for layout in ("dense", "sparse"):
+            engine = StateManifoldEngine()
+            engine.build_state_space(biases, layout=layout)
+            engine.apply_risk_deltas("dim_0", {"cond_0": 0.95, "cond_1": 0.9, "new_cond": 0.99})
+            engine.update_dimension("dim_1", replacement)
+            engine.update_dimension("extra", SearchBias(risk_map={"cond_0": 0.85, "cond_7": 0.6}))
+            results.append(engine.remove_dimension("dim_2"))
+        
+        self.assert_same(*results)
+        assert results[1].risk_matrix.layout == "sparse"
+    
+    def test_save_load_round_trip(self, tmp_path):
+        biases = make_random_biases(4, 800, fill=0.05, seed=25)
+        manifold = StateManifoldEngine().build_state_space(biases, layout="sparse")
+        path = tmp_path / "sparse.smf"
+        
+        manifold.save(path)
+        loaded = StateManifold.load(path)
+        
+        assert loaded.risk_matrix.layout == "sparse"
+        self.assert_same(manifold, loaded)
+        loaded = loaded.set_risk("cond_0", "dim_0", 0.99)
+        assert loaded.get_risk("cond_0", "dim_0") == 0.99
+        assert StateManifold.load(path).get_risk("cond_0", "dim_0") == biases["dim_0"].get_risk("cond_0")
+    
+    def test_records_build_sparse(self):
+        biases = make_random_biases(10, 1000, fill=0.02, seed=26)
+        records = TestRecordIngestion.records_of(biases)
+        manifold = StateManifoldEngine().build_state_space_from_records(records, chunk_size=50)
+        expected = StateManifoldEngine().build_state_space(biases, layout="dense")
+        
+        assert manifold.risk_matrix.layout == "sparse"
+        self.assert_same(expected, manifold)
+
+
+class TestCollapseZoneIndex:
+    """붕괴 영역 정렬 색인 테스트"""
+    
+    @staticmethod
+    def scan(manifold, predicate=lambda zone: True):
+        """선형 탐색 + 정렬 (기준)"""
+        zone_ids = manifold.collapse_zone_ids()
+        matched = [
+            (-zone.organic_risk, zone_id, zone)
+            for zone_id, zone in zip(zone_ids, manifold.collapse_zones) if predicate(zone)
+        ]
+        return [zone for _, _, zone in sorted(matched, key=lambda item: item[:2])]
+    
+    def assert_queries_match_scan(self, manifold):
+        assert manifold.top_collapse_zones(20) == self.scan(manifold)[:20]
+        assert manifold.collapse_zones_in_range(0.75, 0.9) == self.scan(
+            manifold, lambda z: 0.75 <= z.organic_risk <= 0.9
+        )
+        for name in manifold.risk_matrix.dimensions:
+            involved = self.scan(manifold, lambda z: name in z.dimensions)
+            assert manifold.collapse_zones_by_dimension(name) == involved
+            assert manifold.top_collapse_zones(5, dimension=name) == involved[:5]
+            assert manifold.collapse_zones_in_range(0.8, 1.0, dimension=name) == [
+                z for z in involved if 0.8 <= z.organic_risk <= 1.0
+            ]
+    
+    def test_queries_match_linear_scan(self):
+        manifold = StateManifoldEngine().build_state_space(make_random_biases(5, 2000, fill=0.6, seed=31))
+        assert len(manifold.collapse_zones) > 100
+        self.assert_queries_match_scan(manifold)
+        assert manifold.top_collapse_zones(0) == []
+        assert manifold.collapse_zones_by_dimension("missing") == []
+        assert manifold.collapse_zones_in_range(2.0, 3.0) == []
+    
+    def test_index_follows_incremental_updates(self):
+        biases = make_random_biases(4, 500, fill=0.6, seed=32)
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space(biases)
+        top = v1.top_collapse_zones(10)
+        
+        engine.apply_risk_deltas("dim_0", {"cond_0": 0.99, "cond_1": 0.99, "cond_2": 0.0})
+        engine.update_dimension("extra", make_random_biases(1, 500, fill=0.5, seed=33)["dim_0"])
+        v2 = engine.remove_dimension("dim_3")
+        
+        assert v2._collapse_index is not None
+        self.assert_queries_match_scan(v2)
+        assert v2.collapse_zones_by_dimension("dim_3") == []
+        # 이전 버전의 색인은 그대로
+        assert v1.top_collapse_zones(10) == top
+        self.assert_queries_match_scan(v1)
+    
+    def test_index_follows_replaced_table_of_same_size(self):
+        manifold = StateManifoldEngine().build_state_space(make_random_biases(4, 500, fill=0.6, seed=35))
+        manifold.top_collapse_zones(1)
+        
+        # 영역 수는 같고 위험도만 다른 표로 교체
+        zones = [
+            CollapseZone(zone.condition_signature, zone.dimensions, 1.0 - zone.organic_risk)
+            for zone in manifold.collapse_zones
+        ]
+        manifold.collapse_zones = CollapseZoneTable.from_zones(zones, manifold.condition_index)
+        
+        self.assert_queries_match_scan(manifold)
+    
+    def test_batch_update_matches_single_updates(self):
+        rng = random.Random(34)
+        zones = {i: (rng.random(), tuple(rng.sample("abcd", rng.randint(1, 3)))) for i in range(300)}
+        batched, single = CollapseZoneIndex(), CollapseZoneIndex()
+        for condition_id, (organic_risk, dimensions) in zones.items():
+            batched.add(condition_id, organic_risk, dimensions)
+            single.add(condition_id, organic_risk, dimensions)
+        
+        removed = rng.sample(range(300), 80)
+        added = [(i, rng.random(), ("e",) if i % 2 else ("a", "e")) for i in range(250, 400)]
+        batched.update(removed, added)
+        for condition_id in removed:
+            single.remove(condition_id)
+        for condition_id, organic_risk, dimensions in added:
+            single.add(condition_id, organic_risk, dimensions)
+        
+        assert len(batched) == len(single)
+        assert batched.top_k(1000) == single.top_k(1000)
+        for name in "abcde":
+            assert batched.by_dimension(name) == single.by_dimension(name)
+        assert sorted(batched.dimensions()) == sorted(single.dimensions())
+
+class TestCollapseZoneTable:
+    """붕괴 영역 표(구조체 배열)·슬롯 모델 테스트"""
+    
+    def test_zones_are_arrays_and_lazy_views(self):
+        biases = make_biases()
+        manifold = StateManifoldEngine().build_state_space(biases)
+        table = manifold.collapse_zones
+        
+        assert isinstance(table, CollapseZoneTable)
+        assert table.condition_ids.tolist() == sorted(table.condition_ids.tolist())
+        assert len(table) == len(reference_collapse_zones(biases))
+        zone = table[-1]
+        assert zone == list(table)[-1]
+        assert not hasattr(zone, "__dict__")
+        assert table[:1] == [table[0]]
+        with pytest.raises(IndexError):
+            table[len(table)]
+    
+    def test_table_from_zone_list(self):
+        zones = [
+            CollapseZone("c9", {"a": 0.9}, 0.9),
+            CollapseZone("c1", {"b": 0.8, "a": 0.75}, 0.93),
+        ]
+        manifold = StateManifold(collapse_zones=zones)
+        
+        assert isinstance(manifold.collapse_zones, CollapseZoneTable)
+        # 조건 ID 순 (처음 등록된 c9가 0번)
+        assert manifold.collapse_zones == zones
+        assert manifold.top_collapse_zones(1) == [zones[1]]
+    
+    def test_versions_share_unchanged_table(self):
+        engine = StateManifoldEngine()
+        v1 = engine.build_state_space(make_biases())
+        v2 = engine.fluctuate_snapshot(0.05)
+        v3 = engine.apply_risk_deltas("butterfly", {"c7": 0.95, "c1": 0.9})
+        
+        assert v2.collapse_zones is v1.collapse_zones
+        assert v3.collapse_zones is not v1.collapse_zones
+        assert v3.condition_id("c7") in v3.collapse_zone_ids()
+        assert v1.condition_id("c7") not in v1.collapse_zone_ids()
+    
+    def test_loaded_table_is_not_materialized(self, tmp_path):
+        manifold = StateManifoldEngine().build_state_space(make_random_biases(seed=34))
+        path = tmp_path / "zones.smf"
+        manifold.save(path)
+        
+        loaded = StateManifold.load(path)
+        assert not loaded.collapse_zones.organic_risks.flags.writeable
+        assert loaded.collapse_zones == manifold.collapse_zones
+    
+    def test_flow_result_is_slotted(self):
+        engine = StateManifoldEngine()
+        engine.build_state_space(make_biases())
+        result = engine.flow_through_space(1.0, "c0", "c5")
+        assert not hasattr(result, "__dict__")
+        assert result.is_valid()
+
+
+class TestFlowCache:
+    """흐름 결과 LRU 캐시 테스트"""
+    
+    def test_repeat_queries_hit(self):
+        engine = StateManifoldEngine(flow_cache_size=16)
+        engine.build_state_space(make_grid_biases(), neighbors="grid")
+        reference = StateManifoldEngine()
+        reference.build_state_space(make_grid_biases(), neighbors="grid")
+        
+        first = engine.flow_through_space("a", "x_0_y_0", "x_7_y_0", mode="dijkstra")
+        second = engine.flow_through_space("b", "x_0_y_0", "x_7_y_0", mode="dijkstra")
+        
+        assert second == FlowResult(
+            "b", first.path, first.flow_energy, first.form_preservation, first.stability
+        )
+        assert second.path is not first.path
+        assert first == reference.flow_through_space("a", "x_0_y_0", "x_7_y_0", mode="dijkstra")
+        assert engine.flow_cache_info() == {
+            "hits": 1, "misses": 1, "evictions": 0, "size": 1, "capacity": 16
+        }
+        # 모드·비용 상한이 다르면 다른 항목, 경로 없음도 캐시
+        assert engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="dijkstra", max_cost=0.5) is None
+        assert engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="dijkstra", max_cost=0.5) is None
+        assert engine.flow_cache_info()["hits"] == 2
+    
+    def test_updates_invalidate_by_version(self):
+        engine = StateManifoldEngine(flow_cache_size=16)
+        engine.build_state_space(make_biases())
+        engine.flow_through_space(None, "c0", "c7")
+        
+        engine.apply_risk_deltas("three_body", {"c3": 0.99, "c5": 0.0})
+        updated = engine.flow_through_space(None, "c0", "c7")
+        engine.manifold = engine.manifold.set_risk("c5", "navier_stokes", 0.95)
+        replaced = engine.flow_through_space(None, "c0", "c7")
+        engine.maintain_life(0.05)
+        engine.flow_through_space(None, "c0", "c7")
+        
+        assert engine.flow_cache_info()["hits"] == 0
+        reference = StateManifoldEngine().flow_through_space(None, "c0", "c7", manifold=engine.manifold)
+        assert engine.flow_through_space(None, "c0", "c7") == reference
+        assert updated.path != replaced.path or updated.flow_energy != replaced.flow_energy
+        
+        engine.build_state_space(make_biases())
+        assert engine.flow_cache_info()["size"] == 0
+    
+    def test_lru_eviction(self):
+        engine = StateManifoldEngine(flow_cache_size=2)
+        engine.build_state_space(make_biases())
+        for goal in ("c5", "c6", "c5", "c7", "c6"):
+            engine.flow_through_space(None, "c0", goal)
+        
+        # c5 재사용 → c6이 가장 오래됨 → c7이 c6을 밀어냄 → c6 다시 계산
+        assert engine.flow_cache_info() == {
+            "hits": 1, "misses": 4, "evictions": 2, "size": 2, "capacity": 2
+        }
+        with pytest.raises(ValueError):
+            StateManifoldEngine(flow_cache_size=-1)
+    
+    def test_flow_many_uses_cache(self):
+        engine = StateManifoldEngine(flow_cache_size=64)
+        engine.build_state_space(make_grid_biases(), neighbors="grid")
+        pairs = [("x_0_y_0", "x_7_y_0"), ("x_0_y_0", "x_0_y_0"), ("x_1_y_1", "missing")]
+        
+        first = engine.flow_many(pairs, mode="dijkstra")
+        engine.flow_through_space(None, "x_0_y_0", "x_7_y_0", mode="dijkstra")
+        second = engine.flow_many(pairs, mode="dijkstra")
+        
+        assert first == second
+        assert engine.flow_cache_info()["hits"] == 4